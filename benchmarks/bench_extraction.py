@@ -0,0 +1,79 @@
+"""Benchmark element text extraction on the sample Alphabet 10-Q.
+
+Compares the previous per-element BeautifulSoup extraction with the single-pass
+lxml engine (cold and memoized), and times chunk_document end to end.
+
+Usage: python -m benchmarks.bench_extraction [path/to/10-q.pdf]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from src.processing.chunker import (
+    _html_source,
+    _html_to_text,
+    chunk_document,
+    clear_text_cache,
+    extract_element_text,
+)
+from src.processing.pdf_parser import parse_html
+from src.processing.pdf_to_html import convert_pdf_to_html
+
+DEFAULT_PDF = Path(__file__).resolve().parents[1] / "data_samples" / "goog-10-q-q2-2025.pdf"
+
+
+def legacy_html_to_text(html: str) -> str:
+    """The previous extraction: a fresh soup per element plus find_all over nine tags."""
+    soup = BeautifulSoup(html, "html.parser")
+    parts = []
+    for tag in soup.find_all(["p", "span", "b", "strong", "em", "div", "li", "td", "th"]):
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) > 1:
+            parts.append(tag_text)
+    return re.sub(r"\s+", " ", " ".join(parts)).strip()
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(pdf_path: str) -> None:
+    elements = parse_html(convert_pdf_to_html(pdf_path))
+    sources = [src for src in (_html_source(el) for el in elements) if src]
+    legacy_chars = sum(len(legacy_html_to_text(src)) for src in sources)
+    lxml_chars = sum(len(_html_to_text(src)) for src in sources)
+
+    legacy = timed(lambda: [legacy_html_to_text(src) for src in sources])
+    single_pass = timed(lambda: [_html_to_text(src) for src in sources])
+
+    def cold():
+        clear_text_cache()
+        for el in elements:
+            extract_element_text(el)
+
+    cold_time = timed(cold)
+    warm_time = timed(lambda: [extract_element_text(el) for el in elements])
+    clear_text_cache()
+    chunk_cold = timed(lambda: (clear_text_cache(), chunk_document(elements)))
+    chunk_warm = timed(lambda: chunk_document(elements))
+
+    print(f"PDF: {pdf_path}")
+    print(f"Elements: {len(elements)} ({len(sources)} with HTML)")
+    print(f"HTML flattening, legacy bs4 find_all : {legacy * 1e3:8.2f} ms ({legacy_chars:,} chars, nested text duplicated)")
+    print(f"HTML flattening, lxml single pass     : {single_pass * 1e3:8.2f} ms ({lxml_chars:,} chars)")
+    print(f"extract_element_text, cold            : {cold_time * 1e3:8.2f} ms")
+    print(f"extract_element_text, memoized        : {warm_time * 1e3:8.2f} ms")
+    print(f"chunk_document, cold cache            : {chunk_cold * 1e3:8.2f} ms")
+    print(f"chunk_document, warm cache            : {chunk_warm * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else str(DEFAULT_PDF))
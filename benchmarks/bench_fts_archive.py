@@ -0,0 +1,88 @@
+"""Benchmark the SQLite FTS5 archive (FTSIndex) at filing-archive scale.
+
+Builds a synthetic archive of `filings` x `chunks-per-filing` chunks (Zipf-distributed
+words, plus one term present in every chunk), then reports the build time, the file
+size, peak RSS and per-query latency for:
+  - selective: 3-5 mid-frequency words, across the whole archive and scoped to a filing
+  - common: the term present in every chunk, across the whole archive and scoped
+
+Usage: python -m benchmarks.bench_fts_archive [--filings N] [--chunks-per-filing N] [--queries N] [--path FILE]
+       (default: 300 filings x 1000 chunks = 300k chunks, in a temporary directory)
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config import Config
+from src.retrieval.fts_retriever import FTSIndex
+
+VOCABULARY = 20_000
+WORDS_PER_CHUNK = 60
+
+
+def synthetic_chunks(filing: int, n_chunks: int, rng: np.random.Generator) -> list[Document]:
+    ranks = np.arange(1, VOCABULARY + 1, dtype=np.float64)
+    probs = (1.0 / ranks) / np.sum(1.0 / ranks)
+    words = rng.choice(VOCABULARY, size=(n_chunks, WORDS_PER_CHUNK), p=probs)
+    return [
+        Document(
+            page_content="revenue " + " ".join(f"w{w}" for w in row),
+            metadata={"chunk_id": f"chunk_{i}", "document_title": f"filing-{filing}"},
+        )
+        for i, row in enumerate(words)
+    ]
+
+
+def mean_latency(index: FTSIndex, queries: list[str], k: int, doc_keys=None) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query, k, doc_keys=doc_keys)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filings", type=int, default=300)
+    parser.add_argument("--chunks-per-filing", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=Config.DEFAULT_TOP_K)
+    parser.add_argument("--path", default=None, help="archive file (default: a temporary directory)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path or os.path.join(tmp, "archive.sqlite")
+        index = FTSIndex(path)
+        start = time.perf_counter()
+        for filing in range(args.filings):
+            index.add_documents(f"filing-{filing}", synthetic_chunks(filing, args.chunks_per_filing, rng))
+        index.optimize()
+        build = time.perf_counter() - start
+
+        n_chunks = args.filings * args.chunks_per_filing
+        selective = [
+            " ".join(f"w{w}" for w in rng.choice(np.arange(200, 5000), size=rng.integers(3, 6), replace=False))
+            for _ in range(args.queries)
+        ]
+        scope = [f"filing-{args.filings // 2}"]
+        rows = [
+            ("selective, archive", mean_latency(index, selective, args.top_k)),
+            ("selective, one filing", mean_latency(index, selective, args.top_k, scope)),
+            ("common, archive", mean_latency(index, ["revenue"] * 3, args.top_k)),
+            ("common, one filing", mean_latency(index, ["revenue"] * 3, args.top_k, scope)),
+        ]
+        size_mb = sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p)) / 2**20
+        rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"{n_chunks} chunks in {args.filings} filings: built in {build:.1f}s, {size_mb:.0f}MB on disk, peak RSS {rss_mb:.0f}MB")
+    for label, seconds in rows:
+        print(f"{label:>24} {seconds * 1e3:>9.2f}ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark PDF → HTML conversion: serial vs. the process pool, cold and warm.
+
+For page counts cut from the sample Alphabet 10-Q, reports per document:
+  - serial: get_text("html") page by page in this process
+  - cold: a new spawn pool per document (startup + conversion + shutdown), each worker
+    first importing `--worker-import` the way spawned workers re-import the app's main
+    module
+  - warm: the same conversion on a pool that is already running
+Use it to set Config.PDF_CONVERSION_WORKERS and Config.PDF_PARALLEL_MIN_PAGES for a host.
+
+Usage: python -m benchmarks.bench_pdf_to_html [pdf] [--pages N ...] [--workers N ...] [--worker-import MODULE]
+"""
+import argparse
+import importlib
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import fitz
+
+from src.processing.pdf_to_html import _convert_page_range
+
+DEFAULT_PDF = Path(__file__).resolve().parents[1] / "data_samples" / "goog-10-q-q2-2025.pdf"
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def cut_pdf(source: str, pages: int, directory: str) -> tuple[str, int]:
+    """Copy of the source PDF with its first `pages` pages repeated/truncated to that count."""
+    src = fitz.open(source)
+    doc = fitz.open()
+    while doc.page_count < pages:
+        doc.insert_pdf(src, to_page=min(src.page_count, pages - doc.page_count) - 1)
+    path = os.path.join(directory, f"cut-{pages}.pdf")
+    doc.save(path)
+    count = doc.page_count
+    doc.close()
+    src.close()
+    return path, count
+
+
+def convert_on(pool: ProcessPoolExecutor, path: str, page_count: int, workers: int) -> None:
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    futures = [pool.submit(_convert_page_range, path, bounds[i], bounds[i + 1]) for i in range(workers)]
+    for future in futures:
+        future.result()
+
+
+def new_pool(workers: int, module: str) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=importlib.import_module,
+        initargs=(module,),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", nargs="?", default=str(DEFAULT_PDF))
+    parser.add_argument("--pages", nargs="*", type=int, default=[8, 16, 32, 64, 128])
+    parser.add_argument("--workers", nargs="*", type=int, default=[2, 4])
+    parser.add_argument("--worker-import", default="src.retrieval.dense_retriever")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs; workers import {args.worker_import}")
+    print(f"{'pages':>6} {'serial':>9} {'per page':>9} " + " ".join(f"{f'cold x{w}':>9} {f'warm x{w}':>9}" for w in args.workers))
+    with tempfile.TemporaryDirectory() as tmp:
+        pools = {w: new_pool(w, args.worker_import) for w in args.workers}
+        for pool in pools.values():
+            pool.submit(int).result()
+        for pages in args.pages:
+            path, count = cut_pdf(args.pdf, pages, tmp)
+            serial = best_of(lambda: _convert_page_range(path, 0, count), args.repeat)
+            cells = []
+            for workers, pool in pools.items():
+                def cold():
+                    with new_pool(workers, args.worker_import) as fresh:
+                        convert_on(fresh, path, count, workers)
+                cells.append(best_of(cold, 1))
+                convert_on(pool, path, count, workers)  # warm the page cache for this file
+                cells.append(best_of(lambda: convert_on(pool, path, count, workers), args.repeat))
+            print(
+                f"{count:>6} {serial * 1e3:>7.0f}ms {serial / count * 1e3:>7.1f}ms "
+                + " ".join(f"{c * 1e3:>7.0f}ms" for c in cells)
+            )
+        for pool in pools.values():
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
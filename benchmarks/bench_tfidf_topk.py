@@ -0,0 +1,109 @@
+"""Benchmark TF-IDF query scoring and top-k selection from 1k to 1M chunks.
+
+Builds synthetic boosted TF-IDF matrices (Zipf-distributed terms, like real chunk text)
+and compares, per query:
+  - legacy: cosine_similarity against the doc-major matrix + full argsort
+  - current: sparse dot product against the pre-normalized term-major CSR + top_k_positions
+It also times the financial-term boost: the legacy per-column loop over a CSC copy
+versus diagonal scaling + row normalization.
+
+Usage: python -m benchmarks.bench_tfidf_topk [n_docs ...] [--terms-per-doc N] [--queries N]
+       (default sizes: 1000 10000 100000 1000000)
+"""
+import argparse
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from src.config import Config
+from src.retrieval.tfidf_retriever import top_k_positions
+
+N_FEATURES = Config.MAX_FEATURES
+
+
+def synthetic_matrix(n_docs: int, terms_per_doc: int, rng: np.random.Generator) -> sp.csr_matrix:
+    """Row-normalized doc-term matrix with Zipf term frequencies."""
+    ranks = np.arange(1, N_FEATURES + 1, dtype=np.float64)
+    probs = (1.0 / ranks) / np.sum(1.0 / ranks)
+    indices = rng.choice(N_FEATURES, size=n_docs * terms_per_doc, p=probs).astype(np.int32)
+    data = rng.random(indices.size) + 0.1
+    indptr = np.arange(0, indices.size + 1, terms_per_doc, dtype=np.int64)
+    matrix = sp.csr_matrix((data, indices, indptr), shape=(n_docs, N_FEATURES))
+    matrix.sum_duplicates()
+    return normalize(matrix, norm="l2", copy=False)
+
+
+def legacy_boost(matrix: sp.csr_matrix, weights: np.ndarray) -> sp.csr_matrix:
+    boosted = matrix.tocsc(copy=True)
+    for j in range(boosted.shape[1]):
+        if weights[j] != 1.0:
+            start, end = boosted.indptr[j], boosted.indptr[j + 1]
+            boosted.data[start:end] *= weights[j]
+    return boosted.tocsr(copy=True)
+
+
+def current_boost(matrix: sp.csr_matrix, weights: np.ndarray) -> sp.csr_matrix:
+    boosted = normalize(matrix @ sp.diags(weights), norm="l2", copy=False)
+    return boosted.T.tocsr()
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sizes", nargs="*", type=int, default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--terms-per-doc", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=Config.DEFAULT_TOP_K)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    weights = np.ones(N_FEATURES)
+    weights[rng.choice(N_FEATURES, size=len(Config.FINANCIAL_10Q_TERMS), replace=False)] = Config.FINANCIAL_BOOST
+    # Queries of 3-6 terms drawn from the mid-frequency range of the vocabulary
+    queries = []
+    for _ in range(args.queries):
+        terms = rng.choice(np.arange(10, 2000), size=rng.integers(3, 7), replace=False)
+        query = sp.csr_matrix((np.ones(terms.size), (np.zeros(terms.size, dtype=int), terms)), shape=(1, N_FEATURES))
+        queries.append(normalize(query))
+
+    print(f"{'docs':>10} {'boost legacy':>13} {'boost now':>10} {'query legacy':>13} {'query now':>10} {'speedup':>8}")
+    for n_docs in args.sizes:
+        matrix = synthetic_matrix(n_docs, args.terms_per_doc, rng)
+        boost_legacy = best_of(lambda: legacy_boost(matrix, weights), 1)
+        boost_now = best_of(lambda: current_boost(matrix, weights), 1)
+        doc_major = legacy_boost(matrix, weights)
+        term_major = current_boost(matrix, weights)
+        del matrix
+
+        def run_legacy():
+            for q in queries:
+                scores = cosine_similarity(q, doc_major).flatten()
+                np.argsort(scores)[::-1][: args.top_k]
+
+        def run_current():
+            for q in queries:
+                matched = (q @ term_major).tocsr()
+                matched.indices[top_k_positions(matched.data, args.top_k, tiebreak=matched.indices)]
+
+        query_legacy = best_of(run_legacy, 3) / len(queries)
+        query_now = best_of(run_current, 3) / len(queries)
+        print(
+            f"{n_docs:>10} {boost_legacy * 1e3:>11.1f}ms {boost_now * 1e3:>8.1f}ms "
+            f"{query_legacy * 1e3:>11.2f}ms {query_now * 1e3:>8.2f}ms {query_legacy / query_now:>7.1f}x"
+        )
+        del doc_major, term_major
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 
 # Disable ChromaDB telemetry completely - must be set before any ChromaDB imports
 os.environ["ANONYMIZED_TELEMETRY"] = "False"
@@ -6,6 +7,10 @@ os.environ["CHROMA_TELEMETRY"] = "False"
 os.environ["CHROMA_DISABLE_TELEMETRY"] = "True"
 
 class Config:
+    # Repository root: relative data paths below are resolved against it (see resolve_path),
+    # so indexes and caches land in the same place whatever the working directory
+    BASE_DIR = Path(__file__).resolve().parents[1]
+
     # Core settings (increased for better financial document processing)
     CHUNK_SIZE = 400
     CHUNK_OVERLAP = 50
@@ -14,6 +19,17 @@ class Config:
     DENSE_WEIGHT = 0.7
     TFIDF_WEIGHT = 0.3
     GRAPH_ENHANCEMENT_WEIGHT = 0.15
+
+    # Hybrid fan-out: dense and sparse searches run concurrently on one executor per ensemble;
+    # a retriever slower than the timeout (seconds, None = no limit) is left out of fusion,
+    # and one with MAX_IN_FLIGHT searches still running (timed-out ones included) is skipped
+    RETRIEVER_TIMEOUT_SECONDS = 30.0
+    RETRIEVER_MAX_IN_FLIGHT = 4
+    # Hybrid fusion over chunk ids: "rrf" (rank-based), "minmax" or "zscore" (normalized scores)
+    FUSION_METHOD = "rrf"
+    # Retrieval result cache (LRU entries, TTL seconds; size 0 disables it)
+    RETRIEVAL_CACHE_SIZE = 256
+    RETRIEVAL_CACHE_TTL_SECONDS = 900
     
     # 10-Q specific TF-IDF terms
     FINANCIAL_10Q_TERMS = {
@@ -45,6 +61,25 @@ class Config:
     # Enhanced TF-IDF settings for financial documents
     MAX_FEATURES = 8000  # Increased to accommodate bigrams and financial terms
     FINANCIAL_BOOST = 2.5  # Slightly higher boost for financial terms
+
+    # Persist fitted TF-IDF models (vocabulary, IDF, boosted CSR matrix) per chunk-set
+    # fingerprint; reopened indexes are memory-mapped instead of refit
+    PERSIST_TFIDF_INDEX = True
+    TFIDF_INDEX_DIR = os.path.join("data", "index", "tfidf")
+    TFIDF_MAX_INDEXES = 8  # fingerprints kept on disk; least recently used ones are deleted
+
+    # Lexical retriever used by the ensembles: "tfidf" (Financial10QRetriever),
+    # "bm25" (inverted index with block-max pruning), "fts5" (disk-resident SQLite
+    # archive at FTS_INDEX_PATH) or "hashed" (incremental TF-IDF over hashed features);
+    # all apply the FINANCIAL_10Q_TERMS boosts
+    SPARSE_ENGINE = "tfidf"
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+    BM25_BLOCK_SIZE = 128  # documents per doc-id range in the block-max index
+    FTS_INDEX_PATH = os.path.join("data", "index", "sparse_fts5.sqlite")
+    FTS_MAX_CHUNK_SETS = 8  # fingerprint-keyed chunk sets kept in the archive (least recently used deleted)
+    HASHED_N_FEATURES = 2 ** 20  # hashed feature buckets
+    HASHED_MAX_SEGMENTS = 8  # appended segments kept before merging
     
     # Tools routing keywords
     TABLE_KEYWORDS = ['revenue', 'income', 'balance', 'cash_flow', 'financial_statement',
@@ -63,6 +98,23 @@ class Config:
     TABLE_KEYWORDS = TABLE_KEYWORDS + ENHANCED_TABLE_KEYWORDS
     RISK_KEYWORDS = ['risk', 'uncertainty', 'factor', 'may_adversely']
     MDA_KEYWORDS = ['management', 'discussion', 'analysis', 'outlook', 'results']
+
+    # Element-level keyword fallbacks used by MDATool/RiskTool when the
+    # structured 10-Q section is missing or nearly empty
+    MDA_FILTER_KEYWORDS = [
+        "management", "discussion", "analysis", "md&a", "results of operations",
+        "financial condition", "liquidity", "capital resources", "outlook",
+        "business environment", "market conditions", "financial performance",
+        "executive overview", "consolidated revenues", "operating income",
+        "three months ended", "revenue", "expenses", "profitability"
+    ]
+    RISK_FILTER_KEYWORDS = [
+        "risk", "risks", "uncertainty", "uncertainties", "may adversely",
+        "could adversely", "risk factors", "forward-looking", "cautionary",
+        "material adverse", "significant risk", "potential impact",
+        "contractual obligations", "commitments", "acquisition", "regulatory",
+        "market risk", "competitive", "economic conditions"
+    ]
     
     # UI settings
     DEFAULT_TOP_K = 5
@@ -78,10 +130,60 @@ class Config:
     # If True, use section-aware semantic chunking; otherwise, legacy 1:1 element wrapping
     USE_SECTION_AWARE_CHUNKING = True
 
+    # PDF → HTML conversion: worker processes (0 = all CPUs, 1 = serial); documents with
+    # fewer pages than the minimum are always converted serially. Serial by default:
+    # benchmarks/bench_pdf_to_html.py measured ~3.7ms/page serially (a 120-page 10-Q in
+    # ~0.45s) against ~6s to start each spawned worker, so the pool (started once and
+    # kept) only pays off for very long documents on multi-core hosts
+    PDF_CONVERSION_WORKERS = 1
+    PDF_PARALLEL_MIN_PAGES = 256
+
+    # Write converted HTML next to the uploaded PDF (debug only; parsing runs in memory)
+    WRITE_HTML_DEBUG_ARTIFACT = False
+
+    # Ingestion cache: reuse HTML/elements/chunks for previously processed PDFs
+    # (keyed by PDF content hash; chunks also by the chunking settings above)
+    ENABLE_INGESTION_CACHE = True
+    INGESTION_CACHE_DIR = os.path.join("data", "cache", "ingestion")
+    INGESTION_CACHE_MAX_ENTRIES = 16  # PDFs kept; least recently used entries are deleted
+
+    # Dense retrieval: embedding model, persistent embedding cache and Chroma collections
+    EMBEDDING_MODEL_NAME = "sentence-transformers/all-mpnet-base-v2"
+    EMBEDDING_CACHE_DIR = os.path.join("data", "cache", "embeddings")
+    PERSIST_DENSE_INDEX = True
+    CHROMA_PERSIST_DIR = os.path.join("data", "index", "chroma")
+    # Fingerprint-named collections kept on disk; the least recently used ones beyond this are deleted
+    CHROMA_MAX_COLLECTIONS = 8
+
+    # Shared embedding service: one model copy per process; texts per encode batch and
+    # torch intra-op threads (0 = torch default). RAGAS uses a smaller model.
+    EMBEDDING_BATCH_SIZE = 32
+    EMBEDDING_NUM_THREADS = 0
+    RAGAS_EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
     # Graph SIMILAR_TO enhancement
     ENABLE_SIMILAR_TO = False
     SIMILAR_TOP_N = 5
     SIMILARITY_THRESHOLD = 0.7
+    # SIMILAR_TO construction: exact scan in row blocks, or an HNSW index (needs hnswlib)
+    # for graphs of at least SIMILAR_TO_ANN_MIN_CHUNKS chunks
+    SIMILAR_TO_BLOCK_SIZE = 1024
+    SIMILAR_TO_ANN = False
+    SIMILAR_TO_ANN_MIN_CHUNKS = 5000
+    # Serve graph expansion from an in-memory copy of the chunk graph (Neo4j stays the source of truth)
+    GRAPH_ADJACENCY_CACHE = True
+    # Create Neo4j constraints/indexes (Document.title, Section(title, path), Chunk.uid) on connect
+    NEO4J_ENSURE_SCHEMA = True
+    # Keep several filings in one graph: loading a document replaces only that document
+    # (skipped when unchanged) instead of deleting every stored document first
+    GRAPH_MULTI_DOCUMENT = False
+    # Graph backend: "neo4j", "memory" (embedded, persisted to GRAPH_STORE_PATH) or "auto"
+    # (Neo4j when its URI/user/password are configured, otherwise the embedded graph)
+    GRAPH_BACKEND = "auto"
+    GRAPH_STORE_PATH = os.path.join("data", "index", "graph")  # directory: manifest + one file per document
+    # Neo4j ingestion: rows per write transaction, parallel sessions for independent documents
+    NEO4J_BATCH_SIZE = 1000
+    NEO4J_WRITE_WORKERS = 4
 
     # Metadata schema (5 fields)
     METADATA_SCHEMA = {
@@ -98,6 +200,12 @@ class Config:
     LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
     LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+    @classmethod
+    def resolve_path(cls, path: str | os.PathLike) -> Path:
+        """Absolute form of a configured data path; relative paths are anchored at BASE_DIR."""
+        path = Path(path)
+        return path if path.is_absolute() else cls.BASE_DIR / path
+
     @classmethod
     def validate(cls):
         """Validate configuration values and constraints.
@@ -9,7 +9,6 @@ try:
     from ragas.llms import LangchainLLMWrapper as RagasLangchainLLM
 except ImportError:  # version compatibility
     from ragas.llms import LangchainLLM as RagasLangchainLLM
-from langchain_community.embeddings import HuggingFaceEmbeddings
 try:
     from ragas.embeddings import LangchainEmbeddings
 except ImportError:
@@ -19,6 +18,8 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from datasets import Dataset
 import logging
 import os
+from ..config import Config
+from ..retrieval.embedding_service import get_embedding_service
 
 class GeminiLLMWrapper:
     """Custom wrapper for Gemini to work with RAGAS."""
@@ -66,17 +67,13 @@ def evaluate_ragas(question, answer, context, ground_truth, api_key=None):
 
         # Configure embeddings to use HuggingFace (free, no API key needed)
         logger.info("Setting up HuggingFace embeddings for RAGAS")
+        base_embeddings = get_embedding_service(Config.RAGAS_EMBEDDING_MODEL_NAME)
         if LangchainEmbeddings:
             # Use RAGAS's LangchainEmbeddings wrapper
-            base_embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
             hf_embeddings = LangchainEmbeddings(base_embeddings)
         else:
             # Direct LangChain embeddings (might work with newer RAGAS versions)
-            hf_embeddings = HuggingFaceEmbeddings(
-                model_name="sentence-transformers/all-MiniLM-L6-v2"
-            )
+            hf_embeddings = base_embeddings
 
         # Configure ALL FOUR RAGAS metrics to use Gemini LLM
         faithfulness.llm = ragas_llm
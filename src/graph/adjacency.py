@@ -0,0 +1,188 @@
+from langchain_core.documents import Document
+from typing import Iterable, Iterator, List
+import logging
+import re
+import numpy as np
+
+# Chunk properties mirrored from the Neo4j Chunk nodes
+_CHUNK_FIELDS = ("chunk_id", "document_title", "page_number", "section_path", "content_type", "element_type")
+_CHUNK_NUMBER_RE = re.compile(r"(\d+)$")
+
+
+def chunk_uid(document_title: str | None, chunk_id: str | None) -> str | None:
+    """Graph-wide chunk identity: "<document_title>::<chunk_id>".
+
+    chunk_document numbers chunks per document, so bare chunk ids collide once several
+    filings share a graph. Without a title the bare chunk id is returned.
+    """
+    if chunk_id is None:
+        return None
+    return f"{document_title}::{chunk_id}" if document_title else chunk_id
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, n: int, order_key: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """(indptr, indices) of the edges sources -> targets, each row ordered by order_key[target]."""
+    keys = (targets,) if order_key is None else (targets, order_key[targets])
+    order = np.lexsort(keys + (sources,))
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(sources, minlength=n))]).astype(np.int64)
+    return indptr, targets[order].astype(np.int32)
+
+
+class ChunkAdjacency:
+    """In-memory copy of the chunk graph (NEXT, section membership, SIMILAR_TO) as CSR arrays.
+
+    Chunks are numbered 0..n-1; each relationship is an `indptr`/`indices` pair of int
+    arrays, and section membership is a chunk -> section code array plus a section ->
+    members CSR. `neighbors` answers the same expansion GraphEnhancedRetriever asks
+    Neo4j for (NEXT, then up to SECTION_LIMIT section members, then up to SIMILAR_LIMIT
+    SIMILAR_TO targets, each by page number) with array slicing instead of a round-trip.
+
+    Build it from the chunks being written (`Neo4jGraph.add_document_structure`) or once
+    from the database with `from_neo4j`; Neo4j stays the source of truth. Chunks are
+    keyed by `chunk_uid` (`uids`, by default from their document_title metadata), so
+    NEXT chains and section groups never cross documents; a bare chunk id also resolves
+    when exactly one document has it.
+    """
+
+    SECTION_LIMIT = 25
+    SIMILAR_LIMIT = 25
+
+    def __init__(
+        self,
+        chunks: List[Document],
+        *,
+        next_edges: Iterable[tuple[str, str]] | None = None,
+        similar_edges: Iterable[tuple[str, str, float]] = (),
+        uids: List[str] | None = None,
+    ):
+        n = len(chunks)
+        self._chunks = chunks
+        self.chunk_ids = [(doc.metadata or {}).get("chunk_id") for doc in chunks]
+        titles = [(doc.metadata or {}).get("document_title") for doc in chunks]
+        self.uids = list(uids) if uids is not None else [chunk_uid(t, c) for t, c in zip(titles, self.chunk_ids)]
+        self._position = {uid: i for i, uid in enumerate(self.uids) if uid is not None}
+        counts: dict[str, int] = {}
+        for chunk_id in self.chunk_ids:
+            counts[chunk_id] = counts.get(chunk_id, 0) + 1
+        self._unique_chunk_ids = {
+            chunk_id: i for i, chunk_id in enumerate(self.chunk_ids) if chunk_id is not None and counts[chunk_id] == 1
+        }
+        pages = [(doc.metadata or {}).get("page_number") for doc in chunks]
+        # Unknown pages sort last, as coalesce(page_number, 1e9) does in Cypher
+        self.page_numbers = np.array([1e9 if p is None else float(p) for p in pages], dtype=np.float64)
+
+        if next_edges is None:
+            # Same chain the writer creates: each document's chunks ordered by their numeric chunk_id suffix
+            def chunk_number(i: int) -> tuple[str, int]:
+                match = _CHUNK_NUMBER_RE.search(self.chunk_ids[i] or "")
+                return titles[i] or "", int(match.group(1)) if match else i
+            order = sorted(range(n), key=chunk_number)
+            pairs = [(a, b) for a, b in zip(order, order[1:]) if titles[a] == titles[b]]
+            next_src = np.asarray([a for a, _ in pairs], dtype=np.int64)
+            next_dst = np.asarray([b for _, b in pairs], dtype=np.int64)
+        else:
+            next_src, next_dst = self._edge_arrays((src, dst) for src, dst in next_edges)
+        self.next_indptr, self.next_indices = _csr(next_src, next_dst, n)
+
+        # Section membership: chunk -> section code (-1 without a section), section -> members.
+        # Sections are per document, like the (title, path) Section nodes.
+        paths = [(t or "", (doc.metadata or {}).get("section_path") or "") for t, doc in zip(titles, chunks)]
+        codes: dict[tuple[str, str], int] = {}
+        self.section_of = np.array([codes.setdefault(p, len(codes)) if p[1] else -1 for p in paths], dtype=np.int32)
+        members = np.flatnonzero(self.section_of >= 0)
+        self.section_indptr, self.section_members = _csr(self.section_of[members].astype(np.int64), members, len(codes))
+
+        similar = [(src, dst, score) for src, dst, score in similar_edges if src in self._position and dst in self._position]
+        sim_src, sim_dst = self._edge_arrays((src, dst) for src, dst, _ in similar)
+        self.similar_indptr, self.similar_indices = _csr(sim_src, sim_dst, n, order_key=self.page_numbers)
+        self.num_similar_edges = int(sim_src.size)
+
+    def _edge_arrays(self, edges: Iterable[tuple[str, str]]) -> tuple[np.ndarray, np.ndarray]:
+        pairs = [(self._position[src], self._position[dst]) for src, dst in edges
+                 if src in self._position and dst in self._position]
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        src, dst = np.asarray(pairs, dtype=np.int64).T
+        return src, dst
+
+    @classmethod
+    def from_neo4j(cls, driver) -> "ChunkAdjacency":
+        """Load every Chunk node with its NEXT and SIMILAR_TO edges (three queries, one session)."""
+        with driver.session() as session:
+            chunk_rows = list(session.run(
+                """
+                MATCH (c:Chunk)
+                RETURN c.uid AS uid, c.chunk_id AS chunk_id, c.doc_title AS document_title, c.text AS content,
+                       c.page_number AS page_number, c.section_path AS section_path,
+                       c.element_type AS element_type, c.content_type AS content_type
+                """
+            ))
+            chunks = [
+                Document(
+                    page_content=row.get("content") or "",
+                    metadata={k: row.get(k) for k in _CHUNK_FIELDS if row.get(k) is not None},
+                )
+                for row in chunk_rows
+            ]
+            uids = [row.get("uid") for row in chunk_rows]
+            next_edges = [
+                (row["src"], row["dst"])
+                for row in session.run("MATCH (a:Chunk)-[:NEXT]->(b:Chunk) RETURN a.uid AS src, b.uid AS dst")
+            ]
+            similar_edges = [
+                (row["src"], row["dst"], row["score"])
+                for row in session.run(
+                    "MATCH (a:Chunk)-[r:SIMILAR_TO]->(b:Chunk) RETURN a.uid AS src, b.uid AS dst, r.score AS score"
+                )
+            ]
+        adjacency = cls(chunks, next_edges=next_edges, similar_edges=similar_edges, uids=uids)
+        logging.getLogger("graph.adjacency").info(
+            f"Loaded chunk adjacency from Neo4j: {len(chunks)} chunks, {len(next_edges)} NEXT, "
+            f"{adjacency.num_similar_edges} SIMILAR_TO edges"
+        )
+        return adjacency
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.chunk_ids)
+
+    def neighbor_positions(self, position: int, *, include_similar: bool = False) -> Iterator[tuple[int, str]]:
+        """(chunk position, graph_source) pairs for one chunk, in expansion order."""
+        for j in self.next_indices[self.next_indptr[position]:self.next_indptr[position + 1]]:
+            yield int(j), "NEXT"
+        section = self.section_of[position]
+        if section >= 0:
+            members = self.section_members[self.section_indptr[section]:self.section_indptr[section + 1]]
+            members = members[:self.SECTION_LIMIT]
+            for j in members[np.argsort(self.page_numbers[members], kind="stable")]:
+                yield int(j), "SECTION"
+        if include_similar:
+            for j in self.similar_indices[self.similar_indptr[position]:self.similar_indptr[position + 1]][:self.SIMILAR_LIMIT]:
+                yield int(j), "SIMILAR_TO"
+
+    def position(self, uid: str) -> int | None:
+        """Position of a chunk by chunk_uid, or by bare chunk id when that id is unique."""
+        position = self._position.get(uid)
+        return position if position is not None else self._unique_chunk_ids.get(uid)
+
+    def neighbors(self, uids: Iterable[str], *, include_similar: bool = False) -> Iterator[Document]:
+        """NEXT, section and SIMILAR_TO neighbors of the given chunks, tagged with graph_source
+        and with the uid they were reached from (graph_seed).
+
+        Documents are built lazily, so a caller that stops early pays only for what it takes.
+        Unknown chunks are skipped.
+        """
+        for uid in uids:
+            position = self.position(uid)
+            if position is None:
+                continue
+            for j, source in self.neighbor_positions(position, include_similar=include_similar):
+                yield self._document(j, source, uid)
+
+    def _document(self, position: int, graph_source: str, graph_seed: str | None = None) -> Document:
+        chunk = self._chunks[position]
+        metadata = {k: v for k, v in (chunk.metadata or {}).items() if k in _CHUNK_FIELDS and v is not None}
+        metadata["graph_source"] = graph_source
+        if graph_seed is not None:
+            metadata["graph_seed"] = graph_seed
+        return Document(page_content=chunk.page_content, metadata=metadata)
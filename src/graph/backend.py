@@ -0,0 +1,80 @@
+from abc import ABC, abstractmethod
+from langchain_core.documents import Document
+from typing import Iterable, Iterator
+import logging
+from ..config import Config
+from .adjacency import ChunkAdjacency
+
+
+class GraphBackend(ABC):
+    """Chunk graph store used by GraphEnhancedRetriever.
+
+    A backend stores documents as chunks linked by NEXT (reading order), section
+    membership and optional SIMILAR_TO edges, keyed by chunk_uid, and serves them as a
+    ChunkAdjacency. `Neo4jGraph` keeps the graph in a Neo4j server; `InMemoryGraph`
+    keeps it in process and optionally persists it to a file.
+    """
+
+    # Human-readable backend name for status messages
+    name = "graph"
+    # True when `adjacency()` is the graph itself rather than a copy of a remote one;
+    # the retriever then always expands from it, whatever Config.GRAPH_ADJACENCY_CACHE says
+    in_process = True
+    # Constraint/index name -> state, for backends that have a schema
+    schema_status: dict[str, str] = {}
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete every stored document."""
+
+    @abstractmethod
+    def add_documents(self, documents: list[tuple[str, list[Document]]], *, replace: bool = True) -> dict:
+        """Store several (title, chunks) documents.
+
+        With `replace`, a stored document of the same title is replaced, or left as is when
+        its chunks are unchanged. Returns {"documents", "skipped", "rows", "seconds",
+        "rows_per_sec"}.
+        """
+
+    @abstractmethod
+    def adjacency(self) -> ChunkAdjacency:
+        """The stored chunk graph as in-memory CSR arrays."""
+
+    def add_document_structure(self, chunks: list[Document], *, doc_title: str | None = None) -> dict:
+        """Store one document's chunk graph.
+
+        Single-document mode (the default): every previously stored document is deleted
+        first. With Config.GRAPH_MULTI_DOCUMENT only the document of the same title is
+        replaced, and left untouched when its chunks are unchanged; other documents stay.
+        Returns the write statistics of add_documents.
+        """
+        title = doc_title or "Untitled"
+        if getattr(Config, "GRAPH_MULTI_DOCUMENT", False):
+            return self.add_documents([(title, chunks)], replace=True)
+        self.clear()
+        logging.getLogger("graph").info("Cleared ALL existing documents for single-document processing")
+        return self.add_documents([(title, chunks)], replace=False)
+
+    def neighbors(self, uids: Iterable[str], *, include_similar: bool = False) -> Iterator[Document]:
+        """NEXT, section and SIMILAR_TO neighbors of the given chunks (see ChunkAdjacency.neighbors)."""
+        return self.adjacency().neighbors(uids, include_similar=include_similar)
+
+    def close(self) -> None:
+        pass
+
+
+def create_graph_backend(uri: str | None = None, user: str | None = None, password: str | None = None) -> GraphBackend:
+    """Graph backend for Config.GRAPH_BACKEND.
+
+    "neo4j" connects to the given server; "memory" opens the InMemoryGraph persisted at
+    Config.GRAPH_STORE_PATH; "auto" (the default) uses Neo4j when a URI, user and password
+    are all given and the in-memory graph otherwise.
+    """
+    backend = getattr(Config, "GRAPH_BACKEND", "auto")
+    if backend not in ("auto", "neo4j", "memory"):
+        raise ValueError(f"Unknown graph backend: {backend}")
+    if backend == "neo4j" or (backend == "auto" and uri and user and password):
+        from .neo4j_graph import Neo4jGraph  # local import: the neo4j driver is optional here
+        return Neo4jGraph(uri, user, password)
+    from .memory_graph import InMemoryGraph
+    return InMemoryGraph(getattr(Config, "GRAPH_STORE_PATH", None))
@@ -0,0 +1,247 @@
+from langchain_core.documents import Document
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import Path
+import numpy as np
+from ..config import Config
+from ..retrieval.fingerprint import documents_fingerprint
+from .adjacency import ChunkAdjacency, chunk_uid
+from .backend import GraphBackend
+from .similarity import similar_chunk_edges
+
+# Bump when the on-disk layout changes
+GRAPH_STORE_VERSION = 2
+
+# Chunk metadata kept in the store (the properties Neo4jGraph writes on Chunk nodes)
+_STORED_FIELDS = ("chunk_id", "page_number", "section_path", "element_type", "content_type")
+
+_MANIFEST = "manifest.json"
+
+
+class InMemoryGraph(GraphBackend):
+    """Embedded chunk graph: the Neo4jGraph data model held in process.
+
+    Documents are kept as their chunk lists plus SIMILAR_TO edges, and served as one
+    ChunkAdjacency (CSR arrays) rebuilt lazily after each write, so graph expansion
+    costs no network round-trip. With a `path` (a directory, resolved against
+    Config.BASE_DIR), the graph is loaded from it on construction and each write
+    persists only the documents it changed:
+
+      - ``manifest.json``: version and the stored documents (title, fingerprint, file),
+        in insertion order
+      - one ``<title hash>.npz`` per document: ``meta`` (UTF-8 JSON as a uint8 array with
+        the title, fingerprint and each chunk's text and metadata, in document order) and
+        ``similar_src``, ``similar_dst``, ``similar_score`` (SIMILAR_TO edges as chunk
+        positions within the document, and scores)
+
+    Files are written to a temporary file and renamed into place, document files before
+    the manifest. A document file that is missing, unreadable or does not match its
+    manifest entry is discarded on load. NEXT edges are not stored: they follow the
+    chunk order within each document.
+    """
+
+    name = "in-memory"
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self.path = Config.resolve_path(path) if path else None
+        self.logger = logging.getLogger("graph.memory")
+        # title -> {"chunks", "similar_edges", "fingerprint"}, in insertion order
+        self._documents: dict[str, dict] = {}
+        self._adjacency: ChunkAdjacency | None = None
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    @property
+    def document_titles(self) -> list[str]:
+        return list(self._documents)
+
+    def clear(self) -> None:
+        with self._lock:
+            titles = list(self._documents)
+            self._documents.clear()
+            self._adjacency = None
+            if self.path is not None:
+                self._save_manifest()
+                for title in titles:
+                    self._remove_file(self._document_file(title))
+
+    def add_documents(self, documents: list[tuple[str, list[Document]]], *, replace: bool = True) -> dict:
+        """Store several documents' chunk graphs; same contract as Neo4jGraph.add_documents.
+
+        Chunks are copied with their document_title set to the title. A document of an
+        already stored title always replaces it; with `replace` an unchanged one (same
+        fingerprint) is skipped.
+        """
+        uids = [chunk_uid(title, (ch.metadata or {}).get("chunk_id")) for title, chunks in documents for ch in chunks]
+        uids = [uid for uid in uids if uid is not None]
+        if len(set(uids)) != len(uids):
+            raise ValueError("Chunk ids must be unique within each document and titles distinct")
+
+        enable_similar = bool(getattr(Config, "ENABLE_SIMILAR_TO", False))
+        start = time.perf_counter()
+        rows = skipped = 0
+        changed: list[str] = []
+        with self._lock:
+            for title, chunks in documents:
+                fingerprint = f"{documents_fingerprint(chunks)}:similar={enable_similar}"
+                stored = self._documents.get(title)
+                if replace and stored is not None and stored["fingerprint"] == fingerprint:
+                    self.logger.info(f"Document graph for '{title}' is unchanged; skipping write")
+                    skipped += 1
+                    continue
+                copies = [
+                    Document(page_content=ch.page_content, metadata={**(ch.metadata or {}), "document_title": title})
+                    for ch in chunks
+                ]
+                similar_edges = []
+                if enable_similar and copies:
+                    similar_edges = similar_chunk_edges(
+                        [chunk_uid(title, ch.metadata.get("chunk_id")) for ch in copies],
+                        [ch.page_content for ch in copies],
+                    )
+                self._documents.pop(title, None)
+                self._documents[title] = {"chunks": copies, "similar_edges": similar_edges, "fingerprint": fingerprint}
+                changed.append(title)
+                rows += len(copies) + max(len(copies) - 1, 0) + len(similar_edges)
+            if changed:
+                self._adjacency = None
+                if self.path is not None:
+                    for title in changed:
+                        self._save_document(title)
+                    self._save_manifest()
+        seconds = time.perf_counter() - start
+        stats = {
+            "documents": len(documents),
+            "skipped": skipped,
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+        }
+        self.logger.info(f"In-memory graph: {len(documents)} documents ({skipped} unchanged), {rows} rows in {seconds:.2f}s")
+        return stats
+
+    def adjacency(self) -> ChunkAdjacency:
+        with self._lock:
+            if self._adjacency is None:
+                self._adjacency = self._build_adjacency()
+            return self._adjacency
+
+    def _build_adjacency(self) -> ChunkAdjacency:
+        chunks: list[Document] = []
+        uids: list[str | None] = []
+        next_edges: list[tuple[str, str]] = []
+        similar_edges: list[tuple[str, str, float]] = []
+        for title, document in self._documents.items():
+            doc_uids = [chunk_uid(title, ch.metadata.get("chunk_id")) for ch in document["chunks"]]
+            # Same NEXT chain the Neo4j writer creates: consecutive chunks in reading order
+            next_edges.extend(zip(doc_uids, doc_uids[1:]))
+            chunks.extend(document["chunks"])
+            uids.extend(doc_uids)
+            similar_edges.extend(document["similar_edges"])
+        return ChunkAdjacency(chunks, next_edges=next_edges, similar_edges=similar_edges, uids=uids)
+
+    def _document_file(self, title: str) -> Path:
+        return self.path / f"{hashlib.sha256(title.encode('utf-8')).hexdigest()[:32]}.npz"
+
+    def _write_atomic(self, target: Path, write) -> bool:
+        self.path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, target)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Failed to save in-memory graph file {target}: {e}")
+            self._remove_file(Path(tmp_path))
+            return False
+
+    @staticmethod
+    def _remove_file(path: Path) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _save_document(self, title: str) -> None:
+        document = self._documents[title]
+        positions = {chunk_uid(title, ch.metadata.get("chunk_id")): i for i, ch in enumerate(document["chunks"])}
+        meta = {
+            "version": GRAPH_STORE_VERSION,
+            "title": title,
+            "fingerprint": document["fingerprint"],
+            "chunks": [
+                {"text": ch.page_content, "metadata": {k: ch.metadata.get(k) for k in _STORED_FIELDS if ch.metadata.get(k) is not None}}
+                for ch in document["chunks"]
+            ],
+        }
+        similar = document["similar_edges"]
+        self._write_atomic(self._document_file(title), lambda f: np.savez(
+            f,
+            meta=np.frombuffer(json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"), dtype=np.uint8),
+            similar_src=np.array([positions[src] for src, _, _ in similar], dtype=np.int64),
+            similar_dst=np.array([positions[dst] for _, dst, _ in similar], dtype=np.int64),
+            similar_score=np.array([score for _, _, score in similar], dtype=np.float64),
+        ))
+
+    def _save_manifest(self) -> None:
+        manifest = {
+            "version": GRAPH_STORE_VERSION,
+            "documents": [
+                {"title": title, "fingerprint": document["fingerprint"], "file": self._document_file(title).name}
+                for title, document in self._documents.items()
+            ],
+        }
+        self._write_atomic(self.path / _MANIFEST, lambda f: f.write(json.dumps(manifest, ensure_ascii=False).encode("utf-8")))
+
+    def _load(self) -> None:
+        try:
+            with open(self.path / _MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != GRAPH_STORE_VERSION:
+                self.logger.warning(f"Ignoring in-memory graph {self.path}: unsupported version {manifest.get('version')}")
+                return
+            entries = [(str(d["title"]), str(d["fingerprint"]), str(d["file"])) for d in manifest["documents"]]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Discarding unreadable in-memory graph {self.path}: {e}")
+            return
+        for title, fingerprint, name in entries:
+            try:
+                self._documents[title] = self._load_document(self.path / name, title, fingerprint)
+            except (OSError, ValueError, KeyError, TypeError, IndexError, EOFError, zipfile.BadZipFile) as e:
+                self.logger.warning(f"Discarding unreadable in-memory graph document '{title}' ({name}): {e}")
+        chunks = sum(len(document["chunks"]) for document in self._documents.values())
+        self.logger.info(f"Loaded in-memory graph from {self.path}: {len(self._documents)} documents, {chunks} chunks")
+
+    @staticmethod
+    def _load_document(path: Path, title: str, fingerprint: str) -> dict:
+        """Read one document file, checking it against its manifest entry (raises ValueError/IndexError)."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            similar_src, similar_dst = data["similar_src"], data["similar_dst"]
+            similar_score = data["similar_score"]
+        if meta.get("version") != GRAPH_STORE_VERSION or meta.get("title") != title or meta.get("fingerprint") != fingerprint:
+            raise ValueError("file does not match the manifest")
+        if not len(similar_src) == len(similar_dst) == len(similar_score):
+            raise ValueError("SIMILAR_TO arrays differ in length")
+        chunks = [
+            Document(page_content=entry["text"], metadata={**entry["metadata"], "document_title": title})
+            for entry in meta["chunks"]
+        ]
+        uids = [chunk_uid(title, ch.metadata.get("chunk_id")) for ch in chunks]
+        if len(similar_src) and (min(similar_src.min(), similar_dst.min()) < 0 or max(similar_src.max(), similar_dst.max()) >= len(uids)):
+            raise IndexError("SIMILAR_TO edge refers to a missing chunk")
+        similar_edges = [
+            (uids[src], uids[dst], score)
+            for src, dst, score in zip(similar_src.tolist(), similar_dst.tolist(), similar_score.tolist())
+        ]
+        return {"chunks": chunks, "similar_edges": similar_edges, "fingerprint": fingerprint}
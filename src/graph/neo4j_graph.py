@@ -1,91 +1,242 @@
 from neo4j import GraphDatabase
 from langchain_core.documents import Document
-from langchain_community.embeddings import HuggingFaceEmbeddings
-import numpy as np
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .adjacency import ChunkAdjacency, chunk_uid
+from .backend import GraphBackend
 
 
-class Neo4jGraph:
+class Neo4jGraph(GraphBackend):
+    name = "Neo4j"
+    in_process = False
+
+    # (name, statement) pairs; IF NOT EXISTS makes each one idempotent. A uniqueness
+    # constraint is backed by an index of the same name.
+    SCHEMA_STATEMENTS = (
+        ("document_title", "CREATE CONSTRAINT document_title IF NOT EXISTS FOR (d:Document) REQUIRE d.title IS UNIQUE"),
+        ("section_title_path", "CREATE CONSTRAINT section_title_path IF NOT EXISTS FOR (s:Section) REQUIRE (s.title, s.path) IS UNIQUE"),
+        ("chunk_uid", "CREATE CONSTRAINT chunk_uid IF NOT EXISTS FOR (c:Chunk) REQUIRE c.uid IS UNIQUE"),
+        ("chunk_id_lookup", "CREATE INDEX chunk_id_lookup IF NOT EXISTS FOR (c:Chunk) ON (c.chunk_id)"),
+        ("chunk_document_section", "CREATE INDEX chunk_document_section IF NOT EXISTS FOR (c:Chunk) ON (c.doc_title, c.section_path)"),
+    )
+
     def __init__(self, uri, user, password):
+        from ..config import Config  # local import to avoid cycles at import time
         self.driver = GraphDatabase.driver(uri, auth=(user, password))
+        # In-process copy of the chunk graph for retrieval-time expansion (see adjacency())
+        self._adjacency: ChunkAdjacency | None = None
+        self._adjacency_lock = threading.Lock()
         logging.getLogger("graph").info("Connected to Neo4j")
+        self.schema_status: dict[str, str] = {}
+        if getattr(Config, "NEO4J_ENSURE_SCHEMA", True):
+            self.schema_status = self.ensure_schema()
+
+    def ensure_schema(self) -> dict[str, str]:
+        """Create the chunk graph's constraints and indexes if missing.
+
+        Returns index name -> state ("ONLINE", "POPULATING", ...; "FAILED: <error>" when the
+        statement was rejected, e.g. existing duplicates or missing privileges). Failures are
+        logged and never raised, so a read-only user can still query the graph.
+        """
+        logger = logging.getLogger("graph")
+        status: dict[str, str] = {}
+        try:
+            with self.driver.session() as session:
+                for name, statement in self.SCHEMA_STATEMENTS:
+                    try:
+                        session.run(statement).consume()
+                    except Exception as e:
+                        status[name] = f"FAILED: {e}"
+                        logger.warning(f"Neo4j schema statement '{name}' failed: {e}")
+                names = [name for name, _ in self.SCHEMA_STATEMENTS if name not in status]
+                result = session.run(
+                    "SHOW INDEXES YIELD name, state WHERE name IN $names RETURN name, state",
+                    names=names,
+                )
+                for record in result:
+                    status[record["name"]] = record["state"]
+        except Exception as e:
+            logger.warning(f"Neo4j schema bootstrap failed: {e}")
+            return status
+        online = sum(1 for state in status.values() if state == "ONLINE")
+        logger.info(f"Neo4j schema: {online}/{len(self.SCHEMA_STATEMENTS)} indexes online {status}")
+        return status
+
+    def adjacency(self) -> ChunkAdjacency:
+        """The chunk graph as in-memory CSR arrays, loaded from Neo4j on first use.
+
+        add_document_structure replaces it with the graph it just wrote, so the copy never
+        goes stale while this instance is the writer.
+        """
+        with self._adjacency_lock:
+            if self._adjacency is None:
+                self._adjacency = ChunkAdjacency.from_neo4j(self.driver)
+            return self._adjacency
 
     def close(self):
         self.driver.close()
         logging.getLogger("graph").info("Closed Neo4j connection")
 
-    def add_document_structure(self, chunks: list[Document], *, doc_title: str | None = None):
-        """Create Document/Section/Chunk graph from already built chunks.
-
-        Deletes only the subgraph for the current document title if provided.
-        """
-        logger = logging.getLogger("graph")
-        title = doc_title or "Untitled"
+    def clear(self) -> None:
+        """Delete every stored document, its sections and chunks."""
         with self.driver.session() as session:
-            # For single-document mode: clear ALL previous documents to prevent mixing
-            session.run(
+            session.execute_write(lambda tx: tx.run(
                 """
                 MATCH (d:Document)
                 OPTIONAL MATCH (d)-[:CONTAINS]->(s:Section)
                 OPTIONAL MATCH (s)-[:HAS_CHUNK]->(c:Chunk)
                 DETACH DELETE c, s, d
                 """
-            )
-            logger.info("Cleared ALL existing documents for single-document processing")
-            
-            # Alternative scoped delete (if needed for multi-document mode later):
-            # session.run(
-            #     """
-            #     MATCH (d:Document {title: $title})
-            #     OPTIONAL MATCH (d)-[:CONTAINS]->(s:Section)
-            #     OPTIONAL MATCH (s)-[:HAS_CHUNK]->(c:Chunk)
-            #     DETACH DELETE c, s, d
-            #     """,
-            #     title=title,
-            # )
-
-            # Ensure document node
-            session.run(
-                "CREATE (d:Document {title: $title})",
-                title=title,
-            )
+            ).consume())
+        with self._adjacency_lock:
+            self._adjacency = None
+
+    def add_documents(self, documents: list[tuple[str, list[Document]]], *, replace: bool = True) -> dict:
+        """Write several documents' chunk graphs, one parallel session per document.
+
+        Each document is written by `_write_document` in batched write transactions on
+        up to Config.NEO4J_WRITE_WORKERS threads. Chunks are identified by
+        `chunk_uid(title, chunk_id)`, so documents may reuse chunk ids. With `replace`, a
+        stored document of the same title is deleted first (only that document), unless
+        its stored fingerprint shows the chunks are unchanged, in which case it is skipped.
+
+        Returns {"documents", "skipped", "rows", "seconds", "rows_per_sec"}; rows counts
+        section, chunk, NEXT and SIMILAR_TO rows written.
+        """
+        from ..config import Config  # local import to avoid cycles at import time
+        logger = logging.getLogger("graph")
+        uids = [chunk_uid(title, (ch.metadata or {}).get("chunk_id")) for title, chunks in documents for ch in chunks]
+        uids = [uid for uid in uids if uid is not None]
+        if len(set(uids)) != len(uids):
+            raise ValueError("Chunk ids must be unique within each document and titles distinct")
 
-            # Prepare rows for Sections and Chunks
-            section_rows = []
-            chunk_rows = []
-            for ch in chunks:
-                md = ch.metadata or {}
-                section_path = md.get("section_path", "") or ""
-                section_rows.append({"title": title, "section_path": section_path})
-                chunk_rows.append(
-                    {
-                        "title": title,
-                        "section_path": section_path,
-                        "chunk_id": md.get("chunk_id"),
-                        "text": ch.page_content,
-                        "page_number": md.get("page_number"),
-                        "element_type": md.get("element_type"),
-                        "content_type": md.get("content_type"),
-                    }
+        workers = max(1, min(int(getattr(Config, "NEO4J_WRITE_WORKERS", 4)), len(documents)))
+        start = time.perf_counter()
+        if workers == 1:
+            results = [self._write_document(title, chunks, replace=replace) for title, chunks in documents]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neo4j-writer") as executor:
+                results = list(executor.map(lambda doc: self._write_document(doc[0], doc[1], replace=replace), documents))
+        seconds = time.perf_counter() - start
+        rows = sum(result["rows"] for result in results)
+        skipped = sum(1 for result in results if result["skipped"])
+
+        # Keep the in-process adjacency in step with the graph just written
+        with self._adjacency_lock:
+            if len(documents) == 1 and not replace:
+                title, chunks = documents[0]
+                self._adjacency = ChunkAdjacency(
+                    chunks,
+                    similar_edges=results[0]["similar_edges"],
+                    uids=[chunk_uid(title, (ch.metadata or {}).get("chunk_id")) for ch in chunks],
                 )
+            elif skipped < len(documents):
+                self._adjacency = None  # reloaded from Neo4j on next use
+
+        stats = {
+            "documents": len(documents),
+            "skipped": skipped,
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+        }
+        logger.info(
+            f"Neo4j ingest: {len(documents)} documents ({skipped} unchanged), {rows} rows in {seconds:.2f}s "
+            f"({stats['rows_per_sec']:.0f} rows/s, {workers} writers)"
+        )
+        return stats
+
+    def _write_batches(self, session, query: str, rows: list[dict], batch_size: int) -> None:
+        """Run `UNWIND $rows` query over rows in batches, one write transaction per batch."""
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            session.execute_write(lambda tx: tx.run(query, rows=batch).consume())
+
+    def _write_document(self, title: str, chunks: list[Document], *, replace: bool) -> dict:
+        """Write one document's sections, chunks, NEXT chain and SIMILAR_TO edges.
+
+        The Document node records a fingerprint of the chunks (and the SIMILAR_TO setting);
+        a replace whose fingerprint matches the stored one writes nothing.
+        """
+        from ..config import Config  # local import to avoid cycles at import time
+        from ..retrieval.fingerprint import documents_fingerprint  # local import to avoid cycles
+        logger = logging.getLogger("graph")
+        batch_size = max(1, int(getattr(Config, "NEO4J_BATCH_SIZE", 1000)))
+        enable_similar = bool(getattr(Config, "ENABLE_SIMILAR_TO", False))
+        fingerprint = f"{documents_fingerprint(chunks)}:similar={enable_similar}"
+
+        # Prepare rows for Sections and Chunks
+        section_paths: dict[str, None] = {}
+        chunk_rows = []
+        for ch in chunks:
+            md = ch.metadata or {}
+            section_path = md.get("section_path", "") or ""
+            section_paths.setdefault(section_path)
+            chunk_rows.append(
+                {
+                    "title": title,
+                    "section_path": section_path,
+                    "uid": chunk_uid(title, md.get("chunk_id")),
+                    "chunk_id": md.get("chunk_id"),
+                    "text": ch.page_content,
+                    "page_number": md.get("page_number"),
+                    "element_type": md.get("element_type"),
+                    "content_type": md.get("content_type"),
+                }
+            )
+        section_rows = [{"title": title, "section_path": path} for path in section_paths]
+        # chunk_document emits chunks in reading order, so NEXT pairs are consecutive rows
+        next_rows = [
+            {"src": a["uid"], "dst": b["uid"]} for a, b in zip(chunk_rows, chunk_rows[1:])
+        ]
+
+        with self.driver.session() as session:
+            if replace:
+                stored = session.execute_read(lambda tx: [
+                    record["fingerprint"]
+                    for record in tx.run("MATCH (d:Document {title: $title}) RETURN d.fingerprint AS fingerprint", title=title)
+                ])
+                if stored and stored[0] == fingerprint:
+                    logger.info(f"Document graph for '{title}' is unchanged; skipping write")
+                    return {"rows": 0, "similar_edges": [], "skipped": True}
+                # Scoped delete: only this document's sections and chunks
+                session.execute_write(lambda tx: tx.run(
+                    """
+                    MATCH (d:Document {title: $title})
+                    OPTIONAL MATCH (d)-[:CONTAINS]->(s:Section)
+                    OPTIONAL MATCH (s)-[:HAS_CHUNK]->(c:Chunk)
+                    DETACH DELETE c, s, d
+                    """,
+                    title=title,
+                ).consume())
+
+            # Ensure document node; the fingerprint is recorded after everything is written
+            session.execute_write(lambda tx: tx.run("MERGE (d:Document {title: $title})", title=title).consume())
 
             # Create sections (distinct by section_path)
-            session.run(
+            self._write_batches(
+                session,
                 """
                 UNWIND $rows AS row
-                MERGE (d:Document {title: row.title})
+                MATCH (d:Document {title: row.title})
                 MERGE (s:Section {title: row.title, path: row.section_path})
                 MERGE (d)-[:CONTAINS]->(s)
                 """,
-                rows=section_rows,
+                section_rows,
+                batch_size,
             )
 
             # Create chunks with properties, attach to sections
-            session.run(
+            self._write_batches(
+                session,
                 """
                 UNWIND $rows AS row
-                MERGE (s:Section {title: row.title, path: row.section_path})
+                MATCH (s:Section {title: row.title, path: row.section_path})
                 CREATE (c:Chunk {
+                  uid: row.uid,
+                  doc_title: row.title,
                   chunk_id: row.chunk_id,
                   text: row.text,
                   page_number: row.page_number,
@@ -93,73 +244,60 @@ class Neo4jGraph:
                   element_type: row.element_type,
                   content_type: row.content_type
                 })
-                MERGE (s)-[:HAS_CHUNK]->(c)
+                CREATE (s)-[:HAS_CHUNK]->(c)
                 """,
-                rows=chunk_rows,
+                chunk_rows,
+                batch_size,
             )
 
-            # Create NEXT relationships between neighboring chunks (by numeric order)
-            session.run(
+            # Create NEXT relationships between neighboring chunks
+            self._write_batches(
+                session,
                 """
-                MATCH (d:Document {title: $title})-[:CONTAINS]->(:Section)-[:HAS_CHUNK]->(c:Chunk)
-                WITH d, c ORDER BY toInteger(replace(c.chunk_id, 'chunk_', ''))
-                WITH collect(c) AS chunks
-                UNWIND range(0, size(chunks)-2) AS i
-                WITH chunks[i] AS c1, chunks[i+1] AS c2
+                UNWIND $rows AS row
+                MATCH (c1:Chunk {uid: row.src})
+                MATCH (c2:Chunk {uid: row.dst})
                 MERGE (c1)-[:NEXT]->(c2)
                 """,
-                title=title,
-            )
-            logger.info(
-                f"Inserted document graph for '{title}': {len(set([r['section_path'] for r in section_rows]))} sections, {len(chunk_rows)} chunks"
+                next_rows,
+                batch_size,
             )
+            logger.info(f"Inserted document graph for '{title}': {len(section_rows)} sections, {len(chunk_rows)} chunks")
 
             # Optional: create SIMILAR_TO edges using embeddings
-            from ..config import Config  # local import to avoid cycles at import time
-            if getattr(Config, "ENABLE_SIMILAR_TO", False) and chunk_rows:
-                logger.info("Building SIMILAR_TO edges using embeddings")
-                # Compute embeddings for chunks' text
-                texts = [row["text"] or "" for row in chunk_rows]
-                ids = [row["chunk_id"] for row in chunk_rows]
-                hf = HuggingFaceEmbeddings()
-                vectors = hf.embed_documents(texts)
-                vectors = np.array(vectors, dtype=float)
-                # Normalize
-                norms = np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-10
-                nv = vectors / norms
-                # Cosine similarity matrix
-                sims = nv @ nv.T
-                top_n = int(getattr(Config, "SIMILAR_TOP_N", 5))
-                threshold = float(getattr(Config, "SIMILARITY_THRESHOLD", 0.7))
-
-                rel_rows = []
-                for i, src in enumerate(ids):
-                    # Exclude self
-                    sims[i, i] = -1.0
-                    # Top-N indices above threshold
-                    nn_idx = np.argsort(-sims[i])[: top_n * 2]  # take a few extra then filter
-                    added = 0
-                    for j in nn_idx:
-                        if sims[i, j] < threshold:
-                            continue
-                        rel_rows.append({
-                            "src": src,
-                            "dst": ids[j],
-                            "score": float(sims[i, j]),
-                        })
-                        added += 1
-                        if added >= top_n:
-                            break
-
+            rel_rows = []
+            if enable_similar and chunk_rows:
+                rel_rows = self._similar_rows(chunk_rows)
                 if rel_rows:
-                    session.run(
+                    self._write_batches(
+                        session,
                         """
                         UNWIND $rows AS row
-                        MATCH (c1:Chunk {chunk_id: row.src})
-                        MATCH (c2:Chunk {chunk_id: row.dst})
+                        MATCH (c1:Chunk {uid: row.src})
+                        MATCH (c2:Chunk {uid: row.dst})
                         MERGE (c1)-[r:SIMILAR_TO]->(c2)
                         SET r.score = row.score
                         """,
-                        rows=rel_rows,
+                        rel_rows,
+                        batch_size,
                     )
-                    logger.info(f"Created {len(rel_rows)} SIMILAR_TO relations")
\ No newline at end of file
+                    logger.info(f"Created {len(rel_rows)} SIMILAR_TO relations")
+
+            session.execute_write(lambda tx: tx.run(
+                "MATCH (d:Document {title: $title}) SET d.fingerprint = $fingerprint",
+                title=title,
+                fingerprint=fingerprint,
+            ).consume())
+
+        return {
+            "rows": len(section_rows) + len(chunk_rows) + len(next_rows) + len(rel_rows),
+            "similar_edges": [(row["src"], row["dst"], row["score"]) for row in rel_rows],
+            "skipped": False,
+        }
+
+    @staticmethod
+    def _similar_rows(chunk_rows: list[dict]) -> list[dict]:
+        """SIMILAR_TO rows (src uid, dst uid, score) between embedding-similar chunks."""
+        from .similarity import similar_chunk_edges
+        edges = similar_chunk_edges([row["uid"] for row in chunk_rows], [row["text"] for row in chunk_rows])
+        return [{"src": src, "dst": dst, "score": score} for src, dst, score in edges]
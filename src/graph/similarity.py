@@ -0,0 +1,113 @@
+import logging
+import numpy as np
+from ..config import Config
+
+try:
+    import hnswlib
+except ImportError:  # optional: approximate neighbors for large multi-filing graphs
+    hnswlib = None
+
+
+def _normalized(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-10
+    return vectors / norms
+
+
+def exact_similar_pairs(
+    vectors,
+    *,
+    top_n: int,
+    threshold: float,
+    block_size: int = 1024,
+) -> list[tuple[int, int, float]]:
+    """(src, dst, cosine) for each row's top_n most similar other rows at or above threshold.
+
+    Rows are processed in blocks of `block_size`: each block's similarities against all
+    rows form one float32 (block x N) matrix, and `argpartition` picks the top_n
+    candidates before only those are sorted. Memory stays O(block_size x N).
+    """
+    nv = _normalized(vectors)
+    n = nv.shape[0]
+    k = min(top_n, n - 1)
+    pairs: list[tuple[int, int, float]] = []
+    if k <= 0:
+        return pairs
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        sims = nv[start:stop] @ nv.T
+        rows = np.arange(stop - start)
+        sims[rows, rows + start] = -np.inf  # exclude self
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind="stable")
+        top, top_sims = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_sims, order, axis=1)
+        for r, c in zip(*np.nonzero(top_sims >= threshold)):
+            pairs.append((start + int(r), int(top[r, c]), float(top_sims[r, c])))
+    return pairs
+
+
+def approximate_similar_pairs(
+    vectors,
+    *,
+    top_n: int,
+    threshold: float,
+    ef: int = 200,
+    m: int = 16,
+) -> list[tuple[int, int, float]]:
+    """Like exact_similar_pairs, from an hnswlib HNSW index (cosine space); requires hnswlib."""
+    if hnswlib is None:
+        raise ImportError("hnswlib is required for approximate SIMILAR_TO construction")
+    nv = _normalized(vectors)
+    n, dim = nv.shape
+    k = min(top_n + 1, n)  # +1: a row is usually its own nearest neighbor
+    index = hnswlib.Index(space="cosine", dim=dim)
+    index.init_index(max_elements=n, ef_construction=ef, M=m)
+    index.add_items(nv, np.arange(n))
+    index.set_ef(max(ef, k))
+    labels, distances = index.knn_query(nv, k=k)
+    pairs: list[tuple[int, int, float]] = []
+    for src in range(n):
+        added = 0
+        for dst, distance in zip(labels[src], distances[src]):
+            similarity = 1.0 - float(distance)
+            if dst == src or similarity < threshold:
+                continue
+            pairs.append((src, int(dst), similarity))
+            added += 1
+            if added >= top_n:
+                break
+    return pairs
+
+
+def similar_pairs(vectors, *, top_n: int | None = None, threshold: float | None = None) -> list[tuple[int, int, float]]:
+    """SIMILAR_TO candidate pairs with the Config knobs.
+
+    Uses the HNSW index when Config.SIMILAR_TO_ANN is on, hnswlib is installed and there
+    are at least Config.SIMILAR_TO_ANN_MIN_CHUNKS rows; otherwise the exact blockwise scan
+    with Config.SIMILAR_TO_BLOCK_SIZE rows per block.
+    """
+    logger = logging.getLogger("graph.similarity")
+    top_n = int(top_n if top_n is not None else getattr(Config, "SIMILAR_TOP_N", 5))
+    threshold = float(threshold if threshold is not None else getattr(Config, "SIMILARITY_THRESHOLD", 0.7))
+    n = len(vectors)
+    if getattr(Config, "SIMILAR_TO_ANN", False) and n >= int(getattr(Config, "SIMILAR_TO_ANN_MIN_CHUNKS", 5000)):
+        if hnswlib is not None:
+            logger.info(f"Building SIMILAR_TO pairs for {n} chunks with an HNSW index")
+            return approximate_similar_pairs(vectors, top_n=top_n, threshold=threshold)
+        logger.warning("SIMILAR_TO_ANN is enabled but hnswlib is not installed; using the exact scan")
+    block_size = max(1, int(getattr(Config, "SIMILAR_TO_BLOCK_SIZE", 1024)))
+    return exact_similar_pairs(vectors, top_n=top_n, threshold=threshold, block_size=block_size)
+
+
+def similar_chunk_edges(uids: list[str], texts: list[str]) -> list[tuple[str, str, float]]:
+    """SIMILAR_TO edges (src uid, dst uid, score) between embedding-similar chunks.
+
+    Vectors come from the cached dense embeddings (get_cached_embeddings), so chunks
+    already indexed by the dense retriever are not re-encoded; pairs are selected by
+    similar_pairs (blockwise exact top-N, or HNSW when configured).
+    """
+    from ..retrieval.dense_retriever import get_cached_embeddings  # local import to avoid cycles
+    logging.getLogger("graph").info("Building SIMILAR_TO edges using embeddings")
+    vectors = np.asarray(get_cached_embeddings().embed_documents([text or "" for text in texts]), dtype=np.float32)
+    return [(uids[src], uids[dst], score) for src, dst, score in similar_pairs(vectors)]
@@ -2,7 +2,11 @@ from langchain_core.documents import Document
 from sec_parser.semantic_elements.abstract_semantic_element import AbstractSemanticElement
 from sec_parser.semantic_elements.top_section_title import TopSectionTitle
 import logging
+import re
+import weakref
 from collections import Counter
+from lxml import etree
+from lxml import html as lxml_html
 from ..config import Config
 
 def chunk_document(elements: list[AbstractSemanticElement], *, document_title: str = None) -> list[Document]:
@@ -191,55 +195,85 @@ def _build_section_aware_chunks(elements: list[AbstractSemanticElement], logger:
     )
     return documents
 
-def extract_element_text(element: AbstractSemanticElement) -> str:
-    """Extract actual text content from SEC parser elements using enhanced HTML parsing."""
+# Tags whose boundaries separate words when flattening HTML to text
+_BLOCK_TAGS = frozenset({
+    "p", "div", "li", "td", "th", "tr", "table", "br",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+})
+_WHITESPACE_RE = re.compile(r"\s+")
 
-    # Method 1: Try existing text attributes first
-    for attr in ['text', 'content', 'inner_text']:
-        if hasattr(element, attr):
-            value = getattr(element, attr)
-            if value and len(str(value).strip()) > 5:
-                return str(value).strip()
-
-    # Method 2: Enhanced HTML parsing with BeautifulSoup
-    html_content = None
-
-    # Try to get HTML content from various attributes
-    for attr in ['html_tag', 'html', '_html', 'raw_html', 'source_html']:
-        if hasattr(element, attr):
-            html_content = getattr(element, attr)
-            if html_content:
-                break
+# Memoized extraction results keyed by element identity (sec-parser elements do
+# not override __eq__/__hash__); entries disappear with the elements themselves.
+_TEXT_CACHE: "weakref.WeakKeyDictionary[AbstractSemanticElement, str]" = weakref.WeakKeyDictionary()
 
-    if html_content:
+
+def clear_text_cache() -> None:
+    """Drop all memoized element texts (mainly for benchmarks and tests)."""
+    _TEXT_CACHE.clear()
+
+
+def _html_source(element: AbstractSemanticElement) -> str | None:
+    """Return the raw HTML backing an element, if any."""
+    for attr in ('html_tag', 'html', '_html', 'raw_html', 'source_html'):
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(str(html_content), 'html.parser')
+            value = getattr(element, attr, None)
+        except Exception:
+            continue
+        if not value:
+            continue
+        get_source_code = getattr(value, "get_source_code", None)
+        if callable(get_source_code):
+            return get_source_code()
+        return str(value)
+    return None
 
-            # Enhanced text extraction for CSS-positioned content
-            text_parts = []
 
-            # Get text from common textual and tabular/list elements
-            for tag in soup.find_all(['p', 'span', 'b', 'strong', 'em', 'div', 'li', 'td', 'th']):
-                tag_text = tag.get_text(strip=True)
-                if tag_text and len(tag_text) > 1:
-                    text_parts.append(tag_text)
+def _html_to_text(html: str) -> str:
+    """Flatten HTML to whitespace-normalized text in a single lxml pass.
 
-            # Join with spaces and clean up
-            full_text = ' '.join(text_parts)
+    Every text node is emitted exactly once; block-level tags contribute a word
+    boundary so table cells and paragraphs don't run together.
+    """
+    root = lxml_html.fragment_fromstring(html, create_parent="div")
+    parts: list[str] = []
+    for event, node in etree.iterwalk(root, events=("start", "end")):
+        if not isinstance(node.tag, str):  # comments / processing instructions
+            if event == "end" and node.tail:
+                parts.append(node.tail)
+            continue
+        is_block = node.tag in _BLOCK_TAGS
+        if event == "start":
+            if is_block:
+                parts.append(" ")
+            if node.text:
+                parts.append(node.text)
+        else:
+            if is_block:
+                parts.append(" ")
+            if node.tail and node is not root:
+                parts.append(node.tail)
+    return _WHITESPACE_RE.sub(" ", "".join(parts)).strip()
 
-            # Clean up multiple spaces and normalize
-            import re
-            full_text = re.sub(r'\s+', ' ', full_text).strip()
 
+def _extract_element_text_uncached(element: AbstractSemanticElement) -> str:
+    # Method 1: Try existing text attributes first
+    for attr in ('text', 'content', 'inner_text'):
+        try:
+            value = getattr(element, attr, None)
+        except Exception:
+            continue
+        if value and len(str(value).strip()) > 5:
+            return str(value).strip()
+
+    # Method 2: Flatten the backing HTML with lxml
+    html_content = _html_source(element)
+    if html_content:
+        try:
+            full_text = _html_to_text(html_content)
             if len(full_text) > 5:
                 return full_text
-
         except Exception as e:
-            # Log parsing error but continue
-            import logging
-            logger = logging.getLogger("processing.chunker")
-            logger.debug(f"HTML parsing failed for element: {e}")
+            logging.getLogger("processing.chunker").debug(f"HTML parsing failed for element: {e}")
 
     # Method 3: Try get_text() method
     if hasattr(element, 'get_text'):
@@ -252,25 +286,28 @@ def extract_element_text(element: AbstractSemanticElement) -> str:
 
     # Method 4: Fallback to string representation
     fallback_text = str(element).strip()
+    return fallback_text if fallback_text else f"{element.__class__.__name__}<{getattr(element, 'tag_name', 'unknown')}>"
 
-    # If still minimal, try to find any meaningful text attributes
-    if len(fallback_text) < 20:
-        for attr in dir(element):
-            if not attr.startswith('_') and not callable(getattr(element, attr)):
-                try:
-                    value = getattr(element, attr)
-                    if isinstance(value, str) and len(value.strip()) > 10:
-                        return value.strip()
-                except Exception:
-                    continue
 
-    return fallback_text if fallback_text else f"{element.__class__.__name__}<{getattr(element, 'tag_name', 'unknown')}>"
+def extract_element_text(element: AbstractSemanticElement) -> str:
+    """Extract actual text content from SEC parser elements.
+
+    Results are memoized per element, so chunking, the section tools and table
+    fallbacks share a single extraction of each element.
+    """
+    try:
+        return _TEXT_CACHE[element]
+    except KeyError:
+        pass
+    except TypeError:  # not weak-referenceable; extract without memoizing
+        return _extract_element_text_uncached(element)
+    text = _extract_element_text_uncached(element)
+    _TEXT_CACHE[element] = text
+    return text
 
 
 def extract_tabular_patterns(text: str) -> bool:
     """Detect if text contains tabular financial data patterns."""
-    import re
-
     # Financial table patterns
     patterns = [
         r'\$[\d,]+\s+\$[\d,]+',  # Multiple dollar amounts in sequence
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from ..config import Config
+
+# Bump when the on-disk layout or any stage's output format changes
+CACHE_VERSION = 1
+
+
+def hash_file(path: str | os.PathLike, *, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunking_fingerprint(*, document_title: str | None = None) -> str:
+    """Fingerprint of the Config knobs (and title) that determine chunk_document output."""
+    knobs = {
+        "version": CACHE_VERSION,
+        "chunk_size": int(Config.CHUNK_SIZE),
+        "chunk_overlap": int(Config.CHUNK_OVERLAP),
+        "section_aware": bool(getattr(Config, "USE_SECTION_AWARE_CHUNKING", False)),
+        "chunk_id_prefix": Config.CHUNK_ID_PREFIX,
+        "document_title": document_title,
+    }
+    payload = json.dumps(knobs, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class IngestionCache:
+    """Content-addressed on-disk cache for the PDF → HTML → elements → chunks pipeline.
+
+    Entries live under ``<cache_dir>/<pdf sha256>/``:
+      - ``document.html``: output of convert_pdf_to_html
+      - ``chunks-<fingerprint>.json``: chunk_document output for one set of chunking knobs
+
+    Semantic elements are not cached: they hold bs4 trees that only (un)pickle through
+    deep recursion. On a hit the cached chunks build the retrievers and the cached HTML is
+    wrapped in LazyElements, parsed only if a tool needs the elements. HTML
+    depends only on the PDF bytes; chunks are additionally keyed by chunking_fingerprint(),
+    so changing CHUNK_SIZE/CHUNK_OVERLAP/USE_SECTION_AWARE_CHUNKING only re-runs the
+    chunking stage. Corrupt or unreadable entries are treated as misses.
+
+    Hits and saves touch the entry directory's mtime; after a save, the least recently
+    used entries beyond `max_entries` (default Config.INGESTION_CACHE_MAX_ENTRIES,
+    0 = unbounded) are deleted.
+    """
+
+    def __init__(self, cache_dir: str | os.PathLike | None = None, *, max_entries: int | None = None):
+        self.cache_dir = Config.resolve_path(cache_dir or Config.INGESTION_CACHE_DIR)
+        self.max_entries = getattr(Config, "INGESTION_CACHE_MAX_ENTRIES", 16) if max_entries is None else max_entries
+        self.logger = logging.getLogger("processing.ingestion_cache")
+
+    def _entry_dir(self, pdf_hash: str) -> Path:
+        return self.cache_dir / pdf_hash
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _evict(self, keep: Path) -> None:
+        """Delete the least recently used entries beyond max_entries; `keep` always survives."""
+        if not self.max_entries:
+            return
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if entry == keep or not entry.is_dir():
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        for _, entry in entries[max(self.max_entries - 1, 0):]:
+            shutil.rmtree(entry, ignore_errors=True)
+            self.logger.info(f"Evicted ingestion cache entry {entry.name[:12]}")
+
+    def _read(self, path: Path) -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            self._touch(path.parent)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.logger.warning(f"Failed to read cache entry {path}: {e}")
+            return None
+
+    # HTML stage
+    def load_html(self, pdf_hash: str) -> str | None:
+        data = self._read(self._entry_dir(pdf_hash) / "document.html")
+        if data is None:
+            return None
+        self.logger.info(f"Ingestion cache hit: html for {pdf_hash[:12]}")
+        return data.decode("utf-8")
+
+    def save_html(self, pdf_hash: str, html: str) -> None:
+        self._write_atomic(self._entry_dir(pdf_hash) / "document.html", html.encode("utf-8"))
+        self._evict(keep=self._entry_dir(pdf_hash))
+
+    # Chunks stage
+    def _chunks_path(self, pdf_hash: str, document_title: str | None) -> Path:
+        fingerprint = chunking_fingerprint(document_title=document_title)
+        return self._entry_dir(pdf_hash) / f"chunks-{fingerprint}.json"
+
+    def load_chunks(self, pdf_hash: str, *, document_title: str | None = None) -> list[Document] | None:
+        data = self._read(self._chunks_path(pdf_hash, document_title))
+        if data is None:
+            return None
+        try:
+            rows = json.loads(data.decode("utf-8"))
+            chunks = [Document(page_content=row["page_content"], metadata=row["metadata"]) for row in rows]
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Discarding unreadable chunks cache for {pdf_hash[:12]}: {e}")
+            return None
+        self.logger.info(f"Ingestion cache hit: {len(chunks)} chunks for {pdf_hash[:12]}")
+        return chunks
+
+    def save_chunks(self, pdf_hash: str, chunks: list[Document], *, document_title: str | None = None) -> None:
+        rows = [{"page_content": c.page_content, "metadata": c.metadata} for c in chunks]
+        data = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+        self._write_atomic(self._chunks_path(pdf_hash, document_title), data)
+        self._touch(self._entry_dir(pdf_hash))
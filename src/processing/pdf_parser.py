@@ -1,6 +1,25 @@
 from sec_parser import Edgar10QParser
 from sec_parser.semantic_elements.abstract_semantic_element import AbstractSemanticElement
+from collections.abc import Sequence
+from typing import IO
 import logging
+import threading
+
+def parse_html(html: str | bytes | IO) -> list[AbstractSemanticElement]:
+    """Parses an in-memory HTML string (or readable buffer) with sec-parser.
+
+    Lets the ingestion pipeline hand converted HTML straight to the parser
+    without writing it to disk and reading it back.
+    """
+    logger = logging.getLogger("processing.pdf_parser")
+    if hasattr(html, "read"):
+        html = html.read()
+    if isinstance(html, bytes):
+        html = html.decode("utf-8")
+    parser = Edgar10QParser()
+    elements = parser.parse(html)
+    logger.info(f"Parsed {len(elements)} semantic elements")
+    return elements
 
 def load_html(file_path: str) -> list[AbstractSemanticElement]:
     """Parses HTML with sec-parser and returns semantic elements.
@@ -12,10 +31,42 @@ def load_html(file_path: str) -> list[AbstractSemanticElement]:
     """
     logger = logging.getLogger("processing.pdf_parser")
     logger.info(f"Parsing HTML file: {file_path}")
-    parser = Edgar10QParser()
     with open(file_path, "r", encoding="utf-8") as f:
-        html = f.read()
+        return parse_html(f)
 
-    elements = parser.parse(html)
-    logger.info(f"Parsed {len(elements)} semantic elements")
-    return elements
+
+class LazyElements(Sequence):
+    """Semantic elements of an HTML document, parsed with sec-parser on first access.
+
+    Used for ingestion cache hits: the cached chunks are enough to build the retrievers,
+    so parsing is deferred until a tool that reads elements (table, MD&A, risk) or a
+    chunk cache miss needs them. Truth-testing never parses.
+    """
+
+    def __init__(self, html: str):
+        self._html: str | None = html
+        self._elements: list[AbstractSemanticElement] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def parsed(self) -> bool:
+        return self._elements is not None
+
+    def _load(self) -> list[AbstractSemanticElement]:
+        with self._lock:
+            if self._elements is None:
+                self._elements = parse_html(self._html)
+                self._html = None
+            return self._elements
+
+    def __bool__(self) -> bool:
+        return bool(self._elements) if self._elements is not None else bool(self._html)
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __iter__(self):
+        return iter(self._load())
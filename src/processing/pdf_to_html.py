@@ -1,13 +1,98 @@
 import fitz
 import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ..config import Config
 
-def convert_pdf_to_html(pdf_path: str) -> str:
-    """Converts a PDF file to HTML."""
+_pool_lock = threading.Lock()
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+
+
+def _convert_page_range(pdf_path: str, start: int, stop: int) -> list[str]:
+    """Worker: open the PDF independently and return HTML for pages [start, stop)."""
+    doc = fitz.open(pdf_path)
+    try:
+        return [doc[i].get_text("html") for i in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def get_conversion_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by every conversion, created on first use and kept.
+
+    Spawned workers re-import the main module (for the app: gradio, langchain and the
+    embedding stack) before converting a page, so they are started once per process
+    rather than once per document. The pool is only replaced to grow it.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_conversion_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _resolve_workers(workers: int | None, page_count: int) -> int:
+    if workers is None:
+        workers = getattr(Config, "PDF_CONVERSION_WORKERS", 1)
+    if not workers or workers < 0:
+        workers = os.cpu_count() or 1
+    if page_count < getattr(Config, "PDF_PARALLEL_MIN_PAGES", 0):
+        return 1
+    return max(1, min(int(workers), page_count))
+
+
+def convert_pdf_to_html(pdf_path: str, *, workers: int | None = None) -> str:
+    """Converts a PDF file to HTML.
+
+    With more than one worker the page range is split into contiguous slices that are
+    converted in the shared process pool (each worker opens its own fitz document); the
+    per-page HTML is stitched back together in page order. Workers are spawned, never
+    forked: the calling process (the Gradio server) is multithreaded, and a forked child
+    can inherit locks held by its other threads. `workers` defaults to
+    Config.PDF_CONVERSION_WORKERS (0 = all CPUs); documents shorter than
+    Config.PDF_PARALLEL_MIN_PAGES are always converted serially.
+    """
     logger = logging.getLogger("processing.pdf_to_html")
     logger.info(f"Opening PDF: {pdf_path}")
     doc = fitz.open(pdf_path)
-    html = ""
-    for page in doc:
-        html += page.get_text("html")
-    logger.info(f"Extracted HTML from {doc.page_count} pages")
-    return html
+    try:
+        page_count = doc.page_count
+        workers = _resolve_workers(workers, page_count)
+        if workers == 1:
+            pages = [page.get_text("html") for page in doc]
+    finally:
+        doc.close()
+
+    if workers > 1:
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        pool = get_conversion_pool(workers)
+        try:
+            futures = [
+                pool.submit(_convert_page_range, pdf_path, bounds[i], bounds[i + 1])
+                for i in range(workers)
+            ]
+            pages = [page_html for future in futures for page_html in future.result()]
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            logger.warning(f"PDF conversion pool failed ({e}); converting serially")
+            _discard_conversion_pool(pool)
+            workers = 1
+            pages = _convert_page_range(pdf_path, 0, page_count)
+
+    logger.info(f"Extracted HTML from {page_count} pages using {workers} worker(s)")
+    return "".join(pages)
@@ -0,0 +1,119 @@
+from langchain_core.documents import Document
+from sec_parser.semantic_elements.abstract_semantic_element import AbstractSemanticElement
+from sec_parser.semantic_elements.top_section_title import TopSectionTitle
+from typing import Iterable
+import logging
+from ..config import Config
+from .chunker import chunk_document, extract_element_text
+
+
+class SectionIndex:
+    """Per-document index of 10-Q sections, built once at ingestion.
+
+    - Maps each sec-parser section identifier (``part1item2``, ``part2item1a``, ...) to the
+      half-open element range [start, end) that get_elements_in_section would collect, so
+      section lookups are a dict hit plus a list slice.
+    - Caches the chunk lists built from each section and from keyword-filtered elements.
+    - Keeps keyword postings (keyword -> indices of elements whose lowercased text contains
+      it) for the MD&A and risk keyword fallbacks, so filtering never rescans element text.
+    """
+
+    # Elements shorter than this are never considered keyword matches
+    MIN_KEYWORD_TEXT_LENGTH = 50
+
+    def __init__(self, elements: list[AbstractSemanticElement], *, keywords: Iterable[str] | None = None):
+        self.elements = elements
+        self.logger = logging.getLogger("processing.section_index")
+        self._ranges = self._build_ranges(elements)
+        self._chunk_cache: dict[object, list[Document]] = {}
+        self._postings: dict[str, tuple[int, ...]] = {}
+        self._texts_lower: list[str | None] | None = None
+        if keywords is None:
+            keywords = list(Config.MDA_FILTER_KEYWORDS) + list(Config.RISK_FILTER_KEYWORDS)
+        self.add_keywords(keywords)
+        self.logger.info(
+            f"Indexed {len(self._ranges)} sections and {len(self._postings)} keywords over {len(elements)} elements"
+        )
+
+    @staticmethod
+    def _build_ranges(elements: list[AbstractSemanticElement]) -> dict[str, tuple[int, int]]:
+        titles = []
+        for i, el in enumerate(elements):
+            if isinstance(el, TopSectionTitle):
+                sect = getattr(el, "section_type", None)
+                titles.append((i, getattr(sect, "identifier", None), getattr(sect, "level", None)))
+
+        ranges: dict[str, tuple[int, int]] = {}
+        for pos, (i, ident, level) in enumerate(titles):
+            if ident is None or ident in ranges:
+                continue  # first occurrence wins, as in get_elements_in_section
+            end = len(elements)
+            if level is not None:
+                for j, _, next_level in titles[pos + 1:]:
+                    if next_level is not None and next_level <= level:
+                        end = j
+                        break
+            ranges[ident] = (i + 1, end)
+        return ranges
+
+    @property
+    def section_identifiers(self) -> list[str]:
+        return list(self._ranges)
+
+    def section_range(self, section_identifier: str) -> tuple[int, int] | None:
+        return self._ranges.get(section_identifier)
+
+    def elements_in(self, section_identifier: str) -> list[AbstractSemanticElement]:
+        """Elements of a top-level section; same result as get_elements_in_section."""
+        bounds = self._ranges.get(section_identifier)
+        if bounds is None:
+            self.logger.warning(f"Section identifier not found: {section_identifier}")
+            return []
+        return self.elements[bounds[0]:bounds[1]]
+
+    def chunks_in(self, section_identifier: str) -> list[Document]:
+        """Chunks of a section, built on first request and reused afterwards."""
+        key = ("section", section_identifier)
+        if key not in self._chunk_cache:
+            self._chunk_cache[key] = chunk_document(self.elements_in(section_identifier))
+        return self._chunk_cache[key]
+
+    def all_chunks(self) -> list[Document]:
+        """Chunks of the whole document (no title), cached like section chunks."""
+        key = ("all",)
+        if key not in self._chunk_cache:
+            self._chunk_cache[key] = chunk_document(self.elements)
+        return self._chunk_cache[key]
+
+    def add_keywords(self, keywords: Iterable[str]) -> None:
+        """Build postings for keywords not indexed yet."""
+        missing = [kw.lower() for kw in keywords if kw.lower() not in self._postings]
+        if not missing:
+            return
+        if self._texts_lower is None:
+            self._texts_lower = []
+            for el in self.elements:
+                text = extract_element_text(el).lower()
+                self._texts_lower.append(text if len(text.strip()) > self.MIN_KEYWORD_TEXT_LENGTH else None)
+        for kw in missing:
+            self._postings[kw] = tuple(i for i, text in enumerate(self._texts_lower) if text is not None and kw in text)
+
+    def element_indices_matching(self, keywords: Iterable[str]) -> list[int]:
+        """Sorted indices of elements containing any of the keywords."""
+        keywords = [kw.lower() for kw in keywords]
+        self.add_keywords(keywords)
+        matched: set[int] = set()
+        for kw in keywords:
+            matched.update(self._postings[kw])
+        return sorted(matched)
+
+    def elements_matching(self, keywords: Iterable[str]) -> list[AbstractSemanticElement]:
+        return [self.elements[i] for i in self.element_indices_matching(keywords)]
+
+    def chunks_matching(self, keywords: Iterable[str]) -> list[Document]:
+        """Chunks of the keyword-filtered elements, cached per keyword set."""
+        keywords = frozenset(kw.lower() for kw in keywords)
+        key = ("keywords", keywords)
+        if key not in self._chunk_cache:
+            self._chunk_cache[key] = chunk_document(self.elements_matching(keywords))
+        return self._chunk_cache[key]
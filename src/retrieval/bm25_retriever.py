@@ -0,0 +1,219 @@
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from typing import List, Iterable
+from collections import Counter
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+import numpy as np
+import re
+from pydantic import PrivateAttr, Field
+import logging
+from ..config import Config
+from .tfidf_retriever import top_k_positions
+
+# Same token definition as the TF-IDF vectorizer (underscores allowed for financial terms)
+_TOKEN_RE = re.compile(r'\b[A-Za-z][A-Za-z0-9_]+\b')
+
+
+def tokenize_terms(text: str) -> list[str]:
+    """Lowercased unigrams (English stop words removed) followed by their adjacent bigrams."""
+    unigrams = [t for t in _TOKEN_RE.findall(text.lower()) if t not in ENGLISH_STOP_WORDS]
+    return unigrams + [f"{a} {b}" for a, b in zip(unigrams, unigrams[1:])]
+
+
+def financial_term_boosts() -> dict[str, float]:
+    """Config.FINANCIAL_10Q_TERMS -> Config.FINANCIAL_BOOST, also keyed by the bigram
+    spelling ("term_debt" -> "term debt") that tokenize_terms produces from prose."""
+    boosts = {}
+    for term in Config.FINANCIAL_10Q_TERMS:
+        boosts[term] = Config.FINANCIAL_BOOST
+        parts = term.split('_')
+        if len(parts) == 2:
+            boosts[' '.join(parts)] = Config.FINANCIAL_BOOST
+    return boosts
+
+
+class BM25Index:
+    """Array-backed BM25 inverted index with block-max pruning.
+
+    Postings are stored per term, sorted by doc id, as parallel arrays of doc ids and
+    precomputed impacts (the full BM25 term score, including the financial-term boost).
+    Doc ids are grouped into fixed ranges of `block_size` documents; every (term, range)
+    pair with postings forms a block that records its maximum impact.
+
+    A query sums the block maxima of its terms per range to get an upper bound for every
+    doc in that range, then scores ranges in decreasing bound order and stops as soon as
+    the next bound cannot beat the current k-th score (the block-max WAND threshold test,
+    applied range-at-a-time so each step is vectorized). Results are exact.
+    """
+
+    def __init__(
+        self,
+        texts: Iterable[str],
+        *,
+        k1: float | None = None,
+        b: float | None = None,
+        block_size: int | None = None,
+        term_boosts: dict[str, float] | None = None,
+    ):
+        self.k1 = float(k1 if k1 is not None else getattr(Config, "BM25_K1", 1.2))
+        self.b = float(b if b is not None else getattr(Config, "BM25_B", 0.75))
+        self.block_size = int(block_size or getattr(Config, "BM25_BLOCK_SIZE", 128))
+        term_boosts = financial_term_boosts() if term_boosts is None else term_boosts
+
+        self.vocabulary: dict[str, int] = {}
+        term_ids: list[int] = []
+        doc_ids: list[int] = []
+        tfs: list[int] = []
+        doc_lengths: list[int] = []
+        for doc_id, text in enumerate(texts):
+            counts = Counter(tokenize_terms(text))
+            doc_lengths.append(sum(c for t, c in counts.items() if ' ' not in t))
+            for term, tf in counts.items():
+                term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                doc_ids.append(doc_id)
+                tfs.append(tf)
+
+        self.num_docs = len(doc_lengths)
+        num_terms = len(self.vocabulary)
+        term_arr = np.asarray(term_ids, dtype=np.int32)
+        doc_arr = np.asarray(doc_ids, dtype=np.int32)
+        tf_arr = np.asarray(tfs, dtype=np.float32)
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+
+        # Postings sorted by (term, doc); term_offsets[t]:term_offsets[t+1] is term t's list
+        order = np.lexsort((doc_arr, term_arr))
+        term_arr, self.doc_ids, tf_arr = term_arr[order], doc_arr[order], tf_arr[order]
+        df = np.bincount(term_arr, minlength=num_terms)
+        self.term_offsets = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+
+        # Precomputed impacts: idf * saturated tf * boost
+        idf = np.log1p((self.num_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+        boost = np.ones(num_terms, dtype=np.float32)
+        for term, weight in term_boosts.items():
+            idx = self.vocabulary.get(term)
+            if idx is not None:
+                boost[idx] = weight
+        avg_length = float(lengths.mean()) if self.num_docs else 0.0
+        norm = self.k1 * (1.0 - self.b + self.b * lengths[self.doc_ids] / max(avg_length, 1e-9))
+        self.impacts = (idf * boost)[term_arr] * tf_arr * (self.k1 + 1.0) / (tf_arr + norm)
+
+        # Blocks: maximal runs of a term's postings inside one doc-id range
+        ranges = self.doc_ids // self.block_size
+        is_start = np.ones(len(ranges), dtype=bool)
+        is_start[1:] = (term_arr[1:] != term_arr[:-1]) | (ranges[1:] != ranges[:-1])
+        starts = np.flatnonzero(is_start)
+        self.block_range = ranges[starts].astype(np.int32)
+        self.block_start = starts.astype(np.int64)
+        self.block_end = np.append(starts[1:], len(ranges)).astype(np.int64)
+        self.block_max = (
+            np.maximum.reduceat(self.impacts, starts) if starts.size else np.zeros(0, dtype=np.float32)
+        )
+        blocks_per_term = np.bincount(term_arr[starts], minlength=num_terms)
+        self.block_offsets = np.concatenate([[0], np.cumsum(blocks_per_term)]).astype(np.int64)
+        self.num_ranges = -(-self.num_docs // self.block_size)
+
+    def _query_terms(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        counts = Counter(t for t in tokenize_terms(query) if t in self.vocabulary)
+        terms = np.fromiter((self.vocabulary[t] for t in counts), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return terms, weights
+
+    @staticmethod
+    def _gather(offsets: np.ndarray, terms: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Concatenated index ranges offsets[t]:offsets[t+1] for each term, plus the owning term position."""
+        starts, ends = offsets[terms], offsets[terms + 1]
+        lengths = ends - starts
+        owner = np.repeat(np.arange(terms.size), lengths)
+        idx = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        return idx, owner
+
+    def score_all(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        """Exhaustive BM25: (doc_ids, scores) for every doc matching any query term."""
+        terms, weights = self._query_terms(query)
+        idx, owner = self._gather(self.term_offsets, terms)
+        docs = self.doc_ids[idx]
+        matched, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=self.impacts[idx] * weights[owner], minlength=matched.size)
+        return matched, scores
+
+    def search(self, query: str, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k (doc_ids, scores), best first, with block-max pruning."""
+        logger = logging.getLogger("retrieval.bm25")
+        terms, weights = self._query_terms(query)
+        if terms.size == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+
+        blocks, owner = self._gather(self.block_offsets, terms)
+        block_weights = weights[owner]
+        upper = np.bincount(self.block_range[blocks], weights=self.block_max[blocks] * block_weights, minlength=self.num_ranges)
+        range_order = np.flatnonzero(upper > 0)
+        range_order = range_order[np.argsort(-upper[range_order], kind="stable")]
+
+        # Blocks grouped by range, in the order ranges will be visited
+        rank = np.empty(self.num_ranges, dtype=np.int64)
+        rank[range_order] = np.arange(range_order.size)
+        by_rank = np.argsort(rank[self.block_range[blocks]], kind="stable")
+        blocks, block_weights = blocks[by_rank], block_weights[by_rank]
+        block_rank = rank[self.block_range[blocks]]
+
+        top_docs = np.zeros(0, dtype=np.int32)
+        top_scores = np.zeros(0)
+        visited = 0
+        step = 1
+        scored_postings = 0
+        while visited < range_order.size:
+            threshold = top_scores[-1] if top_scores.size >= k else 0.0
+            if top_scores.size >= k and upper[range_order[visited]] < threshold:
+                break
+            # Visit a batch of ranges (doubling, so easy queries stop after few steps)
+            stop = min(range_order.size, visited + step)
+            lo, hi = np.searchsorted(block_rank, [visited, stop])
+            sel = blocks[lo:hi]
+            lengths = self.block_end[sel] - self.block_start[sel]
+            idx = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(self.block_start[sel], lengths)
+            docs = self.doc_ids[idx]
+            matched, inverse = np.unique(docs, return_inverse=True)
+            scores = np.bincount(inverse, weights=self.impacts[idx] * np.repeat(block_weights[lo:hi], lengths), minlength=matched.size)
+            scored_postings += idx.size
+
+            cand_docs = np.concatenate([top_docs, matched])
+            cand_scores = np.concatenate([top_scores, scores])
+            keep = top_k_positions(cand_scores, k, tiebreak=-cand_docs.astype(np.int64))
+            top_docs, top_scores = cand_docs[keep], cand_scores[keep]
+            visited = stop
+            step *= 2
+
+        total = int((self.term_offsets[terms + 1] - self.term_offsets[terms]).sum())
+        logger.debug(f"BM25 scored {scored_postings}/{total} postings in {visited}/{range_order.size} ranges")
+        return top_docs, top_scores
+
+
+class BM25Retriever(BaseRetriever):
+    """BM25 retriever for 10-Q chunks over a BM25Index, with financial-term boosts."""
+
+    # Pydantic fields
+    documents: List[Document] = Field(default_factory=list)
+
+    # Private runtime attributes
+    _index: BM25Index = PrivateAttr()
+
+    def __init__(self, documents: List[Document]):
+        super().__init__(documents=documents)
+        logger = logging.getLogger("retrieval.bm25")
+        self._index = BM25Index(doc.page_content for doc in self.documents)
+        logger.info(
+            f"BM25 index built on {len(self.documents)} docs with {len(self._index.vocabulary)} terms, "
+            f"{self._index.doc_ids.size} postings"
+        )
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Get documents relevant to a query."""
+        return [doc for doc, _ in self.get_scored_documents(query)]
+
+    def get_scored_documents(self, query: str, k: int | None = None) -> List[tuple[Document, float]]:
+        """Top-k (Document, BM25 score) pairs, best first."""
+        doc_ids, scores = self._index.search(query, k if k is not None else Config.DEFAULT_TOP_K)
+        return [(self.documents[i], float(score)) for i, score in zip(doc_ids, scores)]
@@ -8,11 +8,18 @@ os.environ["CHROMA_DISABLE_TELEMETRY"] = "True"
 from ..config import Config
 
 from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_core.embeddings import Embeddings
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.documents import Document
 from typing import List
 import logging
+import shutil
+import threading
+import time
+from .fingerprint import documents_fingerprint
+from .embedding_service import get_embedding_service
 
 # Try to disable ChromaDB telemetry programmatically
 try:
@@ -23,11 +30,100 @@ except (ImportError, AttributeError):
     # ChromaDB version doesn't support this method, environment variables should work
     pass
 
-def get_dense_retriever(documents: List[Document]) -> BaseRetriever:
-    """Creates a dense retriever using ChromaDB and HuggingFace embeddings."""
+_embeddings_lock = threading.Lock()
+_cached_embeddings: dict[str, Embeddings] = {}
+
+
+def get_cached_embeddings(model_name: str | None = None) -> Embeddings:
+    """Return embeddings backed by a persistent on-disk cache.
+
+    Vectors are stored in a LocalFileStore under Config.EMBEDDING_CACHE_DIR, keyed by
+    the model name (namespace) and a hash of the chunk text, so text that was embedded
+    once is never re-encoded, across documents and app restarts.
+    """
+    model_name = model_name or Config.EMBEDDING_MODEL_NAME
+    with _embeddings_lock:
+        if model_name not in _cached_embeddings:
+            underlying = get_embedding_service(model_name)
+            store = LocalFileStore(str(Config.resolve_path(Config.EMBEDDING_CACHE_DIR)))
+            _cached_embeddings[model_name] = CacheBackedEmbeddings.from_bytes_store(
+                underlying, store, namespace=model_name
+            )
+        return _cached_embeddings[model_name]
+
+
+def clear_dense_indexes() -> None:
+    """Delete every persisted Chroma collection and the on-disk embedding cache."""
+    logger = logging.getLogger("retrieval.dense")
+    persist_dir = Config.resolve_path(Config.CHROMA_PERSIST_DIR)
+    if persist_dir.exists():
+        # Through the client rather than rmtree: it may be open in this process
+        client = chromadb.PersistentClient(path=str(persist_dir))
+        for collection in client.list_collections():
+            client.delete_collection(collection.name)
+        logger.info(f"Deleted dense collections under {persist_dir}")
+    cache_dir = Config.resolve_path(Config.EMBEDDING_CACHE_DIR)
+    with _embeddings_lock:
+        _cached_embeddings.clear()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    logger.info(f"Cleared embedding cache {cache_dir}")
+
+
+def _evict_collections(client, keep: str) -> None:
+    """Delete fingerprint-named collections beyond Config.CHROMA_MAX_COLLECTIONS.
+
+    Collections are ranked by their "last_used" metadata; `keep` (the one just opened)
+    always survives and collections given an explicit name are never touched.
+    """
+    limit = getattr(Config, "CHROMA_MAX_COLLECTIONS", 8)
+    if not limit:
+        return
+    candidates = [c for c in client.list_collections() if c.name.startswith("chunks-") and c.name != keep]
+    candidates.sort(key=lambda c: (c.metadata or {}).get("last_used", 0.0), reverse=True)
+    for collection in candidates[max(limit - keep.startswith("chunks-"), 0):]:
+        client.delete_collection(collection.name)
+        logging.getLogger("retrieval.dense").info(f"Evicted dense collection '{collection.name}'")
+
+
+def get_dense_retriever(documents: List[Document], *, collection_name: str | None = None) -> BaseRetriever:
+    """Creates a dense retriever using ChromaDB and the shared embedding service.
+
+    With Config.PERSIST_DENSE_INDEX the collection is stored under Config.CHROMA_PERSIST_DIR
+    (resolved against Config.BASE_DIR), named after the chunk set's fingerprint unless
+    `collection_name` is given, and tagged with that fingerprint; reopening a collection
+    whose fingerprint matches encodes nothing. Fingerprint-named collections beyond
+    Config.CHROMA_MAX_COLLECTIONS are deleted, least recently used first.
+    """
     logger = logging.getLogger("retrieval.dense")
-    embeddings = HuggingFaceEmbeddings()
-    vectorstore = Chroma.from_documents(documents=documents, embedding=embeddings)
-    retriever = vectorstore.as_retriever(search_kwargs={"k": getattr(Config, "DEFAULT_TOP_K", 5)})
-    logger.info(f"Dense retriever built with {len(documents)} docs; top_k={getattr(Config, 'DEFAULT_TOP_K', 5)}")
-    return retriever
\ No newline at end of file
+    top_k = getattr(Config, "DEFAULT_TOP_K", 5)
+    embeddings = get_cached_embeddings()
+
+    if not getattr(Config, "PERSIST_DENSE_INDEX", False):
+        vectorstore = Chroma.from_documents(documents=documents, embedding=embeddings)
+        logger.info(f"Dense retriever built with {len(documents)} docs; top_k={top_k}")
+        return vectorstore.as_retriever(search_kwargs={"k": top_k})
+
+    fingerprint = documents_fingerprint(documents)
+    # Chroma names: 3-63 chars of [a-zA-Z0-9._-]
+    name = collection_name or f"chunks-{fingerprint[:40]}"
+    client = chromadb.PersistentClient(path=str(Config.resolve_path(Config.CHROMA_PERSIST_DIR)))
+
+    collection = client.get_or_create_collection(name, metadata={"fingerprint": fingerprint})
+    existing = collection.count()
+    stored_fingerprint = (collection.metadata or {}).get("fingerprint")
+    reopened = existing == len(documents) and stored_fingerprint == fingerprint
+    if not reopened and (existing or stored_fingerprint != fingerprint):
+        logger.info(f"Dense collection '{name}' is stale; rebuilding")
+        client.delete_collection(name)
+        collection = client.create_collection(name, metadata={"fingerprint": fingerprint})
+    collection.modify(metadata={"fingerprint": fingerprint, "last_used": time.time()})
+
+    vectorstore = Chroma(client=client, collection_name=name, embedding_function=embeddings)
+    if reopened:
+        logger.info(f"Reopened dense collection '{name}' with {existing} docs; top_k={top_k}")
+    else:
+        if documents:
+            vectorstore.add_documents(documents, ids=[str(i) for i in range(len(documents))])
+        logger.info(f"Dense retriever built with {len(documents)} docs in collection '{name}'; top_k={top_k}")
+    _evict_collections(client, keep=name)
+    return vectorstore.as_retriever(search_kwargs={"k": top_k})
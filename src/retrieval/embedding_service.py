@@ -0,0 +1,76 @@
+from ..config import Config
+
+from langchain_core.embeddings import Embeddings
+from typing import List
+import logging
+import threading
+import numpy as np
+
+
+class EmbeddingService(Embeddings):
+    """Process-wide sentence-transformers model behind the LangChain Embeddings API.
+
+    The model is loaded lazily, once, on first use. Encoding runs in batches of
+    `batch_size` texts and each batch holds the service lock, so concurrent callers
+    (dense indexing, graph SIMILAR_TO, RAGAS) share one copy of the weights and a
+    short query can interleave with a long document job instead of waiting for it.
+    Text is preprocessed exactly like HuggingFaceEmbeddings, so vectors are identical.
+    """
+
+    def __init__(self, model_name: str, *, batch_size: int | None = None, num_threads: int | None = None):
+        self.model_name = model_name
+        self.batch_size = int(batch_size or getattr(Config, "EMBEDDING_BATCH_SIZE", 32))
+        self.num_threads = int(num_threads if num_threads is not None else getattr(Config, "EMBEDDING_NUM_THREADS", 0))
+        self.logger = logging.getLogger("retrieval.embedding_service")
+        self._lock = threading.Lock()
+        self._model = None
+
+    def _get_model(self):
+        # Caller holds self._lock
+        if self._model is None:
+            import sentence_transformers
+
+            if self.num_threads > 0:
+                import torch
+
+                torch.set_num_threads(self.num_threads)
+            self.logger.info(f"Loading embedding model '{self.model_name}'")
+            self._model = sentence_transformers.SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 array."""
+        texts = [t.replace("\n", " ") for t in texts]
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start : start + self.batch_size]
+            with self._lock:
+                model = self._get_model()
+                batches.append(
+                    np.asarray(
+                        model.encode(batch, batch_size=self.batch_size, show_progress_bar=False, convert_to_numpy=True),
+                        dtype=np.float32,
+                    )
+                )
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(batches)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.encode([text])[0].tolist()
+
+
+_services_lock = threading.Lock()
+_services: dict[str, EmbeddingService] = {}
+
+
+def get_embedding_service(model_name: str | None = None) -> EmbeddingService:
+    """Return the shared EmbeddingService for model_name (default Config.EMBEDDING_MODEL_NAME)."""
+    model_name = model_name or Config.EMBEDDING_MODEL_NAME
+    with _services_lock:
+        if model_name not in _services:
+            _services[model_name] = EmbeddingService(model_name)
+        return _services[model_name]
@@ -1,14 +1,37 @@
-from langchain.retrievers import EnsembleRetriever
 from langchain_core.retrievers import BaseRetriever
+from langchain_core.documents import Document
+from typing import List
 from ..config import Config
 from .graph_retriever import GraphEnhancedRetriever
+from .tfidf_retriever import Financial10QRetriever
+from .bm25_retriever import BM25Retriever
+from .fts_retriever import FTSRetriever
+from .hashed_retriever import HashedTfidfRetriever
+from .parallel_ensemble import ParallelEnsembleRetriever
 
 
-def create_ensemble_retriever(dense_retriever: BaseRetriever, sparse_retriever: BaseRetriever) -> EnsembleRetriever:
-    """Creates an EnsembleRetriever with the given dense and sparse retrievers."""
-    return EnsembleRetriever(
-        retrievers=[dense_retriever, sparse_retriever],
-        weights=[Config.DENSE_WEIGHT, Config.TFIDF_WEIGHT]
+def create_sparse_retriever(documents: List[Document]) -> BaseRetriever:
+    """Creates the lexical retriever selected by Config.SPARSE_ENGINE ("tfidf", "bm25", "fts5" or "hashed")."""
+    engine = getattr(Config, "SPARSE_ENGINE", "tfidf")
+    if engine == "tfidf":
+        return Financial10QRetriever(documents)
+    if engine == "bm25":
+        return BM25Retriever(documents)
+    if engine == "fts5":
+        return FTSRetriever.for_documents(documents)
+    if engine == "hashed":
+        return HashedTfidfRetriever(documents)
+    raise ValueError(f"Unknown SPARSE_ENGINE: {engine}")
+
+
+def create_ensemble_retriever(dense_retriever: BaseRetriever, sparse_retriever: BaseRetriever) -> ParallelEnsembleRetriever:
+    """Creates a hybrid retriever that queries the dense and sparse retrievers concurrently."""
+    return ParallelEnsembleRetriever(
+        [dense_retriever, sparse_retriever],
+        [Config.DENSE_WEIGHT, Config.TFIDF_WEIGHT],
+        timeout=getattr(Config, "RETRIEVER_TIMEOUT_SECONDS", None),
+        fusion=getattr(Config, "FUSION_METHOD", "rrf"),
+        names=["dense", "sparse"],
     )
 
 
@@ -0,0 +1,19 @@
+from langchain_core.documents import Document
+from typing import Iterable
+import hashlib
+import json
+
+
+def documents_fingerprint(documents: Iterable[Document]) -> str:
+    """Order-sensitive fingerprint of a chunk set (text and metadata).
+
+    Used to name persisted indexes, so identical chunk sets reopen the same
+    index and any change to chunking produces a new one.
+    """
+    digest = hashlib.sha256()
+    for doc in documents:
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(json.dumps(doc.metadata or {}, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x01")
+    return digest.hexdigest()
@@ -0,0 +1,252 @@
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from typing import List, Iterable
+from contextlib import contextmanager
+from pydantic import PrivateAttr, Field
+import json
+import logging
+import os
+import sqlite3
+import time
+from ..config import Config
+from .bm25_retriever import tokenize_terms, financial_term_boosts
+from .fingerprint import documents_fingerprint
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL,
+    page_content TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_doc_key ON chunks(doc_key);
+CREATE TABLE IF NOT EXISTS chunk_sets (
+    doc_key TEXT PRIMARY KEY,
+    last_used REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    page_content, content='chunks', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+
+class FTSIndex:
+    """Disk-resident sparse index over 10-Q chunks, backed by SQLite FTS5.
+
+    Chunks are grouped under a `doc_key` (one filing, or one chunk set) that can be
+    appended, replaced or deleted without touching the rest of the archive. Text and
+    metadata live in a regular table; FTS5 keeps the inverted index as an external-content
+    table over it. Queries run inside SQLite, so memory stays bounded by its page cache
+    regardless of archive size, and WAL mode lets readers continue while filings are added.
+
+    Two ways to fill it:
+      - archive: ``index.add_documents("goog-10q-2025q2", chunks)`` per filing, under a
+        stable key of the caller's choosing (re-adding a key replaces that filing), then
+        ``FTSRetriever(index)`` for archive-wide search or ``FTSRetriever(index,
+        doc_keys=[...])`` for some filings. These keys are never evicted.
+      - the app (create_sparse_retriever): FTSRetriever.for_documents indexes each chunk
+        set under its fingerprint and lists it in `chunk_sets`; the least recently used
+        sets beyond Config.FTS_MAX_CHUNK_SETS are deleted.
+
+    Scale (benchmarks/bench_fts_archive.py, 1 CPU): 300 filings x 1000 chunks and 100k
+    filings x 10 chunks (1M chunks, 570MB, built in ~10 min). Filing-scoped queries stay
+    in milliseconds (2ms selective, 53ms for a term in every chunk, at 1M chunks), but
+    archive-wide queries grow with the archive: 98ms selective and 3.8s for a term in every
+    chunk at 1M chunks. 100k full-size filings (tens of millions of chunks) have not been
+    measured; archive-wide search at that size is unverified.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self.path = str(Config.resolve_path(path or Config.FTS_INDEX_PATH))
+        self.logger = logging.getLogger("retrieval.fts")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per call keeps the index usable from any thread
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def has_document(self, doc_key: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM chunks WHERE doc_key = ? LIMIT 1", (doc_key,)).fetchone() is not None
+
+    def add_documents(self, doc_key: str, documents: Iterable[Document]) -> int:
+        """Append a filing's chunks under doc_key, replacing any chunks already stored for it."""
+        rows = [
+            (doc_key, doc.page_content, json.dumps(doc.metadata or {}, default=str))
+            for doc in documents
+        ]
+        with self._connect() as conn:
+            self._delete(conn, doc_key)
+            conn.executemany("INSERT INTO chunks(doc_key, page_content, metadata) VALUES (?, ?, ?)", rows)
+            conn.execute(
+                "INSERT INTO chunks_fts(rowid, page_content) SELECT id, page_content FROM chunks WHERE doc_key = ?",
+                (doc_key,),
+            )
+        self.logger.info(f"Indexed {len(rows)} chunks under '{doc_key[:40]}'")
+        return len(rows)
+
+    def delete_document(self, doc_key: str) -> None:
+        with self._connect() as conn:
+            self._delete(conn, doc_key)
+
+    def touch_chunk_set(self, doc_key: str, *, max_sets: int | None = None) -> list[str]:
+        """Mark doc_key as a chunk set used now and evict the least recently used ones.
+
+        Keeps at most `max_sets` (default Config.FTS_MAX_CHUNK_SETS, 0 = unbounded) chunk
+        sets, doc_key included; returns the evicted doc_keys.
+        """
+        max_sets = getattr(Config, "FTS_MAX_CHUNK_SETS", 8) if max_sets is None else max_sets
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO chunk_sets(doc_key, last_used) VALUES (?, ?) "
+                "ON CONFLICT(doc_key) DO UPDATE SET last_used = excluded.last_used",
+                (doc_key, time.time()),
+            )
+            evicted = []
+            if max_sets:
+                evicted = [key for (key,) in conn.execute(
+                    "SELECT doc_key FROM chunk_sets WHERE doc_key != ? ORDER BY last_used DESC LIMIT -1 OFFSET ?",
+                    (doc_key, max(max_sets - 1, 0)),
+                )]
+            for key in evicted:
+                self._delete(conn, key)
+        if evicted:
+            self.logger.info(f"Evicted {len(evicted)} chunk sets from the FTS archive")
+        return evicted
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, doc_key: str) -> None:
+        # External-content tables need the old text to remove postings
+        conn.execute(
+            "INSERT INTO chunks_fts(chunks_fts, rowid, page_content) "
+            "SELECT 'delete', id, page_content FROM chunks WHERE doc_key = ?",
+            (doc_key,),
+        )
+        conn.execute("DELETE FROM chunks WHERE doc_key = ?", (doc_key,))
+        conn.execute("DELETE FROM chunk_sets WHERE doc_key = ?", (doc_key,))
+
+    def optimize(self) -> None:
+        """Merge FTS5 segments (worth running after bulk appends)."""
+        with self._connect() as conn:
+            conn.execute("INSERT INTO chunks_fts(chunks_fts) VALUES('optimize')")
+
+    @staticmethod
+    def query_terms(query: str) -> list[tuple[str, float]]:
+        """FTS5 phrases for the query with their weights.
+
+        Unigrams follow the TF-IDF/BM25 tokenization; underscore terms become phrases
+        ("term_debt" -> "term debt") since unicode61 splits on underscores. Financial terms
+        get Config.FINANCIAL_BOOST, and adjacent query words that spell a financial term
+        are added as a boosted phrase.
+        """
+        boosts = financial_term_boosts()
+        terms: dict[str, float] = {}
+        for term in tokenize_terms(query):
+            is_bigram = ' ' in term
+            if is_bigram and term not in boosts:
+                continue
+            phrase = term.replace('_', ' ')
+            terms[phrase] = max(terms.get(phrase, 0.0), boosts.get(term, 1.0))
+        return list(terms.items())
+
+    def search(self, query: str, k: int, *, doc_keys: list[str] | None = None) -> list[tuple[Document, float]]:
+        """Top-k (Document, score) pairs: boosted BM25 summed over the query's phrases."""
+        terms = self.query_terms(query)
+        if not terms or k <= 0:
+            return []
+        # A filing's chunks are inserted in one transaction, so their ids are contiguous;
+        # per-filing id ranges let FTS5 skip the postings of every other filing
+        id_ranges: list[tuple[int, int] | None] = [None]
+        if doc_keys:
+            placeholders = ', '.join('?' for _ in doc_keys)
+            with self._connect() as conn:
+                id_ranges = conn.execute(
+                    f"SELECT MIN(id), MAX(id) FROM chunks WHERE doc_key IN ({placeholders}) GROUP BY doc_key",
+                    doc_keys,
+                ).fetchall()
+            if not id_ranges:
+                return []
+
+        # FTS5's bm25() of a single-phrase match is that phrase's BM25 contribution
+        # (negated), so the weighted sum over per-phrase subqueries is boosted BM25
+        selects: list[str] = []
+        params: list = []
+        for phrase, weight in terms:
+            for id_range in id_ranges:
+                select = "SELECT rowid AS id, -bm25(chunks_fts) * ? AS score FROM chunks_fts WHERE chunks_fts MATCH ?"
+                params.extend([weight, '"' + phrase.replace('"', '""') + '"'])
+                if id_range is not None:
+                    select += " AND rowid BETWEEN ? AND ?"
+                    params.extend(id_range)
+                selects.append(select)
+        subqueries = " UNION ALL ".join(selects)
+        scope = ""
+        if doc_keys:
+            scope = f"WHERE c.doc_key IN ({placeholders})"
+            params.extend(doc_keys)
+
+        # MATERIALIZED keeps SQLite from flattening bm25() into the aggregate query,
+        # where FTS5 auxiliary functions are not allowed
+        sql = (
+            f"WITH hits AS MATERIALIZED ({subqueries}) "
+            f"SELECT c.page_content, c.metadata, s.score FROM "
+            f"(SELECT id, SUM(score) AS score FROM hits GROUP BY id) AS s "
+            f"JOIN chunks AS c ON c.id = s.id {scope} ORDER BY s.score DESC, c.id LIMIT ?"
+        )
+        params.append(int(k))
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            (Document(page_content=content, metadata=json.loads(metadata)), float(score))
+            for content, metadata, score in rows
+        ]
+
+
+class FTSRetriever(BaseRetriever):
+    """BaseRetriever over an FTSIndex, optionally scoped to some doc_keys (filings)."""
+
+    # Pydantic fields
+    doc_keys: List[str] | None = Field(default=None)
+
+    # Private runtime attributes
+    _index: FTSIndex = PrivateAttr()
+
+    def __init__(self, index: FTSIndex, *, doc_keys: List[str] | None = None):
+        super().__init__(doc_keys=doc_keys)
+        self._index = index
+
+    @classmethod
+    def for_documents(cls, documents: List[Document], *, index: FTSIndex | None = None) -> "FTSRetriever":
+        """Index a chunk set (once, keyed by its fingerprint) and return a retriever scoped to it.
+
+        Chunk sets no longer used (e.g. a re-chunked or replaced filing) are evicted once
+        more than Config.FTS_MAX_CHUNK_SETS have been indexed.
+        """
+        index = index or FTSIndex()
+        doc_key = documents_fingerprint(documents)
+        if not index.has_document(doc_key):
+            index.add_documents(doc_key, documents)
+        index.touch_chunk_set(doc_key)
+        return cls(index, doc_keys=[doc_key])
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Get documents relevant to a query."""
+        return [doc for doc, _ in self.get_scored_documents(query)]
+
+    def get_scored_documents(self, query: str, k: int | None = None) -> List[tuple[Document, float]]:
+        """Top-k (Document, boosted BM25 score) pairs, best first."""
+        return self._index.search(query, k if k is not None else Config.DEFAULT_TOP_K, doc_keys=self.doc_keys)
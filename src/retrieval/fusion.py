@@ -0,0 +1,143 @@
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStoreRetriever
+from langchain_core.documents import Document
+from typing import List, Sequence, Hashable, Any
+import asyncio
+import numpy as np
+
+FUSION_METHODS = ("rrf", "minmax", "zscore")
+
+# (Document, raw score) pairs from one retriever, best first; score is None when the
+# retriever only exposes a ranking
+ScoredDocuments = List[tuple[Document, float | None]]
+
+
+def chunk_key(doc: Document) -> Hashable:
+    """Identity of a chunk across retrievers: (document_title, chunk_id) for chunker output,
+    falling back to the text for documents without a chunk_id."""
+    metadata = doc.metadata or {}
+    chunk_id = metadata.get("chunk_id")
+    if chunk_id is None:
+        return doc.page_content
+    return (metadata.get("document_title"), chunk_id)
+
+
+def scored_documents(retriever: BaseRetriever, query: str, k: int | None = None, *, callbacks: Any = None) -> ScoredDocuments:
+    """Best-first (Document, score) pairs from a retriever.
+
+    Uses `get_scored_documents` (the sparse retrievers) or the vector store's relevance
+    scores (similarity-search VectorStoreRetriever); any other retriever is invoked
+    normally and its documents come back with a score of None.
+    """
+    if hasattr(retriever, "get_scored_documents"):
+        return retriever.get_scored_documents(query, k)
+    if isinstance(retriever, VectorStoreRetriever) and retriever.search_type == "similarity":
+        search_kwargs = dict(retriever.search_kwargs)
+        if k is not None:
+            search_kwargs["k"] = k
+        return retriever.vectorstore.similarity_search_with_relevance_scores(query, **search_kwargs)
+    return [(doc, None) for doc in retriever.invoke(query, {"callbacks": callbacks})]
+
+
+async def ascored_documents(retriever: BaseRetriever, query: str, k: int | None = None, *, callbacks: Any = None) -> ScoredDocuments:
+    """Async scored_documents: score-aware retrievers run in a worker thread."""
+    if hasattr(retriever, "get_scored_documents") or isinstance(retriever, VectorStoreRetriever):
+        return await asyncio.to_thread(scored_documents, retriever, query, k, callbacks=callbacks)
+    return [(doc, None) for doc in await retriever.ainvoke(query, {"callbacks": callbacks})]
+
+
+def _normalize(scores: np.ndarray, present: np.ndarray, method: str) -> np.ndarray:
+    """Row-wise min-max or z-score normalization over the present entries of an (R, N) matrix.
+
+    A chunk a retriever did not return gets that retriever's lowest normalized score.
+    """
+    masked = np.where(present, scores, np.nan)
+    has_any = present.any(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if method == "minmax":
+            lo = np.nanmin(np.where(has_any, masked, 0.0), axis=1, keepdims=True)
+            hi = np.nanmax(np.where(has_any, masked, 0.0), axis=1, keepdims=True)
+            span = hi - lo
+            normalized = np.where(span > 0, (masked - lo) / np.where(span > 0, span, 1.0), 1.0)
+            floor = np.zeros_like(lo)
+        else:
+            mean = np.nanmean(np.where(has_any, masked, 0.0), axis=1, keepdims=True)
+            std = np.nanstd(np.where(has_any, masked, 0.0), axis=1, keepdims=True)
+            normalized = np.where(std > 0, (masked - mean) / np.where(std > 0, std, 1.0), 0.0)
+            floor = np.nanmin(np.where(present, normalized, np.inf), axis=1, keepdims=True)
+            floor = np.where(np.isfinite(floor), floor, 0.0)
+    return np.where(present, normalized, floor)
+
+
+def fuse(
+    results: Sequence[ScoredDocuments | None],
+    weights: Sequence[float],
+    *,
+    method: str = "rrf",
+    c: int = 60,
+    names: Sequence[str] | None = None,
+) -> List[Document]:
+    """Fuse per-retriever rankings over a shared chunk-id space.
+
+    Chunks are interned to integer columns by chunk_key, so duplicates across retrievers
+    collapse to one column, and every retriever's ranks and scores become a row of an
+    (R, N) matrix. Fusion is one NumPy pass over it:
+
+      - "rrf": sum of weight / (rank + c), as in LangChain's EnsembleRetriever
+      - "minmax" / "zscore": weighted sum of each retriever's normalized scores
+        (a retriever without raw scores contributes its negated ranks instead)
+
+    `results[i]` is None when retriever i was unavailable. Returned documents are copies,
+    best first (ties keep first-seen order); their metadata gains "retrieval_scores"
+    (retriever name -> raw score, for retrievers that returned the chunk with a score)
+    and "fusion_score".
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method: {method}")
+    names = list(names) if names is not None else [f"retriever_{i + 1}" for i in range(len(results))]
+
+    columns: dict[Hashable, int] = {}
+    documents: list[Document] = []
+    entries: list[tuple[int, int, int, float]] = []  # (retriever, column, rank, score)
+    for r, result in enumerate(results):
+        seen: set[int] = set()
+        for rank, (doc, score) in enumerate(result or [], start=1):
+            column = columns.setdefault(chunk_key(doc), len(columns))
+            if column == len(documents):
+                documents.append(doc)
+            if column in seen:
+                continue  # keep a retriever's best rank for a chunk
+            seen.add(column)
+            entries.append((r, column, rank, np.nan if score is None else float(score)))
+    if not documents:
+        return []
+
+    shape = (len(results), len(documents))
+    rows, cols, ranks, raw = (np.asarray(values) for values in zip(*entries))
+    rank_matrix = np.zeros(shape)
+    score_matrix = np.full(shape, np.nan)
+    present = np.zeros(shape, dtype=bool)
+    rank_matrix[rows, cols] = ranks
+    score_matrix[rows, cols] = raw
+    present[rows, cols] = True
+    weight_column = np.asarray(weights, dtype=np.float64)[:, None]
+
+    if method == "rrf":
+        fused = (np.where(present, weight_column / (rank_matrix + c), 0.0)).sum(axis=0)
+    else:
+        # Retrievers that return rankings only are scored by negated rank
+        rank_only = np.isnan(score_matrix).all(axis=1, where=present, keepdims=True)
+        values = np.where(rank_only, -rank_matrix, np.nan_to_num(score_matrix))
+        fused = (weight_column * _normalize(values, present, method)).sum(axis=0)
+
+    fused_docs = []
+    for column in np.argsort(-fused, kind="stable"):
+        retrieval_scores = {
+            names[r]: float(score_matrix[r, column])
+            for r in range(len(results))
+            if present[r, column] and not np.isnan(score_matrix[r, column])
+        }
+        doc = documents[column]
+        metadata = {**(doc.metadata or {}), "retrieval_scores": retrieval_scores, "fusion_score": float(fused[column])}
+        fused_docs.append(Document(page_content=doc.page_content, metadata=metadata))
+    return fused_docs
@@ -1,11 +1,12 @@
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
-from typing import List, Any
+from typing import List, Any, Iterable
 from pydantic import PrivateAttr, Field
 import logging
 from ..config import Config
-from ..graph.neo4j_graph import Neo4jGraph
+from ..graph.backend import GraphBackend
+from ..graph.adjacency import ChunkAdjacency, chunk_uid
 
 
 class GraphEnhancedRetriever(BaseRetriever):
@@ -13,7 +14,7 @@ class GraphEnhancedRetriever(BaseRetriever):
 
     # Pydantic fields
     base_retriever: BaseRetriever = Field(...)
-    neo4j_graph: Any = Field(default=None)  # Optional Neo4j graph instance
+    neo4j_graph: Any = Field(default=None)  # Optional GraphBackend (Neo4jGraph or InMemoryGraph)
     enhancement_weight: float = Field(default=0.15)
 
     # Private attributes
@@ -56,138 +57,135 @@ class GraphEnhancedRetriever(BaseRetriever):
         
         if not base_documents:
             return base_documents
-            
-        enhanced_docs = list(base_documents)  # Start with base results
-        
+
+        # Apply enhancement weight by limiting additional documents
+        max_additional = int(len(base_documents) * self.enhancement_weight)
+        uids = list(dict.fromkeys(
+            chunk_uid(doc.metadata.get("document_title"), doc.metadata.get("chunk_id"))
+            for doc in base_documents if doc.metadata.get("chunk_id")
+        ))
+        if max_additional <= 0 or not uids:
+            return base_documents
+
+        # Fused base chunks carry metadata["fusion_score"]; a neighbor inherits its seed's
+        # score scaled by enhancement_weight, so it ranks below the chunk that led to it.
+        seed_scores = {}
+        for doc in base_documents:
+            uid = chunk_uid(doc.metadata.get("document_title"), doc.metadata.get("chunk_id"))
+            score = doc.metadata.get("fusion_score")
+            if uid is not None and score is not None:
+                seed_scores.setdefault(uid, float(score))
+
         try:
-            # For each base document, find related documents through graph relationships
-            for doc in base_documents:
-                chunk_id = doc.metadata.get("chunk_id")
-                if not chunk_id:
+            # Deduplicate on chunk_uid: base chunks first, then neighbors in query order
+            # (grouped by seed, so a neighbor reached from several seeds keeps the first one).
+            # A base chunk without a document_title is known by its bare chunk id.
+            seen = set(uids)
+            additional: List[Document] = []
+            for neighbor in self._get_graph_neighbors(uids):
+                chunk_id = neighbor.metadata.get("chunk_id")
+                neighbor_uid = chunk_uid(neighbor.metadata.get("document_title"), chunk_id)
+                if neighbor_uid in seen or chunk_id in seen:
                     continue
-                    
-                # Get sequential neighbors (NEXT relationships)
-                neighbors = self._get_sequential_neighbors(chunk_id)
-                
-                # Get section-related documents 
-                section_docs = self._get_section_documents(doc.metadata.get("section_path"))
-                # Optionally get similar documents
-                similar_docs = self._get_similar_documents(chunk_id)
-                
-                # Add unique neighbors to enhanced results
-                for neighbor in neighbors + section_docs + similar_docs:
-                    if neighbor and isinstance(neighbor.metadata, dict):
-                        if neighbor in neighbors:
-                            neighbor.metadata["graph_source"] = "NEXT"
-                        elif neighbor in section_docs:
-                            neighbor.metadata["graph_source"] = "SECTION"
-                        else:
-                            neighbor.metadata["graph_source"] = "SIMILAR_TO"
-                    if neighbor not in enhanced_docs:
-                        enhanced_docs.append(neighbor)
-                        
-            # Apply enhancement weight by limiting additional documents
-            max_additional = int(len(base_documents) * self.enhancement_weight)
-            if len(enhanced_docs) > len(base_documents) + max_additional:
-                enhanced_docs = base_documents + enhanced_docs[len(base_documents):len(base_documents) + max_additional]
-                
-            return enhanced_docs
+                seen.add(neighbor_uid)
+                seed_score = seed_scores.get(neighbor.metadata.get("graph_seed"))
+                if seed_score is not None:
+                    neighbor.metadata["fusion_score"] = seed_score * self.enhancement_weight
+                additional.append(neighbor)
+                if len(additional) >= max_additional:
+                    break
+            return list(base_documents) + additional
             
         except Exception as e:
             self._logger.error(f"Graph enhancement processing failed: {e}")
             return base_documents
-    
-    def _get_sequential_neighbors(self, chunk_id: str) -> List[Document]:
-        """Get sequential neighbor chunks using NEXT relationships."""
+
+    def _get_graph_neighbors(self, uids: List[str]) -> Iterable[Document]:
+        """NEXT, section and SIMILAR_TO neighbors of all chunks, by chunk_uid.
+
+        Neighbors come grouped by the position of their source chunk in `uids`, then
+        NEXT, SECTION (up to 25 per chunk, same document), SIMILAR_TO (up to 25, if
+        Config.ENABLE_SIMILAR_TO), each tagged with metadata["graph_source"] and with the uid
+        it was reached from in metadata["graph_seed"]. Every edge
+        stays inside the source chunk's document, so other filings in the graph never leak
+        in. They are served from the graph's in-memory ChunkAdjacency for an in-process
+        backend or when Config.GRAPH_ADJACENCY_CACHE is on, otherwise by one Neo4j round-trip.
+        """
+        include_similar = bool(getattr(Config, "ENABLE_SIMILAR_TO", False))
+        adjacency = self._local_adjacency()
+        if adjacency is not None:
+            return adjacency.neighbors(uids, include_similar=include_similar)
         try:
             if not self.neo4j_graph or not getattr(self.neo4j_graph, "driver", None):
                 return []
             with self.neo4j_graph.driver.session() as session:
+                # A bare chunk id (no "::") also matches the chunk_id of older single-document graphs
                 result = session.run(
                     """
-                    MATCH (c1:Chunk {chunk_id: $chunk_id})-[:NEXT]->(c2:Chunk)
-                    RETURN c2.chunk_id as chunk_id, c2.text as content, c2.page_number as page_number,
-                           c2.section_path as section_path, c2.element_type as element_type, c2.content_type as content_type
-                    """,
-                    chunk_id=chunk_id,
-                )
-                neighbors: List[Document] = []
-                for record in result:
-                    metadata = {
-                        "chunk_id": record.get("chunk_id"),
-                        "page_number": record.get("page_number"),
-                        "section_path": record.get("section_path"),
-                        "content_type": record.get("content_type"),
-                        "element_type": record.get("element_type"),
+                    UNWIND range(0, size($uids) - 1) AS position
+                    CALL {
+                        WITH position
+                        MATCH (c:Chunk {uid: $uids[position]})
+                        RETURN c
+                      UNION
+                        WITH position
+                        MATCH (c:Chunk {chunk_id: $uids[position]})
+                        WHERE NOT $uids[position] CONTAINS '::'
+                        RETURN c
                     }
-                    neighbors.append(Document(page_content=record.get("content") or "", metadata={k: v for k, v in metadata.items() if v is not None}))
-                return neighbors
-        except Exception as e:
-            self._logger.warning(f"Neo4j NEXT query failed: {e}")
-            return []
-    
-    def _get_section_documents(self, section_path: str) -> List[Document]:
-        """Get related documents from the same section."""
-        try:
-            if not section_path:
-                return []
-            if not self.neo4j_graph or not getattr(self.neo4j_graph, "driver", None):
-                return []
-            with self.neo4j_graph.driver.session() as session:
-                result = session.run(
-                    """
-                    MATCH (c:Chunk {section_path: $section_path})
-                    RETURN c.chunk_id as chunk_id, c.text as content, c.page_number as page_number,
-                           c.section_path as section_path, c.element_type as element_type, c.content_type as content_type
-                    LIMIT 25
+                    CALL {
+                        WITH c
+                        MATCH (c)-[:NEXT]->(n:Chunk)
+                        RETURN n, 'NEXT' AS source, 0 AS kind
+                      UNION ALL
+                        WITH c
+                        MATCH (n:Chunk {doc_title: c.doc_title, section_path: c.section_path})
+                        WHERE c.section_path <> ''
+                        RETURN n, 'SECTION' AS source, 1 AS kind
+                        LIMIT 25
+                      UNION ALL
+                        WITH c
+                        MATCH (c)-[:SIMILAR_TO]->(n:Chunk)
+                        WHERE $include_similar
+                        RETURN n, 'SIMILAR_TO' AS source, 2 AS kind
+                        ORDER BY coalesce(n.page_number, 1e9)
+                        LIMIT 25
+                    }
+                    RETURN source AS graph_source, $uids[position] AS graph_seed, n.chunk_id as chunk_id, n.doc_title as document_title, n.text as content,
+                           n.page_number as page_number, n.section_path as section_path,
+                           n.element_type as element_type, n.content_type as content_type
+                    ORDER BY position, kind, coalesce(n.page_number, 1e9)
                     """,
-                    section_path=section_path,
+                    uids=uids,
+                    include_similar=include_similar,
                 )
-                docs: List[Document] = []
-                for record in result:
-                    metadata = {
-                        "chunk_id": record.get("chunk_id"),
-                        "page_number": record.get("page_number"),
-                        "section_path": record.get("section_path"),
-                        "content_type": record.get("content_type"),
-                        "element_type": record.get("element_type"),
-                    }
-                    docs.append(Document(page_content=record.get("content") or "", metadata={k: v for k, v in metadata.items() if v is not None}))
-                return docs
+                return [self._record_to_document(record) for record in result]
         except Exception as e:
-            self._logger.warning(f"Neo4j section query failed: {e}")
+            self._logger.warning(f"Neo4j neighbor query failed: {e}")
             return []
 
-    def _get_similar_documents(self, chunk_id: str) -> List[Document]:
-        """Get embedding-similar chunks via SIMILAR_TO edges if enabled."""
+    def _local_adjacency(self) -> ChunkAdjacency | None:
+        if not hasattr(self.neo4j_graph, "adjacency"):
+            return None
+        in_process = isinstance(self.neo4j_graph, GraphBackend) and self.neo4j_graph.in_process
+        if not in_process and not getattr(Config, "GRAPH_ADJACENCY_CACHE", False):
+            return None
         try:
-            from ..config import Config
-            if not getattr(Config, "ENABLE_SIMILAR_TO", False):
-                return []
-            if not self.neo4j_graph or not getattr(self.neo4j_graph, "driver", None):
-                return []
-            with self.neo4j_graph.driver.session() as session:
-                result = session.run(
-                    """
-                    MATCH (c1:Chunk {chunk_id: $chunk_id})-[:SIMILAR_TO]->(c2:Chunk)
-                    RETURN c2.chunk_id as chunk_id, c2.text as content, c2.page_number as page_number,
-                           c2.section_path as section_path, c2.element_type as element_type, c2.content_type as content_type
-                    ORDER BY coalesce(c2.page_number, 1e9)
-                    LIMIT 25
-                    """,
-                    chunk_id=chunk_id,
-                )
-                docs: List[Document] = []
-                for record in result:
-                    metadata = {
-                        "chunk_id": record.get("chunk_id"),
-                        "page_number": record.get("page_number"),
-                        "section_path": record.get("section_path"),
-                        "content_type": record.get("content_type"),
-                        "element_type": record.get("element_type"),
-                    }
-                    docs.append(Document(page_content=record.get("content") or "", metadata={k: v for k, v in metadata.items() if v is not None}))
-                return docs
+            return self.neo4j_graph.adjacency()
         except Exception as e:
-            self._logger.warning(f"Neo4j SIMILAR_TO query failed: {e}")
-            return []
+            self._logger.warning(f"Loading graph adjacency failed: {e}, querying Neo4j instead")
+            return None
+
+    @staticmethod
+    def _record_to_document(record) -> Document:
+        metadata = {
+            "chunk_id": record.get("chunk_id"),
+            "document_title": record.get("document_title"),
+            "page_number": record.get("page_number"),
+            "section_path": record.get("section_path"),
+            "content_type": record.get("content_type"),
+            "element_type": record.get("element_type"),
+            "graph_source": record.get("graph_source"),
+            "graph_seed": record.get("graph_seed"),
+        }
+        return Document(page_content=record.get("content") or "", metadata={k: v for k, v in metadata.items() if v is not None})
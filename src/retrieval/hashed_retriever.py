@@ -0,0 +1,242 @@
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from dataclasses import dataclass, field
+from typing import List, Hashable
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+import numpy as np
+import scipy.sparse as sp
+from pydantic import PrivateAttr, Field
+import logging
+import threading
+from ..config import Config
+from .bm25_retriever import financial_term_boosts
+from .tfidf_retriever import top_k_positions
+
+
+@dataclass
+class _Segment:
+    """One append's worth of rows: term-major raw counts plus their stable row ids."""
+
+    row_ids: np.ndarray  # int64, ascending
+    counts: sp.csr_matrix  # n_features x len(row_ids)
+    alive: np.ndarray  # bool per column
+    norms: np.ndarray = field(default_factory=lambda: np.zeros(0))
+
+    @property
+    def num_dead(self) -> int:
+        return int(self.alive.size - self.alive.sum())
+
+
+class HashedTfidfIndex:
+    """Incremental TF-IDF index over a hashed feature space.
+
+    Chunks are vectorized once, on append, with a stateless HashingVectorizer (same
+    tokenization as Financial10QRetriever: unigrams + bigrams, English stop words), so the
+    existing corpus is never re-vectorized. Raw term counts are kept term-major in one
+    CSR segment per append, and a running document-frequency counter is updated per
+    segment. IDF, the financial-term bucket boosts and the document norms are recomputed
+    lazily, on the first query after the corpus changes. As in Financial10QRetriever, the
+    boosts weight the document side only.
+
+    Rows get stable ids on append. They can be removed by key (e.g. when a section is
+    rebuilt): they are masked out and their counts subtracted from the document
+    frequencies. Segments are merged once more than Config.HASHED_MAX_SEGMENTS
+    accumulate or half the stored rows are dead; a merge drops the dead columns.
+    """
+
+    def __init__(self, *, n_features: int | None = None):
+        self.n_features = int(n_features or getattr(Config, "HASHED_N_FEATURES", 2 ** 20))
+        self._vectorizer = HashingVectorizer(
+            n_features=self.n_features,
+            alternate_sign=False,
+            norm=None,  # raw counts; TF-IDF weighting is applied at query time
+            stop_words='english',
+            ngram_range=(1, 2),
+            token_pattern=r'\b[A-Za-z][A-Za-z0-9_]+\b',
+        )
+        # Financial-term boosts, hashed to their buckets (collisions share the boost)
+        boosts = financial_term_boosts()
+        hasher = FeatureHasher(n_features=self.n_features, input_type="string", alternate_sign=False)
+        buckets = hasher.transform([[term] for term in boosts]).indices
+        self._boost = np.ones(self.n_features, dtype=np.float64)
+        self._boost[buckets] = Config.FINANCIAL_BOOST
+
+        self._lock = threading.RLock()
+        self._segments: list[_Segment] = []
+        self._df = np.zeros(self.n_features, dtype=np.int64)
+        self._next_row = 0
+        self._num_docs = 0
+        self._rows_by_key: dict[Hashable, list[int]] = {}
+        self._dirty = True
+        self._idf = np.zeros(0)
+        self._weights = np.zeros(0)
+
+    @property
+    def num_rows(self) -> int:
+        """Columns currently stored, including removed rows not yet compacted away."""
+        return sum(segment.alive.size for segment in self._segments)
+
+    @property
+    def num_docs(self) -> int:
+        return self._num_docs
+
+    def live_rows(self) -> np.ndarray:
+        """Ids of the rows not removed, ascending."""
+        with self._lock:
+            rows = [segment.row_ids[segment.alive] for segment in self._segments]
+        return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+    def add(self, texts: List[str], *, key: Hashable | None = None) -> np.ndarray:
+        """Vectorize and append texts; returns their row ids."""
+        counts = self._vectorizer.transform(texts).tocsr()
+        term_major = counts.T.tocsr()
+        with self._lock:
+            rows = np.arange(self._next_row, self._next_row + len(texts), dtype=np.int64)
+            self._next_row += len(texts)
+            self._segments.append(_Segment(rows, term_major, np.ones(len(texts), dtype=bool)))
+            # Rows are canonical (one entry per term), so column counts are document frequencies
+            self._df += np.bincount(counts.indices, minlength=self.n_features)
+            self._num_docs += len(texts)
+            if key is not None:
+                self._rows_by_key.setdefault(key, []).extend(rows.tolist())
+            self._dirty = True
+        return rows
+
+    def remove(self, key: Hashable) -> np.ndarray:
+        """Remove every row added under key; returns the removed row ids."""
+        with self._lock:
+            rows = np.asarray(self._rows_by_key.pop(key, []), dtype=np.int64)
+            removed = []
+            for segment in self._segments:
+                local = np.flatnonzero(np.isin(segment.row_ids, rows) & segment.alive)
+                if local.size:
+                    # Entries per term row of the removed columns = their document frequencies
+                    self._df -= np.diff(segment.counts[:, local].tocsr().indptr)
+                    segment.alive[local] = False
+                    removed.append(segment.row_ids[local])
+            removed = np.concatenate(removed) if removed else np.zeros(0, dtype=np.int64)
+            self._num_docs -= int(removed.size)
+            if removed.size:
+                self._dirty = True
+            return removed
+
+    def _merge_segments(self) -> None:
+        """Merge all segments into one, dropping removed columns. Caller holds self._lock."""
+        live = [segment for segment in self._segments if segment.alive.any()]
+        if not live:
+            self._segments = []
+            return
+        self._segments = [_Segment(
+            np.concatenate([segment.row_ids[segment.alive] for segment in live]),
+            sp.hstack([segment.counts[:, np.flatnonzero(segment.alive)] for segment in live], format="csr"),
+            np.ones(self._num_docs, dtype=bool),
+        )]
+
+    def _refresh(self) -> None:
+        # Caller holds self._lock
+        if not self._dirty:
+            return
+        max_segments = int(getattr(Config, "HASHED_MAX_SEGMENTS", 8))
+        dead = sum(segment.num_dead for segment in self._segments)
+        if len(self._segments) > max_segments or (dead and 2 * dead >= self.num_rows):
+            self._merge_segments()
+        # Smoothed IDF as in TfidfVectorizer, over live documents
+        n = self.num_docs
+        self._idf = np.log((1.0 + n) / (1.0 + self._df)) + 1.0
+        self._weights = self._idf * self._boost
+        # Document norms of the boosted TF-IDF vectors: sqrt(sum_t (tf * w_t)^2)
+        squared_weights = self._weights ** 2
+        for segment in self._segments:
+            squared = segment.counts.copy()
+            squared.data **= 2
+            segment.norms = np.sqrt(squared.T @ squared_weights)
+        self._dirty = False
+
+    def score(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        """(row ids, cosine scores) for live rows sharing a term with the query."""
+        q = self._vectorizer.transform([query]).tocsr()
+        with self._lock:
+            self._refresh()
+            # Buckets no live document contains are out of vocabulary, as in TfidfVectorizer
+            seen = self._df[q.indices] > 0
+            indices = q.indices[seen]
+            # The query is plain TF-IDF; the financial boost is on the document side only
+            q_weights = q.data[seen] * self._idf[indices]
+            q_norm = np.linalg.norm(q_weights)
+            if q_norm == 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0)
+            # cos(q, d) = sum_t (q_t idf_t)(tf_dt w_t) / (|q| |d|): fold w_t and |q| into the query
+            query_vector = sp.csr_matrix(
+                (q_weights * self._weights[indices] / q_norm, indices, [0, indices.size]),
+                shape=(1, self.n_features),
+            )
+            rows, scores = [], []
+            for segment in self._segments:
+                matched = (query_vector @ segment.counts).tocsr()
+                local = matched.indices
+                keep = segment.alive[local] & (segment.norms[local] > 0)
+                rows.append(segment.row_ids[local[keep]])
+                scores.append(matched.data[keep] / segment.norms[local[keep]])
+            rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+            scores = np.concatenate(scores) if scores else np.zeros(0)
+        return rows, scores
+
+    def search(self, query: str, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-k (row ids, scores), best first."""
+        rows, scores = self.score(query)
+        top = top_k_positions(scores, k, tiebreak=rows)
+        return rows[top], scores[top]
+
+
+class HashedTfidfRetriever(BaseRetriever):
+    """TF-IDF retriever over a HashedTfidfIndex; documents can be appended or replaced in place.
+
+    `documents` holds the live chunks in insertion order; removed chunks are dropped.
+    """
+
+    # Pydantic fields
+    documents: List[Document] = Field(default_factory=list)
+
+    # Private runtime attributes
+    _index: HashedTfidfIndex = PrivateAttr()
+    _by_row: dict = PrivateAttr()  # index row id -> Document, live rows only
+
+    def __init__(self, documents: List[Document], *, index: HashedTfidfIndex | None = None):
+        super().__init__(documents=[])
+        self._index = index or HashedTfidfIndex()
+        self._by_row = {}
+        self.add_documents(documents)
+
+    def add_documents(self, documents: List[Document], *, key: Hashable | None = None) -> None:
+        """Append chunks (optionally under a key, e.g. a section or filing, for replace_documents)."""
+        logger = logging.getLogger("retrieval.hashed_tfidf")
+        if not documents:
+            return
+        if self._index.num_docs != len(self._by_row):
+            raise RuntimeError("HashedTfidfIndex is shared with another writer")
+        rows = self._index.add([doc.page_content for doc in documents], key=key)
+        self._by_row.update(zip(rows.tolist(), documents))
+        self.documents.extend(documents)
+        logger.info(f"Hashed TF-IDF index: appended {len(documents)} docs ({self._index.num_docs} live)")
+
+    def replace_documents(self, key: Hashable, documents: List[Document]) -> None:
+        """Drop the chunks previously added under key and append their replacement."""
+        removed = self._index.remove(key)
+        if removed.size:
+            for row in removed.tolist():
+                del self._by_row[row]
+            self.documents = list(self._by_row.values())
+        self.add_documents(documents, key=key)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Get documents relevant to a query."""
+        return [doc for doc, _ in self.get_scored_documents(query)]
+
+    def get_scored_documents(self, query: str, k: int | None = None) -> List[tuple[Document, float]]:
+        """Top-k (Document, cosine score) pairs, best first."""
+        rows, scores = self._index.search(query, k if k is not None else Config.DEFAULT_TOP_K)
+        return [(self._by_row[int(row)], float(score)) for row, score in zip(rows, scores)]
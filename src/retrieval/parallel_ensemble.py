@@ -0,0 +1,160 @@
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun, AsyncCallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Any
+from pydantic import PrivateAttr, Field
+import asyncio
+import logging
+import threading
+from ..config import Config
+from .fusion import fuse, scored_documents, ascored_documents, ScoredDocuments
+
+
+class ParallelEnsembleRetriever(BaseRetriever):
+    """Hybrid retriever that queries its retrievers concurrently and fuses their scored results.
+
+    Searches fan out on one executor per ensemble (or are awaited together on the async
+    path), so latency is that of the slowest retriever rather than the sum. Each
+    retriever may have at most `max_in_flight` searches running, counting timed-out
+    searches that have not finished yet; the executor has exactly that many threads per
+    retriever, so an admitted search starts at once and the per-retriever `timeout`
+    (seconds; None disables it) counts from its start. A retriever with no free slot is
+    skipped for that query instead of piling up more work behind a slow backend. A
+    retriever that is skipped, misses the timeout or raises is logged and left out of the
+    fusion; the query fails when no retriever returned results.
+
+    Results are fused by `fusion.fuse` with `fusion` = "rrf" (LangChain's weighted RRF),
+    "minmax" or "zscore", deduplicated by chunk id; each document's metadata carries the
+    per-retriever scores under `names`.
+    """
+
+    # Pydantic fields
+    retrievers: List[BaseRetriever] = Field(...)
+    weights: List[float] = Field(...)
+    c: int = Field(default=60)
+    timeout: float | None = Field(default=None)
+    fusion: str = Field(default="rrf")
+    names: List[str] | None = Field(default=None)
+    max_in_flight: int = Field(default=4)
+
+    # Private attributes
+    _logger: Any = PrivateAttr()
+    _executor: ThreadPoolExecutor = PrivateAttr()
+    _slots: List[threading.BoundedSemaphore] = PrivateAttr()
+
+    def __init__(
+        self,
+        retrievers: List[BaseRetriever],
+        weights: List[float],
+        *,
+        c: int = 60,
+        timeout: float | None = None,
+        fusion: str = "rrf",
+        names: List[str] | None = None,
+        max_in_flight: int | None = None,
+    ):
+        if len(retrievers) != len(weights):
+            raise ValueError("Number of retrievers must equal the number of weights")
+        if names is not None and len(names) != len(retrievers):
+            raise ValueError("Number of retrievers must equal the number of names")
+        if max_in_flight is None:
+            max_in_flight = getattr(Config, "RETRIEVER_MAX_IN_FLIGHT", 4)
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        super().__init__(
+            retrievers=retrievers, weights=weights, c=c, timeout=timeout, fusion=fusion, names=names,
+            max_in_flight=max_in_flight,
+        )
+        self._logger = logging.getLogger("retrieval.parallel_ensemble")
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(retrievers) * max_in_flight, thread_name_prefix="retrieval"
+        )
+        self._slots = [threading.BoundedSemaphore(max_in_flight) for _ in retrievers]
+
+    def _acquire_slot(self, i: int) -> bool:
+        if self._slots[i].acquire(blocking=False):
+            return True
+        self._logger.warning(
+            f"Retriever {i + 1} still has {self.max_in_flight} searches running; fusing without it"
+        )
+        return False
+
+    def _search(self, i: int, retriever: BaseRetriever, query: str, callbacks: Any) -> ScoredDocuments:
+        try:
+            return scored_documents(retriever, query, callbacks=callbacks)
+        finally:
+            self._slots[i].release()
+
+    def _finish_async(self, i: int, task: asyncio.Future) -> None:
+        self._slots[i].release()
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here so a search that failed after its timeout is not reported as unhandled
+            self._logger.debug(f"Retriever {i + 1} finished with an error: {task.exception()}")
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Query all retrievers concurrently and fuse their rankings."""
+        # A search holds its retriever's slot until it finishes, even after a timeout, so a
+        # hung backend can never tie up more than max_in_flight threads
+        futures = [
+            self._executor.submit(
+                self._search, i, retriever, query, run_manager.get_child(tag=f"retriever_{i + 1}")
+            ) if self._acquire_slot(i) else None
+            for i, retriever in enumerate(self.retrievers)
+        ]
+        wait([f for f in futures if f is not None], timeout=self.timeout)
+
+        results: list[ScoredDocuments | None] = []
+        errors: list[BaseException] = []
+        for i, future in enumerate(futures):
+            if future is None:
+                results.append(None)
+            elif not future.done():
+                self._logger.warning(f"Retriever {i + 1} timed out after {self.timeout}s; fusing without it")
+                results.append(None)
+            elif future.exception() is not None:
+                errors.append(future.exception())
+                self._logger.error(f"Retriever {i + 1} failed: {future.exception()}")
+                results.append(None)
+            else:
+                results.append(future.result())
+        return self._fuse_available(results, errors)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Async variant: await all retrievers together, each bounded by the timeout."""
+        async def run(i: int, retriever: BaseRetriever) -> ScoredDocuments | BaseException | None:
+            if not self._acquire_slot(i):
+                return None
+            task = asyncio.ensure_future(
+                ascored_documents(retriever, query, callbacks=run_manager.get_child(tag=f"retriever_{i + 1}"))
+            )
+            # The slot is released when the search itself ends, not when we stop waiting
+            task.add_done_callback(lambda t: self._finish_async(i, t))
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._logger.warning(f"Retriever {i + 1} timed out after {self.timeout}s; fusing without it")
+                return None
+            except Exception as e:
+                self._logger.error(f"Retriever {i + 1} failed: {e}")
+                return e
+
+        outcomes = await asyncio.gather(*(run(i, r) for i, r in enumerate(self.retrievers)))
+        errors = [o for o in outcomes if isinstance(o, BaseException)]
+        return self._fuse_available([o if isinstance(o, list) else None for o in outcomes], errors)
+
+    def _fuse_available(self, results: List[ScoredDocuments | None], errors: List[BaseException]) -> List[Document]:
+        """Fuse the retrievers that answered; raise when none did."""
+        if all(result is None for result in results):
+            if errors:
+                raise errors[0]
+            raise TimeoutError(f"No retriever answered within {self.timeout}s (or all were busy)")
+        return self.fuse_results(results)
+
+    def fuse_results(self, results: List[ScoredDocuments | None]) -> List[Document]:
+        """Fuse per-retriever (Document, score) lists (None = retriever unavailable)."""
+        return fuse(results, self.weights, method=self.fusion, c=self.c, names=self.names)
@@ -0,0 +1,153 @@
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from collections import OrderedDict
+from typing import List, Hashable, Any
+from pydantic import PrivateAttr, Field
+import logging
+import threading
+import time
+from ..config import Config
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a question, used in cache keys."""
+    return " ".join(query.split()).casefold()
+
+
+class RetrievalCache:
+    """Thread-safe LRU cache of retrieval results with a per-entry TTL.
+
+    Holds at most `max_entries` result lists (Config.RETRIEVAL_CACHE_SIZE; 0 disables
+    caching); entries older than `ttl_seconds` (Config.RETRIEVAL_CACHE_TTL_SECONDS; None
+    or 0 = no expiry) are treated as misses. Hits, misses and evictions are counted.
+    """
+
+    def __init__(self, max_entries: int | None = None, ttl_seconds: float | None = None):
+        self.max_entries = int(max_entries if max_entries is not None else getattr(Config, "RETRIEVAL_CACHE_SIZE", 256))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else getattr(Config, "RETRIEVAL_CACHE_TTL_SECONDS", None)
+        self._entries: OrderedDict[Hashable, tuple[float, List[Document]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> List[Document] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: Hashable, documents: List[Document]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), list(documents))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, fingerprint: str | None = None) -> int:
+        """Drop every entry (or those of one document fingerprint); returns the number dropped."""
+        with self._lock:
+            if fingerprint is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+            else:
+                stale = [key for key in self._entries if key[0] == fingerprint]
+                for key in stale:
+                    del self._entries[key]
+                dropped = len(stale)
+        if dropped:
+            logging.getLogger("retrieval.cache").info(f"Invalidated {dropped} cached retrieval results")
+        return dropped
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hit_rate,
+            }
+
+
+_retrieval_cache: RetrievalCache | None = None
+_retrieval_cache_lock = threading.Lock()
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Process-wide RetrievalCache shared by every CachedRetriever by default."""
+    global _retrieval_cache
+    with _retrieval_cache_lock:
+        if _retrieval_cache is None:
+            _retrieval_cache = RetrievalCache()
+        return _retrieval_cache
+
+
+class CachedRetriever(BaseRetriever):
+    """Serves repeated questions from a RetrievalCache in front of another retriever.
+
+    Entries are keyed on (document fingerprint, normalized query, fusion weights, top_k,
+    reranker flag); weights, fusion method and top_k are read from Config at query time,
+    so changing them never serves results computed under the old settings.
+    """
+
+    # Pydantic fields
+    base_retriever: BaseRetriever = Field(...)
+    fingerprint: str | None = Field(...)
+    reranker: bool = Field(default=False)
+
+    # Private attributes
+    _cache: Any = PrivateAttr()
+
+    def __init__(
+        self,
+        base_retriever: BaseRetriever,
+        *,
+        fingerprint: str | None,
+        reranker: bool = False,
+        cache: RetrievalCache | None = None,
+    ):
+        super().__init__(base_retriever=base_retriever, fingerprint=fingerprint, reranker=reranker)
+        self._cache = cache or get_retrieval_cache()
+
+    @property
+    def cache(self) -> RetrievalCache:
+        return self._cache
+
+    def cache_key(self, query: str) -> tuple:
+        weights = (
+            float(Config.DENSE_WEIGHT),
+            float(Config.TFIDF_WEIGHT),
+            float(Config.GRAPH_ENHANCEMENT_WEIGHT),
+            getattr(Config, "FUSION_METHOD", "rrf"),
+        )
+        return (self.fingerprint, normalize_query(query), weights, int(Config.DEFAULT_TOP_K), self.reranker)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Return cached results for the query, retrieving and caching them on a miss."""
+        key = self.cache_key(query)
+        documents = self._cache.get(key)
+        if documents is not None:
+            logging.getLogger("retrieval.cache").debug(f"Retrieval cache hit ({self._cache.hit_rate:.0%} hit rate)")
+            return documents
+        documents = self.base_retriever.invoke(query, {"callbacks": run_manager.get_child()})
+        self._cache.put(key, documents)
+        return list(documents)
@@ -0,0 +1,141 @@
+from langchain_core.documents import Document
+from typing import List
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import numpy as np
+import scipy.sparse as sp
+from ..config import Config
+from .fingerprint import documents_fingerprint
+
+# Bump when the on-disk layout or the fitted model's meaning changes
+TFIDF_INDEX_VERSION = 1
+
+_MATRIX_ARRAYS = ("data", "indices", "indptr")
+
+
+def tfidf_fingerprint(documents: List[Document]) -> str:
+    """Fingerprint of a chunk set plus the Config knobs that shape the fitted TF-IDF model."""
+    knobs = {
+        "version": TFIDF_INDEX_VERSION,
+        "documents": documents_fingerprint(documents),
+        "max_features": int(Config.MAX_FEATURES),
+        "financial_boost": float(Config.FINANCIAL_BOOST),
+        "financial_terms": sorted(Config.FINANCIAL_10Q_TERMS),
+    }
+    payload = json.dumps(knobs, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()[:32]
+
+
+class TfidfIndexStore:
+    """On-disk store for fitted Financial10QRetriever state, one directory per fingerprint.
+
+    Each ``<index_dir>/<fingerprint>/`` holds:
+      - ``vocabulary.json``: term -> feature index
+      - ``idf.npy``: IDF vector
+      - ``data.npy``, ``indices.npy``, ``indptr.npy``: the boosted term-major CSR matrix
+      - ``features.npy``: content features (3 x n_docs) from compute_content_features
+      - ``meta.json``: version and matrix shape
+
+    Entries are written to a temporary directory and renamed into place, so readers never
+    see a partial entry. Arrays load with ``mmap_mode='r'``: reopening costs a few page
+    faults, and processes that open the same entry share the page cache.
+
+    Each hit or save touches the entry directory's mtime. After a save, the least recently
+    used entries beyond `max_entries` (default Config.TFIDF_MAX_INDEXES, 0 = unbounded)
+    are deleted.
+    """
+
+    def __init__(self, index_dir: str | os.PathLike | None = None, *, max_entries: int | None = None):
+        self.index_dir = Config.resolve_path(index_dir or Config.TFIDF_INDEX_DIR)
+        self.max_entries = getattr(Config, "TFIDF_MAX_INDEXES", 8) if max_entries is None else max_entries
+        self.logger = logging.getLogger("retrieval.tfidf_index")
+
+    def _entry_dir(self, fingerprint: str) -> Path:
+        return self.index_dir / fingerprint
+
+    def load(self, fingerprint: str) -> tuple[dict, np.ndarray, sp.csr_matrix, np.ndarray] | None:
+        """Return (vocabulary, idf, term_matrix, content_features), or None on a miss."""
+        entry = self._entry_dir(fingerprint)
+        try:
+            with open(entry / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != TFIDF_INDEX_VERSION:
+                return None
+            with open(entry / "vocabulary.json", "r", encoding="utf-8") as f:
+                vocabulary = json.load(f)
+            idf = np.load(entry / "idf.npy", mmap_mode="r")
+            data, indices, indptr = (np.load(entry / f"{name}.npy", mmap_mode="r") for name in _MATRIX_ARRAYS)
+            term_matrix = sp.csr_matrix((data, indices, indptr), shape=tuple(meta["shape"]), copy=False)
+            features = np.load(entry / "features.npy", mmap_mode="r")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Discarding unreadable TF-IDF index {fingerprint[:12]}: {e}")
+            return None
+        self._touch(entry)
+        self.logger.info(f"TF-IDF index hit: {term_matrix.shape[1]} docs, {len(vocabulary)} features ({fingerprint[:12]})")
+        return vocabulary, idf, term_matrix, features
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _evict(self, keep: Path) -> None:
+        """Delete the least recently used entries beyond max_entries; `keep` always survives."""
+        if not self.max_entries:
+            return
+        entries = []
+        for entry in self.index_dir.iterdir():
+            if entry == keep or entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        for _, entry in entries[max(self.max_entries - 1, 0):]:
+            # Open memory maps of a deleted entry stay valid until they are closed
+            shutil.rmtree(entry, ignore_errors=True)
+            self.logger.info(f"Evicted TF-IDF index {entry.name[:12]}")
+
+    def save(
+        self,
+        fingerprint: str,
+        *,
+        vocabulary: dict,
+        idf: np.ndarray,
+        term_matrix: sp.csr_matrix,
+        content_features: np.ndarray,
+    ) -> None:
+        entry = self._entry_dir(fingerprint)
+        if entry.exists():
+            self._touch(entry)
+            return
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.index_dir, prefix=f".{fingerprint}."))
+        try:
+            with open(tmp_dir / "vocabulary.json", "w", encoding="utf-8") as f:
+                json.dump({term: int(idx) for term, idx in vocabulary.items()}, f, ensure_ascii=False)
+            np.save(tmp_dir / "idf.npy", np.asarray(idf))
+            for name in _MATRIX_ARRAYS:
+                np.save(tmp_dir / f"{name}.npy", getattr(term_matrix, name))
+            np.save(tmp_dir / "features.npy", np.asarray(content_features))
+            with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+                json.dump({"version": TFIDF_INDEX_VERSION, "shape": list(term_matrix.shape)}, f)
+            os.rename(tmp_dir, entry)
+        except OSError as e:
+            # Another process may have published the same entry first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not entry.exists():
+                self.logger.warning(f"Failed to save TF-IDF index {fingerprint[:12]}: {e}")
+            return
+        self.logger.info(f"Saved TF-IDF index {fingerprint[:12]} to {entry}")
+        self._evict(keep=entry)
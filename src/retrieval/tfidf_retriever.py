@@ -3,11 +3,14 @@ from langchain_core.callbacks import CallbackManagerForRetrieverRun
 from langchain_core.documents import Document
 from typing import List, Any
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import numpy as np
+import scipy.sparse as sp
+import re
 from pydantic import PrivateAttr, Field
 import logging
 from ..config import Config
+from .tfidf_index import TfidfIndexStore, tfidf_fingerprint
 
 class Financial10QRetriever(BaseRetriever):
     """A custom TF-IDF retriever for 10-Q financial documents."""
@@ -17,166 +20,272 @@ class Financial10QRetriever(BaseRetriever):
 
     # Private runtime attributes
     _vectorizer: TfidfVectorizer = PrivateAttr()
-    _tfidf_matrix: Any = PrivateAttr()
+    _term_matrix: Any = PrivateAttr()
+    _static_boost: np.ndarray = PrivateAttr()
+    _components_boost: np.ndarray = PrivateAttr()
+    _partnership_score: np.ndarray = PrivateAttr()
+    _partnership_candidates: np.ndarray = PrivateAttr()
 
-    def __init__(self, documents: List[Document]):
+    def __init__(self, documents: List[Document], *, index_store: TfidfIndexStore | None = None):
+        """Fit (or reopen) the TF-IDF model for `documents`.
+
+        With Config.PERSIST_TFIDF_INDEX (or an explicit `index_store`) the fitted vocabulary,
+        IDF vector, boosted matrix and content features are saved under the chunk set's
+        tfidf_fingerprint, and later retrievers over the same chunks memory-map them instead
+        of refitting.
+        """
         super().__init__(documents=documents)
         logger = logging.getLogger("retrieval.tfidf")
-        self._vectorizer = TfidfVectorizer(
-            max_features=Config.MAX_FEATURES,
-            stop_words='english',
-            ngram_range=(1, 2),  # Include bigrams for compound financial terms like "term_debt"
-            min_df=1,  # Don't ignore rare financial terms
-            token_pattern=r'\b[A-Za-z][A-Za-z0-9_]+\b'  # Allow underscores in financial terms
-        )
-        # Fit TF-IDF
-        self._tfidf_matrix = self._vectorizer.fit_transform([doc.page_content for doc in self.documents])
-        logger.info(f"TFIDF fit on {len(self.documents)} docs with {self._tfidf_matrix.shape[1]} features")
-
-        # Build a feature weight vector to boost financial terms
-        vocab = self._vectorizer.vocabulary_ or {}
-        num_features = len(vocab)
-        feature_weights = np.ones(num_features, dtype=np.float32)
-        for term in Config.FINANCIAL_10Q_TERMS:
-            idx = vocab.get(term)
-            if idx is not None:
-                feature_weights[idx] = Config.FINANCIAL_BOOST
-        # Apply weights to TF-IDF matrix effectively: scale columns by weights
-        self._tfidf_matrix = self._tfidf_matrix.tocsc(copy=True)
-        for j in range(self._tfidf_matrix.shape[1]):
-            if feature_weights[j] != 1.0:
-                start_ptr, end_ptr = self._tfidf_matrix.indptr[j], self._tfidf_matrix.indptr[j + 1]
-                self._tfidf_matrix.data[start_ptr:end_ptr] *= feature_weights[j]
-        self._tfidf_matrix = self._tfidf_matrix.tocsr(copy=True)
-        logger.debug("Applied financial term boosting to TFIDF matrix")
+        if index_store is None and getattr(Config, "PERSIST_TFIDF_INDEX", False):
+            index_store = TfidfIndexStore()
+        fingerprint = tfidf_fingerprint(self.documents) if index_store is not None else None
+
+        cached = index_store.load(fingerprint) if index_store is not None else None
+        if cached is not None:
+            vocabulary, idf, self._term_matrix, content_features = cached
+            self._vectorizer = _make_vectorizer(vocabulary=vocabulary)
+            self._vectorizer.idf_ = idf
+        else:
+            self._vectorizer = _make_vectorizer()
+            # Fit TF-IDF
+            tfidf_matrix = self._vectorizer.fit_transform([doc.page_content for doc in self.documents])
+            logger.info(f"TFIDF fit on {len(self.documents)} docs with {tfidf_matrix.shape[1]} features")
+
+            # Boost financial terms (column scaling) and re-normalize rows, so a dot product with
+            # the L2-normalized query vector equals the cosine similarity against the boosted matrix
+            feature_weights = financial_feature_weights(self._vectorizer.vocabulary_ or {})
+            tfidf_matrix = normalize(tfidf_matrix @ sp.diags(feature_weights), norm="l2", copy=False)
+            # Stored term-major (n_features x n_docs CSR): a query only reads the postings rows
+            # of its own terms, so scoring cost follows the matched postings, not the corpus size
+            self._term_matrix = tfidf_matrix.T.tocsr()
+            logger.debug("Applied financial term boosting to TFIDF matrix")
+
+            # Query-independent content features for _enhance_scores
+            content_features = np.vstack(compute_content_features(self.documents))
+            if index_store is not None:
+                index_store.save(
+                    fingerprint,
+                    vocabulary=self._vectorizer.vocabulary_,
+                    idf=self._vectorizer.idf_,
+                    term_matrix=self._term_matrix,
+                    content_features=content_features,
+                )
+
+        self._static_boost, self._components_boost, self._partnership_score = content_features
+        self._partnership_candidates = np.flatnonzero(self._partnership_score > 0)
 
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
     ) -> List[Document]:
         """Get documents relevant to a query."""
+        return [doc for doc, _ in self.get_scored_documents(query)]
+
+    def get_scored_documents(self, query: str, k: int | None = None) -> List[tuple[Document, float]]:
+        """Top-k (Document, enhanced score) pairs, best first; padding chunks score 0."""
         logger = logging.getLogger("retrieval.tfidf")
+        top_k = k if k is not None else Config.DEFAULT_TOP_K
         query_vector = self._vectorizer.transform([query])
-        similarity_scores = cosine_similarity(query_vector, self._tfidf_matrix).flatten()
-        
+        # Sparse dot product: only chunks sharing a term with the query get a score
+        matched = (query_vector @ self._term_matrix).tocsr()
+        candidates, similarity_scores = matched.indices, matched.data
+
+        if _is_partnership_query(query) and self._partnership_candidates.size:
+            # Partnership chunks can score without lexical overlap (see _enhance_scores)
+            extra = np.setdiff1d(self._partnership_candidates, candidates, assume_unique=True)
+            candidates = np.concatenate([candidates, extra])
+            similarity_scores = np.concatenate([similarity_scores, np.zeros(extra.size)])
+
         # ENHANCED SCORING: Boost chunks with numerical/financial data
-        enhanced_scores = self._enhance_scores(similarity_scores, query)
-        
-        relevant_doc_indices = np.argsort(enhanced_scores)[::-1][:Config.DEFAULT_TOP_K]
+        enhanced_scores = self._enhance_scores(similarity_scores, query, candidates)
+
+        top = top_k_positions(enhanced_scores, top_k, tiebreak=candidates)
+        relevant_doc_indices = candidates[top].tolist()
+        relevant_scores = enhanced_scores[top].tolist()
+        if len(relevant_doc_indices) < top_k:
+            # Fill with unscored chunks, as the previous full sort over the corpus did
+            chosen = set(relevant_doc_indices)
+            for idx in range(len(self.documents) - 1, -1, -1):
+                if len(relevant_doc_indices) >= top_k:
+                    break
+                if idx not in chosen:
+                    relevant_doc_indices.append(idx)
+                    relevant_scores.append(0.0)
         logger.debug(f"Top indices: {relevant_doc_indices}")
-        
+
         # Enhanced logging for debugging
         logger.debug(f"Query: '{query}'")
-        for i, idx in enumerate(relevant_doc_indices[:3]):  # Log top 3
-            original_score = similarity_scores[idx]
-            enhanced_score = enhanced_scores[idx]
+        for i, pos in enumerate(top[:3]):  # Log top 3
+            idx = candidates[pos]
+            original_score = similarity_scores[pos]
+            enhanced_score = enhanced_scores[pos]
             chunk_preview = self.documents[idx].page_content[:100].replace('\n', ' ')
             logger.debug(f"Rank {i+1}: chunk_{idx}, original={original_score:.4f}, enhanced={enhanced_score:.4f}")
             logger.debug(f"  Content: '{chunk_preview}...'")
-        
-        return [self.documents[i] for i in relevant_doc_indices]
-    
-    def _enhance_scores(self, base_scores: np.ndarray, query: str) -> np.ndarray:
-        """Enhance TF-IDF scores based on content quality and query relevance."""
-        logger = logging.getLogger("retrieval.tfidf")
-        enhanced_scores = base_scores.copy()
-        
-        # Query analysis
-        is_components_query = any(word in query.lower() for word in ['components', 'breakdown', 'details'])
-        is_income_expense_query = 'income' in query.lower() and 'expense' in query.lower()
-        is_partnership_query = any(word in query.lower() for word in ['partnership', 'strategic', 'alliance', 'collaboration', 'joint'])
-        
-
-        
-        for i, doc in enumerate(self.documents):
-            content = doc.page_content
-            content_lower = content.lower()
-            
-            # Base score
-            boost = 1.0
-            
-            # 1. CRITICAL: Boost chunks with actual financial figures
-            dollar_amounts = content.count('$')
-            parenthetical_amounts = content.count('(') + content.count(')')  # Often negative amounts like (594)
-            if dollar_amounts >= 2 or parenthetical_amounts >= 4:  # Multiple financial figures
-                boost *= 3.0  # Strong boost for data-rich chunks
-            elif dollar_amounts >= 1:
-                boost *= 2.0  # Moderate boost for chunks with some financial data
-                
-            # 2. Boost chunks with specific numbers mentioned in successful examples
-            if '600' in content and ('594' in content or 'interest' in content_lower):
-                boost *= 4.0  # Maximum boost for chunks with our target data
-            elif '600' in content or '594' in content:
-                boost *= 2.5  # High boost for chunks with either target figure
-                
-            # 3. Boost chunks with table-like data (multiple numbers in sequence)
-            import re
-            numbers = re.findall(r'\$?\d{1,3}(?:,\d{3})*', content)
-            if len(numbers) >= 5:  # Likely a data table
-                boost *= 2.5
-            elif len(numbers) >= 3:
-                boost *= 1.5
-                
-            # 4. For "components" queries, prioritize chunks with structured data
-            if is_components_query:
-                # Look for structured presentation
-                if ('income' in content_lower and 'expense' in content_lower and 
-                    dollar_amounts >= 1):
-                    boost *= 2.0
-                # Boost chunks with line items
-                if content.count('\n') > 5 or content.count('EmptyElement') < content.count('$'):
-                    boost *= 1.5
-                    
-            # 5. PENALTY: Reduce score for chunks with too many parsing artifacts
-            empty_elements = content.count('EmptyElement')
-            total_length = len(content)
-            if total_length > 0:
-                empty_ratio = empty_elements / total_length
-                if empty_ratio > 0.3:  # More than 30% parsing artifacts
-                    boost *= 0.5  # Significant penalty
-                elif empty_ratio > 0.2:  # More than 20% parsing artifacts
-                    boost *= 0.7  # Moderate penalty
-                    
-            # 6. PENALTY: Reduce score for pure header/navigation chunks
-            if ('NOTE' in content and 'INCOME' in content and 'EXPENSE' in content and
-                dollar_amounts == 0):  # Headers without data
-                boost *= 0.3  # Strong penalty for header-only chunks
-                
-            # 7. Boost chunks with "interest and dividends" for our specific case
-            if 'interest and dividends' in content_lower:
-                boost *= 1.8
-                
-            # 8. CRITICAL: Boost chunks with partnership/strategic alliance content
-            if is_partnership_query:
-                partnership_score = 0
-                chunk_id = doc.metadata.get('chunk_id', f'chunk_{i}')
-                
-                # High value terms
-                if 'openai' in content_lower:
-                    partnership_score += 5.0  # OpenAI is the key partnership
-                if '13 billion' in content_lower or 'funding commitments' in content_lower:
-                    partnership_score += 4.0  # Specific dollar amounts
-                if 'strategic' in content_lower and ('partnership' in content_lower or 'alliance' in content_lower):
-                    partnership_score += 3.0  # Direct mention of strategic partnerships
-                    
-                # Medium value terms  
-                if any(term in content_lower for term in ['investment', 'joint venture', 'collaboration']):
-                    partnership_score += 2.0
-                if 'acquisition' in content_lower or 'alliance' in content_lower:
-                    partnership_score += 1.5
-                    
-                # Apply partnership boost
-                if partnership_score > 0:
-                    chunk_id = doc.metadata.get('chunk_id', f'chunk_{i}')
-                    # For partnership queries, ensure chunks with partnership content get minimum retrieval score
-                    if base_scores[i] == 0.0:
-                        # If base TF-IDF is zero but content is highly relevant, give it a very high base score
-                        enhanced_scores[i] = partnership_score * 0.25  # Much higher minimum score for partnership relevance
-                        # Don't apply the normal boost logic for zero-base chunks - they already have their score set
-                        continue  # Skip the normal boost application
-                    else:
-                        boost *= (1.0 + partnership_score)  # Multiplicative boost based on relevance
-                    
-            # Apply the boost (only for non-partnership zero-base chunks)
-            enhanced_scores[i] = base_scores[i] * boost
-            
+
+        return [(self.documents[i], float(score)) for i, score in zip(relevant_doc_indices, relevant_scores)]
+
+    def _enhance_scores(self, base_scores: np.ndarray, query: str, indices: np.ndarray | None = None) -> np.ndarray:
+        """Enhance TF-IDF scores based on content quality and query relevance.
+
+        Content features are precomputed in __init__ (see compute_content_features);
+        only the query analysis runs per call and the boosts are applied as array ops.
+        `base_scores` covers the whole corpus, or the documents listed in `indices`.
+        """
+        def features(values: np.ndarray) -> np.ndarray:
+            return values if indices is None else values[indices]
+
+        query_lower = query.lower()
+        is_components_query = any(word in query_lower for word in ['components', 'breakdown', 'details'])
+
+        boost = features(self._static_boost)
+        if is_components_query:
+            boost = boost * features(self._components_boost)
+        enhanced_scores = base_scores * boost
+
+        if _is_partnership_query(query):
+            partnership_score = features(self._partnership_score)
+            relevant = partnership_score > 0
+            zero_base = base_scores == 0.0
+            # Multiplicative boost based on relevance for chunks TF-IDF already matched
+            boosted = relevant & ~zero_base
+            enhanced_scores[boosted] *= 1.0 + partnership_score[boosted]
+            # If base TF-IDF is zero but content is highly relevant, give it a minimum
+            # retrieval score instead of the (zero) boosted score
+            floor = relevant & zero_base
+            enhanced_scores[floor] = partnership_score[floor] * 0.25
+
         return enhanced_scores
+
+
+
+def _make_vectorizer(vocabulary: dict | None = None) -> TfidfVectorizer:
+    return TfidfVectorizer(
+        max_features=Config.MAX_FEATURES,
+        stop_words='english',
+        ngram_range=(1, 2),  # Include bigrams for compound financial terms like "term_debt"
+        min_df=1,  # Don't ignore rare financial terms
+        token_pattern=r'\b[A-Za-z][A-Za-z0-9_]+\b',  # Allow underscores in financial terms
+        vocabulary=vocabulary,  # Set when reopening a persisted index
+    )
+
+
+def _is_partnership_query(query: str) -> bool:
+    query_lower = query.lower()
+    return any(word in query_lower for word in ['partnership', 'strategic', 'alliance', 'collaboration', 'joint'])
+
+
+def financial_feature_weights(vocabulary: dict) -> np.ndarray:
+    """Per-feature weights: Config.FINANCIAL_BOOST for FINANCIAL_10Q_TERMS, 1.0 otherwise."""
+    feature_weights = np.ones(len(vocabulary), dtype=np.float64)
+    boosted = [vocabulary[term] for term in Config.FINANCIAL_10Q_TERMS if term in vocabulary]
+    feature_weights[boosted] = Config.FINANCIAL_BOOST
+    return feature_weights
+
+
+def top_k_positions(scores: np.ndarray, k: int, *, tiebreak: np.ndarray | None = None) -> np.ndarray:
+    """Positions of the k highest scores, best first, without sorting the whole array.
+
+    A linear-time partition finds the k-th score; only the selected k are sorted. Ties
+    (including at the k-th score) are broken by descending `tiebreak` (default: position),
+    matching a reversed argsort over the full array.
+    """
+    if tiebreak is None:
+        tiebreak = np.arange(scores.size)
+    if k <= 0 or scores.size == 0:
+        return np.zeros(0, dtype=np.intp)
+    if scores.size > k:
+        kth = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)
+        tied = tied[np.argsort(-tiebreak[tied], kind="stable")[: k - above.size]]
+        top = np.concatenate([above, tied])
+    else:
+        top = np.arange(scores.size)
+    return top[np.lexsort((-tiebreak[top], -scores[top]))]
+
+
+_NUMBER_RE = re.compile(r'\$?\d{1,3}(?:,\d{3})*')
+
+
+def compute_content_features(documents: List[Document]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Query-independent scoring features for Financial10QRetriever._enhance_scores.
+
+    Returns (static_boost, components_boost, partnership_score), one float64 entry per
+    document: the product of the boosts/penalties that apply to every query, the extra
+    factor applied to "components/breakdown" queries, and the partnership relevance score.
+    """
+    n = len(documents)
+    static_boost = np.ones(n, dtype=np.float64)
+    components_boost = np.ones(n, dtype=np.float64)
+    partnership_score = np.zeros(n, dtype=np.float64)
+
+    for i, doc in enumerate(documents):
+        content = doc.page_content
+        content_lower = content.lower()
+        boost = 1.0
+
+        # 1. CRITICAL: Boost chunks with actual financial figures
+        dollar_amounts = content.count('$')
+        parenthetical_amounts = content.count('(') + content.count(')')  # Often negative amounts like (594)
+        if dollar_amounts >= 2 or parenthetical_amounts >= 4:  # Multiple financial figures
+            boost *= 3.0  # Strong boost for data-rich chunks
+        elif dollar_amounts >= 1:
+            boost *= 2.0  # Moderate boost for chunks with some financial data
+
+        # 2. Boost chunks with specific numbers mentioned in successful examples
+        if '600' in content and ('594' in content or 'interest' in content_lower):
+            boost *= 4.0  # Maximum boost for chunks with our target data
+        elif '600' in content or '594' in content:
+            boost *= 2.5  # High boost for chunks with either target figure
+
+        # 3. Boost chunks with table-like data (multiple numbers in sequence)
+        numbers = _NUMBER_RE.findall(content)
+        if len(numbers) >= 5:  # Likely a data table
+            boost *= 2.5
+        elif len(numbers) >= 3:
+            boost *= 1.5
+
+        # 4. For "components" queries, prioritize chunks with structured data
+        empty_elements = content.count('EmptyElement')
+        components = 1.0
+        if 'income' in content_lower and 'expense' in content_lower and dollar_amounts >= 1:
+            components *= 2.0
+        # Boost chunks with line items
+        if content.count('\n') > 5 or empty_elements < dollar_amounts:
+            components *= 1.5
+        components_boost[i] = components
+
+        # 5. PENALTY: Reduce score for chunks with too many parsing artifacts
+        total_length = len(content)
+        if total_length > 0:
+            empty_ratio = empty_elements / total_length
+            if empty_ratio > 0.3:  # More than 30% parsing artifacts
+                boost *= 0.5  # Significant penalty
+            elif empty_ratio > 0.2:  # More than 20% parsing artifacts
+                boost *= 0.7  # Moderate penalty
+
+        # 6. PENALTY: Reduce score for pure header/navigation chunks
+        if ('NOTE' in content and 'INCOME' in content and 'EXPENSE' in content and
+            dollar_amounts == 0):  # Headers without data
+            boost *= 0.3  # Strong penalty for header-only chunks
+
+        # 7. Boost chunks with "interest and dividends" for our specific case
+        if 'interest and dividends' in content_lower:
+            boost *= 1.8
+        static_boost[i] = boost
+
+        # 8. CRITICAL: Partnership/strategic alliance content (used for partnership queries)
+        score = 0.0
+        if 'openai' in content_lower:
+            score += 5.0  # OpenAI is the key partnership
+        if '13 billion' in content_lower or 'funding commitments' in content_lower:
+            score += 4.0  # Specific dollar amounts
+        if 'strategic' in content_lower and ('partnership' in content_lower or 'alliance' in content_lower):
+            score += 3.0  # Direct mention of strategic partnerships
+        if any(term in content_lower for term in ['investment', 'joint venture', 'collaboration']):
+            score += 2.0
+        if 'acquisition' in content_lower or 'alliance' in content_lower:
+            score += 1.5
+        partnership_score[i] = score
+
+    return static_boost, components_boost, partnership_score
@@ -1,19 +1,41 @@
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.documents import Document
+from dataclasses import dataclass, field
+from typing import List
 import logging
 import time
 
+
+@dataclass
+class ToolResult:
+    """Outcome of one tool run: the answer, the exact context the LLM saw, per-stage
+    timings in seconds ("retrieval", "generation", "total") and the tool it was routed to."""
+
+    answer: str
+    context: List[Document] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    route: str | None = None
+
+
 class SimpleTool:
     def __init__(self, retriever: BaseRetriever, llm: BaseLanguageModel):
         self.retriever = retriever
         self.llm = llm
         self.logger = logging.getLogger(self.__class__.__name__)
-    
+        # Route name this tool is registered under (set by DocumentToolRegistry)
+        self.route: str | None = None
+
     def execute(self, query: str) -> str:
+        return self.run(query).answer
+
+    def run(self, query: str) -> ToolResult:
         # Simple: retrieve → generate → return
         self.logger.info(f"Executing tool for query: {query}")
+        start = time.perf_counter()
         context = self.retriever.get_relevant_documents(query)
-        
+        retrieved = time.perf_counter()
+
         # ENHANCED LOGGING: Log all retrieved chunks with detailed metadata
         self.logger.info(f"Retrieved {len(context)} chunks for query: '{query}'")
         for i, doc in enumerate(context):
@@ -22,18 +44,22 @@ class SimpleTool:
             self.logger.info(f"CHUNK {i+1}/{len(context)}: {metadata_info}")
             self.logger.info(f"CONTENT_PREVIEW: {chunk_preview}...")
             self.logger.debug(f"FULL_CONTENT_{i+1}: {doc.page_content}")
-        
+
         context_text = "\n\n".join([doc.page_content for doc in context])
         prompt = f"Context: {context_text}\n\nQuestion: {query}"
-        start = time.perf_counter()
+        generation_start = time.perf_counter()
         try:
             response = self.llm.invoke(prompt)
         except Exception as e:
             self.logger.exception(f"LLM invocation failed with error: {e}")
             raise RuntimeError(f"LLM invocation failed: {str(e)}") from e
         finally:
-            self.logger.debug(f"LLM invocation took {time.perf_counter() - start:.2f}s")
-        
+            self.logger.debug(f"LLM invocation took {time.perf_counter() - generation_start:.2f}s")
+        end = time.perf_counter()
+        timings = {"retrieval": retrieved - start, "generation": end - generation_start, "total": end - start}
+        return ToolResult(self._response_text(response), context, timings, self.route)
+
+    def _response_text(self, response) -> str:
         # Handle different response types from various LLM implementations
         try:
             if hasattr(response, "content"):
@@ -44,4 +70,4 @@ class SimpleTool:
                 return str(response)
         except Exception as e:
             self.logger.warning(f"Failed to extract response content: {e}")
-            return str(response)
\ No newline at end of file
+            return str(response)
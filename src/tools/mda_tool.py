@@ -7,62 +7,63 @@ os.environ["CHROMA_DISABLE_TELEMETRY"] = "True"
 from .base import SimpleTool
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.language_models import BaseLanguageModel
+from ..config import Config
 from ..retrieval.dense_retriever import get_dense_retriever
-from ..retrieval.tfidf_retriever import Financial10QRetriever
-from ..retrieval.ensemble_setup import create_ensemble_retriever
-from ..processing.chunker import chunk_document, get_elements_in_section
+from ..retrieval.ensemble_setup import create_ensemble_retriever, create_sparse_retriever
+from ..processing.section_index import SectionIndex
 import logging
 
 class MDATool(SimpleTool):
-    def __init__(self, llm: BaseLanguageModel, elements: list):
+    def __init__(
+        self,
+        llm: BaseLanguageModel,
+        elements: list,
+        *,
+        section_index: SectionIndex | None = None,
+        retriever: BaseRetriever | None = None,
+    ):
+        # A prebuilt section retriever (see DocumentToolRegistry) skips re-chunking and re-indexing
+        if retriever is None:
+            retriever = self.build_retriever(elements, section_index=section_index)
+        super().__init__(retriever, llm)
+
+    @classmethod
+    def build_retriever(cls, elements: list, *, section_index: SectionIndex | None = None) -> BaseRetriever:
+        """Build the dense + sparse ensemble over this tool's 10-Q section."""
         logger = logging.getLogger("tools.mda")
+        section_index = section_index or SectionIndex(elements)
 
         # Try structured approach first
-        mda_elements = get_elements_in_section(elements, section_identifier="part1item2")
+        mda_elements = section_index.elements_in("part1item2")
 
         # Check if we got meaningful content
         if mda_elements:
-            mda_chunks = chunk_document(mda_elements)
+            mda_chunks = section_index.chunks_in("part1item2")
             total_content_length = sum(len(chunk.page_content.strip()) for chunk in mda_chunks)
             logger.info(f"MDATool structured approach: {len(mda_chunks)} chunks, {total_content_length} total characters")
 
             # If content is too minimal, fall back to keyword filtering
             if total_content_length < 100:
                 logger.info("Structured content too minimal, falling back to keyword-based filtering")
-                mda_elements = self._filter_by_mda_keywords(elements)
+                mda_elements = cls._filter_by_mda_keywords(section_index)
+                mda_chunks = section_index.chunks_matching(Config.MDA_FILTER_KEYWORDS)
         else:
             logger.info("No part1item2 section found, using keyword-based filtering")
-            mda_elements = self._filter_by_mda_keywords(elements)
+            mda_elements = cls._filter_by_mda_keywords(section_index)
+            mda_chunks = section_index.chunks_matching(Config.MDA_FILTER_KEYWORDS)
 
         # If still no good content, use the full document approach like Summary
         if not mda_elements:
             logger.warning("No MD&A content found, using full document retrieval like Summary tool")
-            mda_chunks = chunk_document(elements)  # Use all elements
-        else:
-            mda_chunks = chunk_document(mda_elements)
+            mda_chunks = section_index.all_chunks()  # Use all elements
 
         logger.info(f"MDATool final initialization: {len(mda_chunks)} chunks")
 
         dense_retriever = get_dense_retriever(mda_chunks)
-        sparse_retriever = Financial10QRetriever(mda_chunks)
-        retriever = create_ensemble_retriever(dense_retriever, sparse_retriever)
-        super().__init__(retriever, llm)
-
-    def _filter_by_mda_keywords(self, elements):
-        """Filter elements that likely contain MD&A content using keywords."""
-        mda_keywords = [
-            "management", "discussion", "analysis", "md&a", "results of operations",
-            "financial condition", "liquidity", "capital resources", "outlook",
-            "business environment", "market conditions", "financial performance",
-            "executive overview", "consolidated revenues", "operating income",
-            "three months ended", "revenue", "expenses", "profitability"
-        ]
-
-        filtered_elements = []
-        for element in elements:
-            text_content = str(element).lower()
-            # Require meaningful content length and keyword match
-            if len(text_content.strip()) > 50 and any(keyword in text_content for keyword in mda_keywords):
-                filtered_elements.append(element)
+        sparse_retriever = create_sparse_retriever(mda_chunks)
+        return create_ensemble_retriever(dense_retriever, sparse_retriever)
 
-        return filtered_elements
\ No newline at end of file
+    @staticmethod
+    def _filter_by_mda_keywords(section_index: SectionIndex):
+        """Filter elements that likely contain MD&A content using precomputed keyword postings."""
+        return section_index.elements_matching(Config.MDA_FILTER_KEYWORDS)
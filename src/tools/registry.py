@@ -0,0 +1,107 @@
+from .base import SimpleTool
+from .general_tool import GeneralTool
+from .table_tool import TableTool
+from .mda_tool import MDATool
+from .risk_tool import RiskTool
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.language_models import BaseLanguageModel
+from ..llm.langchain_llm import LangchainLLM
+from ..processing.section_index import SectionIndex
+import logging
+import threading
+
+
+class DocumentToolRegistry:
+    """Document-scoped tool registry built once when a file is processed.
+
+    The MD&A and risk tools each need their own section retriever (chunking, a Chroma
+    collection and a TF-IDF matrix). The registry builds those once per document and
+    hands out tools lazily: a tool is constructed the first time it is routed to and
+    reused for every later call with the same LLM and retriever. The SectionIndex (and
+    with it the elements) is only touched once a section or table tool needs it, so with
+    `eager=False` and lazily parsed elements the general tool never triggers parsing.
+    """
+
+    TOOL_NAMES = ("general_tool", "table_tool", "mda_tool", "risk_tool")
+    SECTION_TOOLS = {"mda_tool": MDATool, "risk_tool": RiskTool}
+
+    def __init__(
+        self,
+        elements: list,
+        retriever: BaseRetriever,
+        *,
+        section_index: SectionIndex | None = None,
+        eager: bool = True,
+    ):
+        self.elements = elements
+        self.retriever = retriever
+        self._section_index = section_index
+        self.logger = logging.getLogger("tools.registry")
+        self._lock = threading.RLock()
+        self._section_retrievers: dict[str, BaseRetriever] = {}
+        # name -> (llm, retriever, tool); identity of llm/retriever decides reuse
+        self._tools: dict[str, tuple[BaseLanguageModel, BaseRetriever, SimpleTool]] = {}
+        if eager:
+            for name in self.SECTION_TOOLS:
+                self.section_retriever(name)
+
+    @property
+    def section_index(self) -> SectionIndex:
+        """The document's SectionIndex, built on first use (elements may be parsed lazily)."""
+        with self._lock:
+            if self._section_index is None:
+                self._section_index = SectionIndex(self.elements)
+            return self._section_index
+
+    def section_retriever(self, name: str) -> BaseRetriever:
+        """Return the cached section retriever for mda_tool/risk_tool, building it once."""
+        with self._lock:
+            if name not in self._section_retrievers:
+                tool_cls = self.SECTION_TOOLS[name]
+                self.logger.info(f"Building section retriever for {name}")
+                self._section_retrievers[name] = tool_cls.build_retriever(
+                    self.elements, section_index=self.section_index
+                )
+            return self._section_retrievers[name]
+
+    def set_retriever(self, retriever: BaseRetriever) -> None:
+        """Swap the document-wide retriever (e.g. after graph enhancement is enabled)."""
+        with self._lock:
+            self.retriever = retriever
+
+    def get_tool(
+        self,
+        name: str,
+        llm: BaseLanguageModel,
+        *,
+        retriever: BaseRetriever | None = None,
+    ) -> SimpleTool:
+        """Return the tool registered under name, constructing it on first use.
+
+        `retriever` overrides the document-wide retriever for the general and table
+        tools (e.g. a reranking wrapper); section tools always use their own retriever.
+        """
+        if name not in self.TOOL_NAMES:
+            raise KeyError(f"Unknown tool: {name}")
+        with self._lock:
+            if name in self.SECTION_TOOLS:
+                bound_retriever = self.section_retriever(name)
+            else:
+                bound_retriever = retriever or self.retriever
+
+            cached = self._tools.get(name)
+            if cached and cached[0] is llm and cached[1] is bound_retriever:
+                return cached[2]
+
+            tool = self._build_tool(name, llm, bound_retriever)
+            tool.route = name
+            self._tools[name] = (llm, bound_retriever, tool)
+            self.logger.debug(f"Constructed {name}")
+            return tool
+
+    def _build_tool(self, name: str, llm: BaseLanguageModel, retriever: BaseRetriever) -> SimpleTool:
+        if name == "general_tool":
+            return GeneralTool(retriever, llm)
+        if name == "table_tool":
+            return TableTool(retriever, LangchainLLM(llm), self.elements)
+        return self.SECTION_TOOLS[name](llm, self.elements, retriever=retriever)
@@ -1,6 +1,8 @@
-from .base import SimpleTool
+from .base import SimpleTool, ToolResult
+from ..processing.chunker import extract_element_text, extract_tabular_patterns
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.documents import Document
 from llama_index.core.program import LLMTextCompletionProgram
 from llama_index.core.bridge.pydantic import BaseModel, Field
 from llama_index.core.output_parsers import PydanticOutputParser
@@ -8,6 +10,7 @@ from llama_index.core.query_engine import PandasQueryEngine
 from sec_parser.semantic_elements.table_element.table_element import TableElement
 import pandas as pd
 import re
+import time
 from typing import Optional
 
 class TableAnswer(BaseModel):
@@ -46,21 +49,33 @@ class AdvancedTableTool(SimpleTool):
             verbose=True,
         )
 
-    def execute(self, query: str) -> str:
+    def run(self, query: str) -> ToolResult:
         self.logger.info(f"Executing advanced table tool for query: {query}")
+        start = time.perf_counter()
 
         # Step 1: Check for actual TableElement instances
         table_elements = [el for el in self.elements if isinstance(el, TableElement)]
 
         if table_elements:
             self.logger.info(f"Found {len(table_elements)} TableElement instances")
-            return self._process_table_elements(table_elements, query)
-
-        # Step 2: Use enhanced retrieval for financial/tabular content
-        self.logger.info("No TableElement found, using enhanced retrieval for financial data")
-        return self._process_with_enhanced_retrieval(query)
-
-    def _process_table_elements(self, table_elements: list, query: str) -> str:
+            context = [
+                Document(page_content=extract_element_text(table), metadata={"element_type": "TableElement"})
+                for table in table_elements
+            ]
+            retrieved = time.perf_counter()
+            answer = self._process_table_elements(table_elements, query, context)
+        else:
+            # Step 2: Use enhanced retrieval for financial/tabular content
+            self.logger.info("No TableElement found, using enhanced retrieval for financial data")
+            context_docs = self.retriever.get_relevant_documents(query)
+            retrieved = time.perf_counter()
+            answer, context = self._process_with_enhanced_retrieval(query, context_docs)
+
+        end = time.perf_counter()
+        timings = {"retrieval": retrieved - start, "generation": end - retrieved, "total": end - start}
+        return ToolResult(answer, context, timings, self.route)
+
+    def _process_table_elements(self, table_elements: list, query: str, table_context: list[Document]) -> str:
         """Process actual table elements using pandas and LlamaIndex."""
         try:
             # Convert table elements to pandas DataFrames
@@ -81,23 +96,22 @@ class AdvancedTableTool(SimpleTool):
             self.logger.error(f"Table element processing failed: {e}")
 
         # Fallback to text-based processing
-        table_text = "\n\n".join([str(table) for table in table_elements])
+        table_text = "\n\n".join(doc.page_content for doc in table_context)
         response = self.program(context_str=table_text, query_str=query)
         return f"{response.answer}\n\nConfidence: {response.confidence}\nSource: {response.data_source}"
 
-    def _process_with_enhanced_retrieval(self, query: str) -> str:
-        """Enhanced retrieval focusing on numerical and tabular content."""
-        context_docs = self.retriever.get_relevant_documents(query)
-
+    def _process_with_enhanced_retrieval(self, query: str, context_docs: list[Document]) -> tuple[str, list[Document]]:
+        """Enhanced retrieval focusing on numerical and tabular content; returns (answer, docs used)."""
         if not context_docs:
-            return "No relevant financial data found for this query."
+            return "No relevant financial data found for this query.", []
 
         # Enhanced filtering for financial/tabular content
-        financial_context = self._filter_financial_content(context_docs)
+        financial_docs = self._filter_financial_content(context_docs)
 
-        if not financial_context:
+        if not financial_docs:
             # Fallback to all retrieved content
-            financial_context = [doc.page_content for doc in context_docs]
+            financial_docs = list(context_docs)
+        financial_context = [doc.page_content for doc in financial_docs]
 
         # Try to extract structured data
         structured_data = self._extract_structured_data(financial_context, query)
@@ -108,26 +122,24 @@ class AdvancedTableTool(SimpleTool):
                 df = pd.DataFrame(structured_data)
                 query_engine = PandasQueryEngine(df=df, verbose=True)
                 response = query_engine.query(query)
-                return str(response)
+                return str(response), financial_docs
             except Exception as e:
                 self.logger.debug(f"Pandas processing failed: {e}")
 
         # Standard LLM processing with enhanced context
         combined_context = "\n\n".join(financial_context)
         response = self.program(context_str=combined_context, query_str=query)
-        return f"{response.answer}\n\nConfidence: {response.confidence}\nSource: {response.data_source}"
+        return f"{response.answer}\n\nConfidence: {response.confidence}\nSource: {response.data_source}", financial_docs
 
-    def _filter_financial_content(self, docs) -> list[str]:
+    def _filter_financial_content(self, docs) -> list[Document]:
         """Filter documents for financial/numerical content."""
-        from ..processing.chunker import extract_tabular_patterns
-
         financial_content = []
         for doc in docs:
             content = doc.page_content
 
             # Priority 1: Content with tabular patterns
             if extract_tabular_patterns(content):
-                financial_content.append(content)
+                financial_content.append(doc)
                 continue
 
             # Priority 2: Content with financial keywords and numbers
@@ -142,7 +154,7 @@ class AdvancedTableTool(SimpleTool):
             content_lower = content.lower()
             if (any(indicator in content_lower for indicator in financial_indicators) and
                 re.search(r'\d+', content)):
-                financial_content.append(content)
+                financial_content.append(doc)
 
         return financial_content
 
@@ -10,18 +10,16 @@ os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
 from ..logging_setup import initialize_logging
 from ..tools.router import route_query
-from ..tools.general_tool import GeneralTool
-from ..tools.table_tool import TableTool
-from ..tools.mda_tool import MDATool
-from ..tools.risk_tool import RiskTool
-from ..retrieval.dense_retriever import get_dense_retriever
-from ..retrieval.tfidf_retriever import Financial10QRetriever
-from ..retrieval.ensemble_setup import create_ensemble_retriever, create_graph_enhanced_retriever
-from ..llm.langchain_llm import LangchainLLM
+from ..tools.registry import DocumentToolRegistry
+from ..retrieval.dense_retriever import clear_dense_indexes, get_dense_retriever
+from ..retrieval.ensemble_setup import create_ensemble_retriever, create_graph_enhanced_retriever, create_sparse_retriever
+from ..retrieval.fingerprint import documents_fingerprint
+from ..retrieval.result_cache import CachedRetriever, get_retrieval_cache
 from ..processing.pdf_to_html import convert_pdf_to_html
-from ..processing.pdf_parser import load_html
+from ..processing.pdf_parser import LazyElements, parse_html
 from ..processing.chunker import chunk_document
-from ..graph.neo4j_graph import Neo4jGraph
+from ..processing.ingestion_cache import IngestionCache, hash_file
+from ..graph.backend import create_graph_backend
 from ..config import Config
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
@@ -36,6 +34,7 @@ logger = logging.getLogger("ui")
 BASE_DIR = Path(__file__).resolve().parents[2]
 UPLOAD_DIR = BASE_DIR / "data" / "uploads"
 CHROMA_DIRS = [BASE_DIR / "chroma_db", BASE_DIR / "chroma", BASE_DIR / ".chroma"]
+ingestion_cache = IngestionCache(BASE_DIR / Config.INGESTION_CACHE_DIR)
 
 
 def evaluate_with_deepeval(question, answer, context_docs, ground_truth, model_name, provider, api_key):
@@ -62,6 +61,11 @@ def evaluate_with_deepeval(question, answer, context_docs, ground_truth, model_n
 elements = []
 chunks = []
 ensemble_retriever = None
+reranked_retriever = None
+# reranker flag -> CachedRetriever over the current answer retriever
+answer_retrievers = {}
+chunks_fingerprint = None
+tool_registry = None
 neo4j_graph_instance = None
 last_doc_title = None
 global_google_api_key = ""
@@ -74,21 +78,58 @@ last_answer = ""
 last_context = []
 last_question = ""
 
+# LLM clients keyed by (provider, api key); reusing them lets the tool registry reuse tools
+_llm_cache = {}
+
 def get_configured_llm():
     """Get configured LLM based on available API keys."""
     # Prefer Google Gemini if available
     if global_google_api_key:
         os.environ["GOOGLE_API_KEY"] = global_google_api_key
-        return ChatGoogleGenerativeAI(model="gemini-2.5-flash-lite"), "google"
+        cache_key = ("google", global_google_api_key)
+        if cache_key not in _llm_cache:
+            _llm_cache[cache_key] = ChatGoogleGenerativeAI(model="gemini-2.5-flash-lite")
+        return _llm_cache[cache_key], "google"
     
     # Fallback to OpenAI if available
     elif global_openai_api_key:
         os.environ["OPENAI_API_KEY"] = global_openai_api_key
-        return ChatOpenAI(model="gpt-4o-mini", temperature=0.1), "openai"
+        cache_key = ("openai", global_openai_api_key)
+        if cache_key not in _llm_cache:
+            _llm_cache[cache_key] = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+        return _llm_cache[cache_key], "openai"
     
     else:
         raise ValueError("No API keys configured. Please set Google or OpenAI API key.")
 
+def _reranked_or_base_retriever(use_reranker):
+    """Return the document retriever, wrapped with the Cohere reranker when requested."""
+    global reranked_retriever
+    if not use_reranker:
+        return ensemble_retriever
+    logger.debug("Enabling Cohere reranker")
+    if not global_cohere_api_key:
+        logger.warning("Reranker requested but Cohere API key not configured")
+        return ensemble_retriever
+    if reranked_retriever is None or reranked_retriever.base_retriever is not ensemble_retriever:
+        os.environ["COHERE_API_KEY"] = global_cohere_api_key
+        reranker = CohereRerank(model="rerank-english-v3.0")
+        reranked_retriever = ContextualCompressionRetriever(
+            base_compressor=reranker, base_retriever=ensemble_retriever
+        )
+    return reranked_retriever
+
+def get_answer_retriever(use_reranker):
+    """Return the answer retriever (optionally reranked) behind the shared retrieval cache."""
+    base = _reranked_or_base_retriever(use_reranker)
+    reranked = base is not ensemble_retriever
+    cached = answer_retrievers.get(reranked)
+    # Reuse the wrapper while its base is current so the tool registry keeps its tools
+    if cached is None or cached.base_retriever is not base or cached.fingerprint != chunks_fingerprint:
+        cached = CachedRetriever(base, fingerprint=chunks_fingerprint, reranker=reranked)
+        answer_retrievers[reranked] = cached
+    return cached
+
 def set_all_api_keys(google_key, openai_key, cohere_key, neo4j_uri, neo4j_user, neo4j_password):
     """Centralized API key configuration for all services."""
     global global_google_api_key, global_openai_api_key, global_cohere_api_key
@@ -131,12 +172,19 @@ def set_all_api_keys(google_key, openai_key, cohere_key, neo4j_uri, neo4j_user,
 
 def clear_global_state():
     """Clear global state and close any active resources."""
-    global elements, chunks, ensemble_retriever, neo4j_graph_instance, last_doc_title
+    global elements, chunks, ensemble_retriever, reranked_retriever, tool_registry
+    global neo4j_graph_instance, last_doc_title, chunks_fingerprint
     global global_google_api_key, global_openai_api_key, global_cohere_api_key
     global global_neo4j_uri, global_neo4j_user, global_neo4j_password, last_answer, last_context, last_question
     elements = []
     chunks = []
     ensemble_retriever = None
+    reranked_retriever = None
+    tool_registry = None
+    _llm_cache.clear()
+    answer_retrievers.clear()
+    chunks_fingerprint = None
+    get_retrieval_cache().invalidate()
     last_doc_title = None
     global_google_api_key = ""
     global_openai_api_key = ""
@@ -151,7 +199,7 @@ def clear_global_state():
         try:
             neo4j_graph_instance.close()
         except Exception:
-            logger.warning("Failed to close Neo4j graph instance during cleanup")
+            logger.warning("Failed to close graph instance during cleanup")
         neo4j_graph_instance = None
         
     # Clear any ChromaDB persistence directories for single-document mode
@@ -160,6 +208,8 @@ def clear_global_state():
             if chroma_dir.exists():
                 shutil.rmtree(chroma_dir)
                 logger.info(f"Cleared ChromaDB directory: {chroma_dir}")
+        # Fingerprint collections under Config.CHROMA_PERSIST_DIR and the embedding cache
+        clear_dense_indexes()
     except Exception as e:
         logger.warning(f"Error clearing ChromaDB directories: {e}")
         
@@ -167,7 +217,7 @@ def clear_global_state():
 
 def process_file_with_progress(file):
     """Enhanced file processing with progress tracking."""
-    global elements, chunks, ensemble_retriever, last_doc_title
+    global elements, chunks, ensemble_retriever, tool_registry, last_doc_title, chunks_fingerprint
     logger.info("process_file called")
     
     if file is not None:
@@ -190,29 +240,52 @@ def process_file_with_progress(file):
 
         logger.info(f"Copy complete to {upload_path}")
 
-        yield "🔄 **Step 3/5:** Converting PDF to HTML..."
-        # Convert PDF to HTML
-        html_content = convert_pdf_to_html(str(upload_path))
+        use_cache = getattr(Config, "ENABLE_INGESTION_CACHE", False)
+        pdf_hash = hash_file(upload_path) if use_cache else None
         html_path = upload_path.with_suffix(upload_path.suffix + ".html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        time.sleep(1)
-
-        logger.info(f"PDF converted to HTML at {html_path}")
+        # Stash title for graph scoping and isolation
+        last_doc_title = os.path.basename(str(html_path))
 
-        yield "📄 **Step 4/5:** Parsing document elements..."
-        # Parse the document
-        elements = load_html(html_path)
+        html_content = ingestion_cache.load_html(pdf_hash) if use_cache else None
+        html_cached = html_content is not None
+        if html_cached:
+            yield "♻️ **Step 3/5:** Reusing cached conversion for this PDF..."
+            logger.info(f"Loaded cached HTML for {upload_path.name}")
+        else:
+            yield "🔄 **Step 3/5:** Converting PDF to HTML..."
+            # Convert PDF to HTML
+            html_content = convert_pdf_to_html(str(upload_path))
+            if use_cache:
+                ingestion_cache.save_html(pdf_hash, html_content)
+            time.sleep(1)
+        if getattr(Config, "WRITE_HTML_DEBUG_ARTIFACT", False):
+            with open(html_path, "w", encoding="utf-8") as f:
+                f.write(html_content)
+            logger.info(f"Wrote HTML debug artifact to {html_path}")
+
+        logger.info(f"PDF converted to HTML ({len(html_content)} chars)")
+
+        if html_cached:
+            # sec-parser only runs if a chunk cache miss or a table/section tool reads elements
+            yield "📄 **Step 4/5:** Deferring element parsing for the cached document..."
+            elements = LazyElements(html_content)
+        else:
+            yield "📄 **Step 4/5:** Parsing document elements..."
+            # Parse the document straight from memory
+            elements = parse_html(html_content)
+            logger.info(f"Parsed {len(elements)} elements")
+        del html_content
         time.sleep(0.5)
 
-        logger.info(f"Parsed {len(elements)} elements")
-
         yield "✂️ **Step 5/5:** Creating document chunks..."
-        # Stash title for graph scoping and isolation
-        last_doc_title = os.path.basename(str(html_path))
-        
         # Chunk the document with title for isolation
-        chunks = chunk_document(elements, document_title=last_doc_title)
+        cached_chunks = ingestion_cache.load_chunks(pdf_hash, document_title=last_doc_title) if use_cache else None
+        if cached_chunks is not None:
+            chunks = cached_chunks
+        else:
+            chunks = chunk_document(elements, document_title=last_doc_title)
+            if use_cache:
+                ingestion_cache.save_chunks(pdf_hash, chunks, document_title=last_doc_title)
         time.sleep(0.5)
 
         logger.info(f"Created {len(chunks)} chunks for document: {last_doc_title}")
@@ -220,18 +293,33 @@ def process_file_with_progress(file):
         yield "🔗 **Building ensemble retrievers...**"
         # Create retrievers with graph enhancement per specification
         dense_retriever = get_dense_retriever(chunks)
-        sparse_retriever = Financial10QRetriever(chunks)
+        sparse_retriever = create_sparse_retriever(chunks)
         # Use graph-enhanced retriever (Dense 70% + TF-IDF 30% + Graph 15%)
         ensemble_retriever = create_graph_enhanced_retriever(dense_retriever, sparse_retriever)
         logger.info("Graph-enhanced ensemble retriever created per specification")
+        # Results cached for an earlier processing of this document are stale now
+        chunks_fingerprint = documents_fingerprint(chunks)
+        get_retrieval_cache().invalidate(chunks_fingerprint)
         time.sleep(0.5)
 
-        yield f"✅ **File processed successfully!**\n\n📊 **Statistics:**\n- Elements parsed: {len(elements)}\n- Chunks created: {len(chunks)}\n- Retriever: Graph-enhanced ensemble ready"
+        yield "🧰 **Preparing section tools...**"
+        # Section retrievers (MD&A, Risk) are built once and reused by every question: here
+        # for a fresh parse, on first use when the elements of a cached document are deferred
+        deferred = isinstance(elements, LazyElements) and not elements.parsed
+        tool_registry = DocumentToolRegistry(elements, ensemble_retriever, eager=not deferred)
+        logger.info("Document tool registry ready")
+
+        elements_status = "deferred (cached document)" if deferred else len(elements)
+        yield f"✅ **File processed successfully!**\n\n📊 **Statistics:**\n- Elements parsed: {elements_status}\n- Chunks created: {len(chunks)}\n- Retriever: Graph-enhanced ensemble ready"
     else:
         yield "⚠️ Please upload a file first."
 
 def add_to_graph_with_progress():
-    """Enhanced graph processing with progress tracking using global Neo4j configuration."""
+    """Enhanced graph processing with progress tracking.
+
+    Uses Neo4j with the global configuration, or the embedded in-memory graph when Neo4j
+    is not configured (see Config.GRAPH_BACKEND).
+    """
     global neo4j_graph_instance, ensemble_retriever, elements, chunks, last_doc_title
     logger.info("add_to_graph called")
     
@@ -239,12 +327,13 @@ def add_to_graph_with_progress():
         yield "⚠️ Please process a file first."
         return
     
-    if not (global_neo4j_uri and global_neo4j_user and global_neo4j_password):
+    neo4j_configured = bool(global_neo4j_uri and global_neo4j_user and global_neo4j_password)
+    if getattr(Config, "GRAPH_BACKEND", "auto") == "neo4j" and not neo4j_configured:
         yield "⚠️ **Neo4j configuration missing.** Please configure Neo4j settings in the API Configuration popup."
         return
     
     try:
-        yield "🔗 **Step 1/4:** Connecting to Neo4j..."
+        yield "🔗 **Step 1/4:** Connecting to graph backend..."
         time.sleep(0.5)
         
         # Ensure chunks exist (recompute if needed)
@@ -255,9 +344,11 @@ def add_to_graph_with_progress():
 
         yield "📊 **Step 3/4:** Processing file to graph database..."
         # Create and populate graph from CHUNKS to guarantee chunk_id parity
-        neo4j_graph_instance = Neo4jGraph(global_neo4j_uri, global_neo4j_user, global_neo4j_password)
+        if neo4j_graph_instance:
+            neo4j_graph_instance.close()
+        neo4j_graph_instance = create_graph_backend(global_neo4j_uri, global_neo4j_user, global_neo4j_password)
         doc_title = last_doc_title or 'ProcessedDocument'
-        neo4j_graph_instance.add_document_structure(chunks, doc_title=doc_title)
+        graph_stats = neo4j_graph_instance.add_document_structure(chunks, doc_title=doc_title)
         time.sleep(1)
         
         yield "🔄 **Step 4/4:** Updating retrievers with graph enhancement..."
@@ -265,14 +356,24 @@ def add_to_graph_with_progress():
         if ensemble_retriever:
             # Get base retrievers and recreate with graph
             dense_retriever = get_dense_retriever(chunks)
-            sparse_retriever = Financial10QRetriever(chunks)
+            sparse_retriever = create_sparse_retriever(chunks)
             ensemble_retriever = create_graph_enhanced_retriever(
                 dense_retriever, sparse_retriever, neo4j_graph_instance
             )
+            if tool_registry:
+                tool_registry.set_retriever(ensemble_retriever)
+            get_retrieval_cache().invalidate(chunks_fingerprint)
             logger.info("Retriever updated with graph integration")
         time.sleep(0.5)
         
-        yield "✅ **Document processed to graph database successfully!**\n\n🔗 Graph database is now connected and retrieval system enhanced with graph relationships."
+        schema = neo4j_graph_instance.schema_status
+        schema_online = sum(1 for state in schema.values() if state == "ONLINE")
+        if getattr(Config, "GRAPH_MULTI_DOCUMENT", False):
+            graph_mode = "unchanged, kept as stored" if graph_stats.get("skipped") else "replaced this document only"
+        else:
+            graph_mode = "single-document graph"
+        schema_info = f"Schema: {schema_online}/{len(schema)} indexes online · " if schema else ""
+        yield f"✅ **Document processed to graph database successfully!**\n\n🔗 {neo4j_graph_instance.name} graph is now connected and retrieval system enhanced with graph relationships.\n\n🗂️ {schema_info}'{doc_title}': {graph_mode}"
         
     except Exception as e:
         logger.error(f"Graph processing failed: {e}")
@@ -292,56 +393,34 @@ def answer_question_with_progress(question, use_reranker):
         # Get configured LLM using centralized configuration
         try:
             langchain_llm, llm_provider = get_configured_llm()
-            llama_llm = LangchainLLM(langchain_llm)
             logger.info(f"Using LLM provider: {llm_provider}")
         except ValueError as e:
             return f"❌ **Configuration Error:** {e}"
 
         yield "🔍 **Step 2/5:** Setting up retrievers..."
-        retriever = ensemble_retriever
-        if use_reranker:
-            logger.debug("Enabling Cohere reranker")
-            if global_cohere_api_key:
-                os.environ["COHERE_API_KEY"] = global_cohere_api_key
-                reranker = CohereRerank(model="rerank-english-v3.0")
-                retriever = ContextualCompressionRetriever(
-                    base_compressor=reranker, base_retriever=ensemble_retriever
-                )
-            else:
-                logger.warning("Reranker requested but Cohere API key not configured")
-                retriever = ensemble_retriever
+        retriever = get_answer_retriever(use_reranker)
         time.sleep(0.3)
 
-        yield "🛠️ **Step 3/5:** Initializing tools..."
-        # Initialize tools
-        logger.debug("Initializing tools")
-        general_tool = GeneralTool(retriever, langchain_llm)
-        table_tool = TableTool(retriever, llama_llm, elements)
-        mda_tool = MDATool(langchain_llm, elements)
-        risk_tool = RiskTool(langchain_llm, elements)
-
-        tools = {
-            "general_tool": general_tool,
-            "table_tool": table_tool,
-            "mda_tool": mda_tool,
-            "risk_tool": risk_tool,
-        }
-        time.sleep(0.3)
-
-        yield "🎯 **Step 4/5:** Routing question..."
+        yield "🎯 **Step 3/5:** Routing question..."
         tool_name = route_query(question)
-        tool = tools[tool_name]
         logger.info(f"ROUTING: Question '{question}' routed to tool: {tool_name}")
         time.sleep(0.2)
+
+        yield "🛠️ **Step 4/5:** Preparing tool..."
+        # Only the routed tool is needed; the registry builds it on first use and reuses it
+        tool = tool_registry.get_tool(tool_name, langchain_llm, retriever=retriever)
+        time.sleep(0.2)
         
         yield "💭 **Step 5/5:** Generating answer..."
-        # Execute tool and get answer
-        answer = tool.execute(question)
+        # Execute tool; the result carries the exact context the answer was generated from
+        result = tool.run(question)
+        answer = result.answer
+        logger.info(f"Tool timings ({result.route}): " + ", ".join(f"{k}={v:.2f}s" for k, v in result.timings.items()))
         
         # Store question, answer and context for evaluation
         last_question = question
         last_answer = answer
-        last_context = retriever.get_relevant_documents(question)
+        last_context = result.context
         
         yield f"**🎯 Routed to:** {tool_name.replace('_', ' ').title()}\n**🤖 LLM Provider:** {llm_provider.title()}\n\n**📝 Answer:**\n\n{answer}"
         
@@ -362,16 +441,15 @@ def generate_summary_with_progress():
         # Get configured LLM using centralized configuration
         try:
             langchain_llm, llm_provider = get_configured_llm()
-            llama_llm = LangchainLLM(langchain_llm)
             logger.info(f"Using LLM provider for summary: {llm_provider}")
         except ValueError as e:
             return f"❌ **Configuration Error:** {e}"
 
-        # Use specialized tools instead of raw text processing
-        mda_tool = MDATool(langchain_llm, elements)
-        risk_tool = RiskTool(langchain_llm, elements)
-        table_tool = TableTool(ensemble_retriever, llama_llm, elements)
-        general_tool = GeneralTool(ensemble_retriever, langchain_llm)
+        # Use specialized tools instead of raw text processing (reused from the document registry)
+        mda_tool = tool_registry.get_tool("mda_tool", langchain_llm)
+        risk_tool = tool_registry.get_tool("risk_tool", langchain_llm)
+        table_tool = tool_registry.get_tool("table_tool", langchain_llm)
+        general_tool = tool_registry.get_tool("general_tool", langchain_llm)
 
         logger.info("Starting comprehensive 10-Q summarization with specialized tools")
         time.sleep(0.5)
@@ -472,7 +550,6 @@ def query_tables_with_progress(question):
         # Get configured LLM using centralized configuration
         try:
             langchain_llm, llm_provider = get_configured_llm()
-            llama_llm = LangchainLLM(langchain_llm)
             logger.info(f"Using LLM provider for table analysis: {llm_provider}")
         except ValueError as e:
             yield f"❌ **Configuration Error:** {e}"
@@ -481,7 +558,7 @@ def query_tables_with_progress(question):
         
         yield "📊 **Step 2/4:** Analyzing financial tables..."
         # Force routing to table tool
-        table_tool = TableTool(ensemble_retriever, llama_llm, elements)
+        table_tool = tool_registry.get_tool("table_tool", langchain_llm)
         time.sleep(0.8)
         
         yield "💭 **Step 3/4:** Generating insights..."
@@ -513,8 +590,8 @@ def financial_analysis_with_progress():
             return
 
         # Use specialized tools for analysis with improved fallback
-        mda_tool = MDATool(langchain_llm, elements)
-        risk_tool = RiskTool(langchain_llm, elements)
+        mda_tool = tool_registry.get_tool("mda_tool", langchain_llm)
+        risk_tool = tool_registry.get_tool("risk_tool", langchain_llm)
 
         logger.info("Starting specialized financial analysis with improved tools")
         time.sleep(0.5)
@@ -775,6 +852,7 @@ def update_weights_enhanced(dense_weight, tfidf_weight, graph_weight):
         Config.DENSE_WEIGHT = dense_weight
         Config.TFIDF_WEIGHT = tfidf_weight  
         Config.GRAPH_ENHANCEMENT_WEIGHT = graph_weight
+        get_retrieval_cache().invalidate()
         
         logger.info(f"Weights updated: Dense={dense_weight}, TF-IDF={tfidf_weight}, Graph={graph_weight}")
         
@@ -805,6 +883,7 @@ def get_enhanced_system_info():
         # System metrics
         cpu_percent = psutil.cpu_percent(interval=1)
         memory = psutil.virtual_memory()
+        cache_stats = get_retrieval_cache().stats()
         
         # Configuration info
         config_info = f"""# 🖥️ System Information & Status
@@ -831,11 +910,12 @@ def get_enhanced_system_info():
 ## 🔧 Components Status
 | Component | Status | Count/Info |
 |-----------|--------|------------|
-| **Elements Loaded** | {'✅ Active' if elements else '❌ Not Loaded'} | {len(elements) if elements else 0} |
+| **Elements Loaded** | {'✅ Active' if elements else '❌ Not Loaded'} | {'deferred' if isinstance(elements, LazyElements) and not elements.parsed else len(elements)} |
 | **Document Chunks** | {'✅ Ready' if chunks else '❌ Not Created'} | {len(chunks) if chunks else 0} |
 | **Ensemble Retriever** | {'✅ Active' if ensemble_retriever else '❌ Not Created'} | {'Graph-Enhanced' if ensemble_retriever else '-'} |
-| **Graph Integration** | {'✅ Connected' if neo4j_graph_instance else '❌ Not Connected'} | {'Neo4j Active' if neo4j_graph_instance else '-'} |
+| **Graph Integration** | {'✅ Connected' if neo4j_graph_instance else '❌ Not Connected'} | {f'{neo4j_graph_instance.name} Active' if neo4j_graph_instance else '-'} |
 | **Graph Enhancement** | {'✅ Enabled' if Config.ENABLE_GRAPH_ENHANCEMENT else '❌ Disabled'} | - |
+| **Retrieval Cache** | {cache_stats['entries']} entries | {cache_stats['hit_rate']*100:.0f}% hit rate ({cache_stats['hits']}/{cache_stats['hits'] + cache_stats['misses']}) |
 
 ## 🏗️ Metadata Schema (5 Fields)
 1. ✅ **element_type**: SEC semantic element class
@@ -875,42 +955,22 @@ def answer_question_and_context(question, use_reranker):
             os.environ["GOOGLE_API_KEY"] = global_google_api_key
 
         logger.debug("Initializing ChatGoogleGenerativeAI model")
-        langchain_llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash-lite")
-        llama_llm = LangchainLLM(langchain_llm)
-
-        retriever = ensemble_retriever
-        if use_reranker:
-            logger.debug("Enabling Cohere reranker")
-            if global_cohere_api_key:
-                os.environ["COHERE_API_KEY"] = global_cohere_api_key
-            reranker = CohereRerank(model="rerank-english-v3.0")
-            retriever = ContextualCompressionRetriever(
-                base_compressor=reranker, base_retriever=ensemble_retriever
-            )
+        # The RAGAS path always answers with Gemini; the client is shared with
+        # get_configured_llm so the tool registry can reuse its tools
+        cache_key = ("google", global_google_api_key)
+        if cache_key not in _llm_cache:
+            _llm_cache[cache_key] = ChatGoogleGenerativeAI(model="gemini-2.5-flash-lite")
+        langchain_llm = _llm_cache[cache_key]
 
-        # Initialize tools
-        logger.debug("Initializing tools")
-        general_tool = GeneralTool(retriever, langchain_llm)
-        table_tool = TableTool(retriever, llama_llm, elements)
-        mda_tool = MDATool(langchain_llm, elements)
-        risk_tool = RiskTool(langchain_llm, elements)
-
-        tools = {
-            "general_tool": general_tool,
-            "table_tool": table_tool,
-            "mda_tool": mda_tool,
-            "risk_tool": risk_tool,
-        }
+        retriever = get_answer_retriever(use_reranker)
 
         tool_name = route_query(question)
-        tool = tools[tool_name]
+        tool = tool_registry.get_tool(tool_name, langchain_llm, retriever=retriever)
         logger.info(f"ROUTING: Question '{question}' routed to tool: {tool_name}")
         
-        # Execute tool and get answer
-        answer = tool.execute(question)
-        
-        # Get context documents for additional logging
-        context = retriever.get_relevant_documents(question)
+        # Execute tool; the result carries the context the answer was generated from
+        result = tool.run(question)
+        answer, context = result.answer, result.context
         logger.info(f"RETRIEVAL_SUMMARY: Retrieved {len(context)} context documents for UI logging")
         
         # ENHANCED CONTEXT LOGGING: Log all context chunks with metadata
@@ -1185,7 +1245,7 @@ with gr.Blocks(
             
             # Graph Database Processing Section
             gr.HTML("<h3>🗂️ Graph Database Processing (Optional)</h3>")
-            gr.Markdown("Process the uploaded document to Neo4j graph database for enhanced retrieval capabilities.")
+            gr.Markdown("Process the uploaded document to the graph database (Neo4j, or the embedded graph when Neo4j is not configured) for enhanced retrieval capabilities.")
             process_to_graph_button = gr.Button("🗂️ Process to Graph Database", variant="secondary")
             graph_status = gr.Markdown()
             
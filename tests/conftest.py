@@ -0,0 +1,9 @@
+import pytest
+from src.config import Config
+
+
+@pytest.fixture(autouse=True)
+def isolated_index_dirs(tmp_path, monkeypatch):
+    """Keep persisted indexes and caches created by tests out of the working tree."""
+    for name in ("INGESTION_CACHE_DIR", "EMBEDDING_CACHE_DIR", "CHROMA_PERSIST_DIR", "TFIDF_INDEX_DIR", "FTS_INDEX_PATH", "GRAPH_STORE_PATH"):
+        monkeypatch.setattr(Config, name, str(tmp_path / name.lower()))
@@ -0,0 +1,33 @@
+import numpy as np
+from langchain_core.documents import Document
+from src.retrieval.bm25_retriever import BM25Index, BM25Retriever
+
+
+def test_block_max_search_matches_exhaustive_scoring():
+    rng = np.random.default_rng(7)
+    vocab = [f"term{i}" for i in range(300)] + ["revenue", "debt", "partnership"]
+    probs = 1.0 / np.arange(1, len(vocab) + 1)
+    probs /= probs.sum()
+    texts = [" ".join(rng.choice(vocab, size=rng.integers(5, 40), p=probs)) for _ in range(2000)]
+    index = BM25Index(texts, block_size=16)
+
+    for _ in range(50):
+        query = " ".join(rng.choice(vocab, size=rng.integers(1, 4), p=probs))
+        doc_ids, scores = index.search(query, 10)
+        matched, all_scores = index.score_all(query)
+        expected = np.lexsort((matched, -all_scores))[:10]
+        assert np.allclose(scores, all_scores[expected])
+        assert doc_ids.tolist() == matched[expected].tolist()
+
+
+def test_bm25_retriever_boosts_financial_terms():
+    docs = [
+        Document(page_content="The outlook mentions growth and growth plans."),
+        Document(page_content="The outlook mentions debt and growth plans."),
+        Document(page_content="Unrelated narrative."),
+    ]
+    retriever = BM25Retriever(docs)
+    results = retriever.invoke("growth debt")
+    assert results[0] is docs[1]
+    assert docs[2] not in results
+
@@ -0,0 +1,68 @@
+import chromadb
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from src.config import Config
+from src.retrieval import dense_retriever
+from src.retrieval.dense_retriever import clear_dense_indexes, get_dense_retriever
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+def chunks(tag, n=3):
+    return [Document(page_content=f"{tag} chunk {'x' * i}", metadata={"chunk_id": f"chunk_{i}"}) for i in range(n)]
+
+
+def test_collections_reopen_and_least_recently_used_are_evicted(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "PERSIST_DENSE_INDEX", True)
+    monkeypatch.setattr(Config, "CHROMA_MAX_COLLECTIONS", 2)
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(dense_retriever, "get_cached_embeddings", lambda: embeddings)
+
+    get_dense_retriever(chunks("q1"))
+    get_dense_retriever(chunks("q2"))
+    assert embeddings.embedded == 6
+    # Reopening encodes nothing and marks q1 as the most recently used
+    assert len(get_dense_retriever(chunks("q1")).invoke("q1 chunk")) == 3
+    assert embeddings.embedded == 6
+
+    get_dense_retriever(chunks("q3"))
+    get_dense_retriever(chunks("kept"), collection_name="named-collection")
+    client = chromadb.PersistentClient(path=str(Config.resolve_path(Config.CHROMA_PERSIST_DIR)))
+    names = sorted(c.name for c in client.list_collections())
+    assert len(names) == 3 and "named-collection" in names
+    # q2 was used least recently
+    get_dense_retriever(chunks("q2"))
+    assert embeddings.embedded == 6 + 3 + 3 + 3
+
+
+def test_relative_paths_resolve_against_the_repository_root(tmp_path):
+    assert Config.resolve_path("data/index") == Config.BASE_DIR / "data" / "index"
+    assert Config.resolve_path(tmp_path) == tmp_path
+    assert (Config.BASE_DIR / "src" / "config.py").is_file()
+
+
+def test_clear_dense_indexes_removes_collections_and_embedding_cache(monkeypatch):
+    monkeypatch.setattr(Config, "PERSIST_DENSE_INDEX", True)
+    embeddings = CountingEmbeddings()
+    monkeypatch.setattr(dense_retriever, "get_cached_embeddings", lambda: embeddings)
+    get_dense_retriever(chunks("q1"))
+    cache_dir = Config.resolve_path(Config.EMBEDDING_CACHE_DIR)
+    cache_dir.mkdir(parents=True)
+    (cache_dir / "vector").write_bytes(b"cached")
+
+    clear_dense_indexes()
+    client = chromadb.PersistentClient(path=str(Config.resolve_path(Config.CHROMA_PERSIST_DIR)))
+    assert client.list_collections() == [] and not cache_dir.exists()
+    # The next document is indexed from scratch
+    assert len(get_dense_retriever(chunks("q1")).invoke("q1 chunk")) == 3
+    assert embeddings.embedded == 6
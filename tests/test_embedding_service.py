@@ -0,0 +1,45 @@
+import threading
+import numpy as np
+from src.retrieval.embedding_service import EmbeddingService, get_embedding_service
+
+
+class FakeModel:
+    def __init__(self):
+        self.batches = []
+        self.active = 0
+        self.max_active = 0
+        self._guard = threading.Lock()
+
+    def encode(self, texts, batch_size, show_progress_bar, convert_to_numpy):
+        with self._guard:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.batches.append(list(texts))
+        out = np.array([[len(t), 1.0] for t in texts])
+        with self._guard:
+            self.active -= 1
+        return out
+
+
+def test_embedding_service_batches_and_serializes_encode():
+    service = EmbeddingService("fake-model", batch_size=2, num_threads=0)
+    model = FakeModel()
+    service._model = model
+
+    vectors = service.embed_documents(["a", "bb\nb", "ccc", "d", "ee"])
+    assert vectors == [[1.0, 1.0], [4.0, 1.0], [3.0, 1.0], [1.0, 1.0], [2.0, 1.0]]
+    assert [len(b) for b in model.batches] == [2, 2, 1]
+    assert model.batches[0][1] == "bb b"  # newline handling matches HuggingFaceEmbeddings
+    assert service.embed_query("xyz") == [3.0, 1.0]
+
+    threads = [threading.Thread(target=service.embed_documents, args=(["t"] * 8,)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert model.max_active == 1
+
+
+def test_get_embedding_service_returns_one_instance_per_model():
+    assert get_embedding_service("pool-test-a") is get_embedding_service("pool-test-a")
+    assert get_embedding_service("pool-test-a") is not get_embedding_service("pool-test-b")
@@ -0,0 +1,56 @@
+from langchain_core.documents import Document
+from src.config import Config
+from src.retrieval.fts_retriever import FTSIndex, FTSRetriever
+
+
+def make_docs(prefix, texts):
+    return [Document(page_content=t, metadata={"chunk_id": f"{prefix}_{i}"}) for i, t in enumerate(texts)]
+
+
+def test_fts_index_appends_scopes_and_deletes_filings(tmp_path):
+    index = FTSIndex(tmp_path / "sparse.sqlite")
+    q1 = make_docs("q1", ["Revenue grew on paid clicks.", "Operating lease liabilities rose.", "Plain narrative."])
+    q2 = make_docs("q2", ["Revenue declined slightly.", "Term debt was repaid."])
+    index.add_documents("goog-q1", q1)
+    index.add_documents("goog-q2", q2)
+
+    archive = [doc.metadata["chunk_id"] for doc, _ in index.search("revenue", 10)]
+    assert sorted(archive) == ["q1_0", "q2_0"]
+    scoped = [doc.metadata["chunk_id"] for doc, _ in index.search("revenue debt", 10, doc_keys=["goog-q2"])]
+    assert sorted(scoped) == ["q2_0", "q2_1"]
+
+    # Re-adding a filing replaces its chunks; deleting removes them from the index
+    index.add_documents("goog-q1", q1[:1])
+    assert [doc.metadata["chunk_id"] for doc, _ in index.search("lease", 10)] == []
+    index.delete_document("goog-q2")
+    assert [doc.metadata["chunk_id"] for doc, _ in index.search("revenue", 10)] == ["q1_0"]
+
+
+def test_fts_retriever_boosts_financial_phrases(tmp_path):
+    index = FTSIndex(tmp_path / "sparse.sqlite")
+    docs = make_docs("c", [
+        "The outlook mentions growth and growth plans.",
+        "The outlook mentions term debt and growth plans.",
+        "Unrelated narrative text.",
+        "Another paragraph without matches.",
+    ])
+    retriever = FTSRetriever.for_documents(docs, index=index)
+    assert ("term debt", 2.5) in FTSIndex.query_terms("term_debt growth")
+    results = retriever.invoke("growth term debt")
+    assert results[0].metadata["chunk_id"] == "c_1"
+    assert all(doc.metadata["chunk_id"] in {"c_0", "c_1"} for doc in results)
+
+
+def test_superseded_chunk_sets_are_evicted(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "FTS_MAX_CHUNK_SETS", 2)
+    index = FTSIndex(tmp_path / "sparse.sqlite")
+    index.add_documents("goog-q1", make_docs("filing", ["Revenue from the archived filing."]))
+    first = FTSRetriever.for_documents(make_docs("v1", ["Revenue, first chunking."]), index=index)
+    FTSRetriever.for_documents(make_docs("v2", ["Revenue, second chunking."]), index=index)
+    # Reusing the first chunk set makes the second one the least recently used
+    FTSRetriever.for_documents(make_docs("v1", ["Revenue, first chunking."]), index=index)
+    FTSRetriever.for_documents(make_docs("v3", ["Revenue, third chunking."]), index=index)
+
+    archive = sorted(doc.metadata["chunk_id"] for doc, _ in index.search("revenue", 10))
+    assert archive == ["filing_0", "v1_0", "v3_0"]
+    assert [doc.metadata["chunk_id"] for doc in first.invoke("revenue")] == ["v1_0"]
@@ -0,0 +1,40 @@
+import pytest
+from langchain_core.documents import Document
+from src.retrieval.fusion import fuse, chunk_key
+
+
+def chunk(i, text=None):
+    return Document(page_content=text or f"text {i}", metadata={"chunk_id": f"chunk_{i}", "document_title": "GOOG"})
+
+
+def test_rrf_dedups_by_chunk_id_and_keeps_scores():
+    dense = [(chunk(1), 0.9), (chunk(2), 0.8)]
+    # Same chunk id with different text (e.g. re-rendered) is still one chunk
+    sparse = [(chunk(2, "other rendering"), 7.5), (chunk(3), 2.0)]
+    fused = fuse([dense, sparse], [0.7, 0.3], names=["dense", "sparse"])
+
+    assert [d.metadata["chunk_id"] for d in fused] == ["chunk_2", "chunk_1", "chunk_3"]
+    assert fused[0].metadata["retrieval_scores"] == {"dense": 0.8, "sparse": 7.5}
+    assert fused[0].metadata["fusion_score"] == pytest.approx(0.7 / 62 + 0.3 / 61)
+    assert "retrieval_scores" not in dense[0][0].metadata  # inputs are not mutated
+    assert chunk_key(fused[0]) == ("GOOG", "chunk_2")
+
+
+def test_linear_fusion_normalizes_scores():
+    dense = [(chunk(1), 0.9), (chunk(2), 0.5), (chunk(3), 0.1)]
+    sparse = [(chunk(3), 30.0), (chunk(2), 10.0)]
+    minmax = fuse([dense, sparse], [0.5, 0.5], method="minmax")
+    # minmax: chunk_1 = 0.5*1 + 0 ; chunk_2 = 0.5*0.5 + 0 ; chunk_3 = 0 + 0.5*1
+    assert [d.metadata["chunk_id"] for d in minmax] == ["chunk_1", "chunk_3", "chunk_2"]
+    assert [d.metadata["fusion_score"] for d in minmax] == pytest.approx([0.5, 0.5, 0.25])
+
+    zscore = fuse([dense, None], [0.5, 0.5], method="zscore")
+    assert [d.metadata["chunk_id"] for d in zscore] == ["chunk_1", "chunk_2", "chunk_3"]
+
+    # Rank-only retrievers are fused by rank
+    ranked = fuse([[(chunk(4), None), (chunk(5), None)]], [1.0], method="minmax")
+    assert [d.metadata["fusion_score"] for d in ranked] == [1.0, 0.0]
+    assert ranked[0].metadata["retrieval_scores"] == {}
+
+    with pytest.raises(ValueError):
+        fuse([dense], [1.0], method="max")
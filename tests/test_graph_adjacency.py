@@ -0,0 +1,83 @@
+from langchain_core.documents import Document
+from src.graph.adjacency import ChunkAdjacency
+
+
+def chunk(i, section, page):
+    return Document(
+        page_content=f"text {i}",
+        metadata={"chunk_id": f"chunk_{i}", "section_path": section, "page_number": page, "content_type": "text"},
+    )
+
+
+CHUNKS = [chunk(0, "part1item1", 3), chunk(1, "part1item1", 1), chunk(2, "part1item2", 2), chunk(3, "", 4), chunk(10, "part1item2", None)]
+
+
+def expansion(adjacency, chunk_ids, include_similar=False):
+    return [(d.metadata["chunk_id"], d.metadata["graph_source"]) for d in adjacency.neighbors(chunk_ids, include_similar=include_similar)]
+
+
+def test_neighbors_follow_next_section_and_similar_edges():
+    adjacency = ChunkAdjacency(CHUNKS, similar_edges=[("chunk_0", "chunk_10", 0.9), ("chunk_0", "chunk_3", 0.8), ("chunk_0", "missing", 0.8)])
+    assert adjacency.num_chunks == 5 and adjacency.num_similar_edges == 2
+
+    # NEXT follows the numeric chunk order; section members are ordered by page
+    assert expansion(adjacency, ["chunk_0"]) == [("chunk_1", "NEXT"), ("chunk_1", "SECTION"), ("chunk_0", "SECTION")]
+    # SIMILAR_TO targets by page, unknown pages last
+    assert expansion(adjacency, ["chunk_0"], include_similar=True)[-2:] == [("chunk_3", "SIMILAR_TO"), ("chunk_10", "SIMILAR_TO")]
+    # Chunks without a section have no section neighbors; the last chunk has no NEXT; unknown ids are skipped
+    assert expansion(adjacency, ["chunk_3", "chunk_99", "chunk_10"]) == [
+        ("chunk_10", "NEXT"), ("chunk_2", "SECTION"), ("chunk_10", "SECTION"),
+    ]
+    doc = next(adjacency.neighbors(["chunk_3"]))
+    assert doc.page_content == "text 10" and "page_number" not in doc.metadata
+    assert doc.metadata["graph_seed"] == "chunk_3"
+
+
+class FakeSession:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query):
+        if "MATCH (c:Chunk)" in query:
+            return [
+                {"uid": f"goog::{d.metadata['chunk_id']}", "document_title": "goog", "content": d.page_content, **d.metadata}
+                for d in CHUNKS
+            ]
+        if "NEXT" in query:
+            return [{"src": "goog::chunk_1", "dst": "goog::chunk_0"}]
+        return [{"src": "goog::chunk_1", "dst": "goog::chunk_2", "score": 0.75}]
+
+
+class FakeDriver:
+    def session(self):
+        return FakeSession()
+
+
+def test_from_neo4j_uses_stored_edges():
+    adjacency = ChunkAdjacency.from_neo4j(FakeDriver())
+    assert expansion(adjacency, ["chunk_1"], include_similar=True) == [
+        ("chunk_0", "NEXT"), ("chunk_1", "SECTION"), ("chunk_0", "SECTION"), ("chunk_2", "SIMILAR_TO"),
+    ]
+    assert expansion(adjacency, ["goog::chunk_0"]) == [("chunk_1", "SECTION"), ("chunk_0", "SECTION")]
+
+
+def test_documents_sharing_chunk_ids_stay_separate():
+    def doc_chunks(title):
+        return [
+            Document(page_content=f"{title} {i}", metadata={"chunk_id": f"chunk_{i}", "document_title": title, "section_path": "part1item2"})
+            for i in range(3)
+        ]
+    adjacency = ChunkAdjacency(doc_chunks("goog-q1") + doc_chunks("goog-q2"))
+
+    neighbors = list(adjacency.neighbors(["goog-q2::chunk_2", "goog-q1::chunk_0"]))
+    # The last chunk of one filing is not chained to the first of the next; sections are per filing
+    assert [(d.metadata["document_title"], d.metadata["chunk_id"], d.metadata["graph_source"]) for d in neighbors] == [
+        ("goog-q2", "chunk_0", "SECTION"), ("goog-q2", "chunk_1", "SECTION"), ("goog-q2", "chunk_2", "SECTION"),
+        ("goog-q1", "chunk_1", "NEXT"),
+        ("goog-q1", "chunk_0", "SECTION"), ("goog-q1", "chunk_1", "SECTION"), ("goog-q1", "chunk_2", "SECTION"),
+    ]
+    # A bare chunk id is ambiguous across filings
+    assert list(adjacency.neighbors(["chunk_0"])) == []
@@ -0,0 +1,92 @@
+from typing import List
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from src.config import Config
+from src.retrieval.graph_retriever import GraphEnhancedRetriever
+
+
+class StaticRetriever(BaseRetriever):
+    docs: List[Document]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return self.docs
+
+
+class FakeSession:
+    def __init__(self, rows, calls):
+        self.rows, self.calls = rows, calls
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.calls.append(params)
+        return iter(self.rows)
+
+
+class FakeGraph:
+    def __init__(self, rows):
+        self.calls = []
+        self.rows = rows
+        self.driver = self
+
+    def session(self):
+        return FakeSession(self.rows, self.calls)
+
+
+def row(chunk_id, source):
+    return {"chunk_id": chunk_id, "content": f"text {chunk_id}", "graph_source": source, "section_path": "part1item2"}
+
+
+def test_graph_neighbors_come_from_one_query_deduplicated_by_chunk_id(monkeypatch):
+    monkeypatch.setattr(Config, "ENABLE_GRAPH_ENHANCEMENT", True)
+    base = [Document(page_content=f"text chunk_{i}", metadata={"chunk_id": f"chunk_{i}"}) for i in range(10)]
+    graph = FakeGraph([
+        row("chunk_1", "NEXT"),       # already a base chunk
+        row("chunk_20", "NEXT"),
+        row("chunk_20", "SECTION"),   # duplicate neighbor
+        row("chunk_21", "SECTION"),
+        row("chunk_22", "SIMILAR_TO"),
+    ])
+    retriever = GraphEnhancedRetriever(StaticRetriever(docs=base), neo4j_graph=graph, enhancement_weight=0.2)
+
+    docs = retriever.invoke("revenue")
+    assert len(graph.calls) == 1
+    assert graph.calls[0]["uids"] == [f"chunk_{i}" for i in range(10)]
+    assert [d.metadata["chunk_id"] for d in docs[10:]] == ["chunk_20", "chunk_21"]
+    assert [d.metadata["graph_source"] for d in docs[10:]] == ["NEXT", "SECTION"]
+
+
+def test_graph_neighbors_are_keyed_by_document(monkeypatch):
+    monkeypatch.setattr(Config, "ENABLE_GRAPH_ENHANCEMENT", True)
+    base = [Document(page_content=f"text {i}", metadata={"chunk_id": f"chunk_{i}", "document_title": "goog-q2"}) for i in range(10)]
+    graph = FakeGraph([
+        {**row("chunk_1", "NEXT"), "document_title": "goog-q2"},  # already a base chunk
+        {**row("chunk_1", "SECTION"), "document_title": "goog-q1"},  # same chunk id, other filing
+    ])
+    retriever = GraphEnhancedRetriever(StaticRetriever(docs=base), neo4j_graph=graph, enhancement_weight=0.2)
+
+    docs = retriever.invoke("revenue")
+    assert graph.calls[0]["uids"][:2] == ["goog-q2::chunk_0", "goog-q2::chunk_1"]
+    assert [(d.metadata["document_title"], d.metadata["chunk_id"]) for d in docs[10:]] == [("goog-q1", "chunk_1")]
+
+
+def test_graph_neighbors_inherit_their_seed_fusion_score(monkeypatch):
+    monkeypatch.setattr(Config, "ENABLE_GRAPH_ENHANCEMENT", True)
+    base = [
+        Document(page_content=f"text {i}", metadata={"chunk_id": f"chunk_{i}", "document_title": "goog-q2", "fusion_score": 1.0 - i / 10})
+        for i in range(10)
+    ]
+    graph = FakeGraph([
+        {**row("chunk_20", "NEXT"), "document_title": "goog-q2", "graph_seed": "goog-q2::chunk_0"},
+        {**row("chunk_21", "SECTION"), "document_title": "goog-q2", "graph_seed": "goog-q2::chunk_3"},
+        {**row("chunk_22", "SECTION"), "document_title": "goog-q2", "graph_seed": "goog-q2::chunk_99"},  # seed without a score
+    ])
+    retriever = GraphEnhancedRetriever(StaticRetriever(docs=base), neo4j_graph=graph, enhancement_weight=0.5)
+
+    extra = retriever.invoke("revenue")[10:]
+    assert [d.metadata["graph_seed"] for d in extra] == ["goog-q2::chunk_0", "goog-q2::chunk_3", "goog-q2::chunk_99"]
+    assert [d.metadata.get("fusion_score") for d in extra] == [0.5, 0.35, None]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from src.config import Config
+from src.graph import similarity
+from src.graph.similarity import exact_similar_pairs, approximate_similar_pairs, similar_pairs
+
+
+def vectors():
+    rng = np.random.default_rng(7)
+    base = rng.normal(size=(40, 8))
+    return np.vstack([base, base + 0.2 * rng.normal(size=base.shape)])
+
+
+def brute_force(v, top_n, threshold):
+    nv = v / np.linalg.norm(v, axis=1, keepdims=True)
+    sims = nv @ nv.T
+    np.fill_diagonal(sims, -np.inf)
+    pairs = set()
+    for i in range(len(v)):
+        for j in np.argsort(-sims[i])[:top_n]:
+            if sims[i, j] >= threshold:
+                pairs.add((i, int(j)))
+    return pairs
+
+
+def test_blockwise_scan_matches_full_matrix():
+    v = vectors()
+    for block_size in (1, 7, 1000):
+        pairs = exact_similar_pairs(v, top_n=3, threshold=0.5, block_size=block_size)
+        assert {(a, b) for a, b, _ in pairs} == brute_force(v, 3, 0.5)
+        assert all(a != b and score >= 0.5 for a, b, score in pairs)
+    assert exact_similar_pairs(v[:1], top_n=3, threshold=0.0) == []
+
+
+def test_ann_is_optional(monkeypatch):
+    monkeypatch.setattr(Config, "SIMILAR_TO_ANN", True)
+    monkeypatch.setattr(Config, "SIMILAR_TO_ANN_MIN_CHUNKS", 1)
+    monkeypatch.setattr(similarity, "hnswlib", None)
+    v = vectors()
+    assert {(a, b) for a, b, _ in similar_pairs(v, top_n=3, threshold=0.5)} == brute_force(v, 3, 0.5)
+    with pytest.raises(ImportError):
+        approximate_similar_pairs(v, top_n=3, threshold=0.5)
+
+
+def test_ann_finds_the_nearest_pairs():
+    pytest.importorskip("hnswlib")
+    v = vectors()
+    pairs = {(a, b) for a, b, _ in approximate_similar_pairs(v, top_n=1, threshold=0.5)}
+    assert len(pairs & brute_force(v, 1, 0.5)) >= 0.9 * len(brute_force(v, 1, 0.5))
@@ -0,0 +1,86 @@
+import numpy as np
+from langchain_core.documents import Document
+from src.config import Config
+from src.retrieval.hashed_retriever import HashedTfidfIndex, HashedTfidfRetriever
+from src.retrieval.tfidf_retriever import Financial10QRetriever
+
+
+def test_incremental_appends_and_removals_match_rebuild(monkeypatch):
+    rng = np.random.default_rng(3)
+    vocab = [f"word{i}" for i in range(200)] + ["revenue", "debt", "lease"]
+    texts = [" ".join(rng.choice(vocab, size=rng.integers(4, 20))) for _ in range(400)]
+
+    incremental = HashedTfidfIndex(n_features=2 ** 18)
+    for batch in range(4):
+        incremental.add(texts[batch * 100:(batch + 1) * 100], key=batch)
+    incremental.score("revenue")  # IDF computed, then invalidated by the changes below
+    incremental.remove(1)
+    incremental.add(["revenue debt lease"] * 3, key="rebuilt")
+
+    remaining = texts[:100] + texts[200:] + ["revenue debt lease"] * 3
+    rebuilt = HashedTfidfIndex(n_features=2 ** 18)
+    rebuilt.add(remaining)
+
+    live_rows = incremental.live_rows()
+    for query in ["revenue debt", "word3 word17", "lease word150"]:
+        rows, scores = incremental.score(query)
+        expected_rows, expected_scores = rebuilt.score(query)
+        assert sorted(rows.tolist()) == sorted(live_rows[expected_rows].tolist())
+        by_row = dict(zip(rows.tolist(), scores))
+        assert np.allclose([by_row[r] for r in live_rows[expected_rows]], expected_scores)
+
+
+def test_merging_segments_compacts_removed_rows(monkeypatch):
+    monkeypatch.setattr(Config, "HASHED_MAX_SEGMENTS", 2)
+    index = HashedTfidfIndex(n_features=2 ** 16)
+    for batch in range(3):
+        index.add([f"revenue batch{batch} row{i}" for i in range(10)], key=batch)
+    assert index.remove(1).tolist() == list(range(10, 20))
+    rows, _ = index.score("revenue")  # 3 segments > 2: merged, dead columns dropped
+
+    assert index.num_rows == index.num_docs == 20
+    assert sorted(rows.tolist()) == list(range(10)) + list(range(20, 30))
+    retriever = HashedTfidfRetriever([Document(page_content="old revenue text")])
+    retriever.add_documents([Document(page_content="stale revenue section")], key="mda")
+    retriever.replace_documents("mda", [Document(page_content="fresh revenue section")])
+    assert [d.page_content for d in retriever.documents] == ["old revenue text", "fresh revenue section"]
+
+
+def test_rankings_match_financial_10q_retriever(monkeypatch):
+    monkeypatch.setattr(Config, "PERSIST_TFIDF_INDEX", False)
+    texts = [
+        "Revenue increased due to advertising growth in search.",
+        "Debt and liabilities rose while revenue was flat.",
+        "Operating expenses include research and development.",
+        "Advertising revenue and debt repayment were discussed.",
+        "The company repurchased shares and paid dividends.",
+        "Liabilities include accrued expenses and deferred revenue.",
+    ]
+    docs = [Document(page_content=t) for t in texts]
+    reference = Financial10QRetriever(docs)
+    index = HashedTfidfIndex()
+    index.add(texts)
+    for query in ["revenue debt", "advertising revenue", "liabilities expenses", "shares dividends"]:
+        # Cosine similarity against the boosted matrix, before content-feature enhancement
+        matched = (reference._vectorizer.transform([query]) @ reference._term_matrix).tocsr()
+        expected = dict(zip(matched.indices.tolist(), matched.data))
+        rows, scores = index.score(query)
+        assert dict(zip(rows.tolist(), scores)).keys() == expected.keys()
+        assert np.allclose([dict(zip(rows.tolist(), scores))[r] for r in expected], list(expected.values()))
+        order = index.search(query, len(texts))[0].tolist()
+        assert order == sorted(expected, key=lambda r: (-expected[r], -r))
+
+
+def test_hashed_retriever_replaces_sections_and_boosts_financial_terms():
+    docs = [
+        Document(page_content="The outlook mentions growth and growth plans."),
+        Document(page_content="The outlook mentions debt and growth plans."),
+    ]
+    retriever = HashedTfidfRetriever(docs)
+    assert retriever.invoke("growth debt")[0] is docs[1]
+
+    section = [Document(page_content="Old risk factors text.")]
+    retriever.add_documents(section, key="risk")
+    replacement = [Document(page_content="Updated risk factors about competition.")]
+    retriever.replace_documents("risk", replacement)
+    assert retriever.invoke("risk factors") == replacement
@@ -0,0 +1,65 @@
+from langchain_core.documents import Document
+from src.config import Config
+from src.processing.ingestion_cache import IngestionCache, hash_file
+from src.processing import pdf_parser
+from src.processing.pdf_parser import LazyElements, parse_html
+from src.processing.section_index import SectionIndex
+import os
+
+FILING_HTML = (
+    "<html><body><p><b>PART I - FINANCIAL INFORMATION</b></p>"
+    "<p><b>Item 2. Management's Discussion and Analysis</b></p>"
+    "<p>Revenue grew 12% to $80.5 billion.</p></body></html>"
+)
+
+
+def test_ingestion_cache_round_trips_stages(tmp_path, monkeypatch):
+    pdf = tmp_path / "filing.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake filing")
+    cache = IngestionCache(tmp_path / "cache")
+    pdf_hash = hash_file(pdf)
+
+    assert cache.load_html(pdf_hash) is None
+    cache.save_html(pdf_hash, "<p>Revenue</p>")
+    assert cache.load_html(pdf_hash) == "<p>Revenue</p>"
+
+    chunks = [Document(page_content="Revenue grew", metadata={"chunk_id": "chunk_0"})]
+    cache.save_chunks(pdf_hash, chunks, document_title="filing.pdf.html")
+    loaded = cache.load_chunks(pdf_hash, document_title="filing.pdf.html")
+    assert loaded[0].page_content == "Revenue grew"
+    assert loaded[0].metadata == {"chunk_id": "chunk_0"}
+
+    # Changing a chunking knob invalidates only the chunk stage
+    monkeypatch.setattr(Config, "CHUNK_SIZE", Config.CHUNK_SIZE + 100)
+    assert cache.load_chunks(pdf_hash, document_title="filing.pdf.html") is None
+    assert cache.load_html(pdf_hash) == "<p>Revenue</p>"
+
+
+def test_cache_hit_defers_parsing_until_elements_are_read(tmp_path, monkeypatch):
+    cache = IngestionCache(tmp_path / "cache")
+    cache.save_html("abc123", FILING_HTML)
+
+    calls = []
+    monkeypatch.setattr(pdf_parser, "parse_html", lambda html: calls.append(html) or parse_html(html))
+    elements = LazyElements(cache.load_html("abc123"))
+    assert elements and calls == [] and not elements.parsed
+
+    expected = parse_html(FILING_HTML)
+    assert [(type(e).__name__, e.text) for e in elements] == [(type(e).__name__, e.text) for e in expected]
+    assert [type(e).__name__ for e in elements] == ["TopSectionTitle", "TopSectionTitle", "TextElement"]
+    assert SectionIndex(elements).section_identifiers == ["part1", "part1item2"] and len(calls) == 1
+    # Only HTML and chunk JSON are written; semantic elements are never pickled
+    assert sorted(p.name for p in (tmp_path / "cache" / "abc123").iterdir()) == ["document.html"]
+
+
+def test_ingestion_cache_evicts_least_recently_used(tmp_path):
+    cache = IngestionCache(tmp_path, max_entries=2)
+    cache.save_html("first", "<p>1</p>")
+    cache.save_html("second", "<p>2</p>")
+    os.utime(tmp_path / "first", (100, 100))
+    os.utime(tmp_path / "second", (200, 200))
+    # A hit marks the first entry as the most recently used
+    assert cache.load_html("first") == "<p>1</p>"
+
+    cache.save_html("third", "<p>3</p>")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["first", "third"]
@@ -0,0 +1,127 @@
+import os
+from typing import List
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from src.config import Config
+from src.graph import memory_graph
+from src.graph.backend import create_graph_backend
+from src.graph.memory_graph import InMemoryGraph
+from src.retrieval.graph_retriever import GraphEnhancedRetriever
+
+
+class StaticRetriever(BaseRetriever):
+    docs: List[Document]
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        return self.docs
+
+
+def filing(title, n=4):
+    return [
+        Document(
+            page_content=f"{title} text {i}",
+            metadata={"chunk_id": f"chunk_{i}", "document_title": title, "section_path": "part1item2" if i < 2 else "part2item1a", "page_number": i + 1},
+        )
+        for i in range(n)
+    ]
+
+
+def expansion(graph, uids, include_similar=False):
+    return [(d.metadata["document_title"], d.metadata["chunk_id"], d.metadata["graph_source"]) for d in graph.neighbors(uids, include_similar=include_similar)]
+
+
+def test_single_document_mode_replaces_the_graph(monkeypatch):
+    monkeypatch.setattr(Config, "GRAPH_MULTI_DOCUMENT", False)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", False)
+    graph = InMemoryGraph()
+    graph.add_document_structure(filing("goog-q1"), doc_title="goog-q1")
+    stats = graph.add_document_structure(filing("goog-q2"), doc_title="goog-q2")
+
+    assert graph.document_titles == ["goog-q2"]
+    assert stats["rows"] == 4 + 3
+    assert expansion(graph, ["goog-q2::chunk_0"]) == [
+        ("goog-q2", "chunk_1", "NEXT"), ("goog-q2", "chunk_0", "SECTION"), ("goog-q2", "chunk_1", "SECTION"),
+    ]
+
+
+def test_multi_document_graph_persists_to_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "GRAPH_MULTI_DOCUMENT", True)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", True)
+    # Stand-in for the dense embeddings: every chunk ending in the same digit is identical
+    monkeypatch.setattr(
+        memory_graph, "similar_chunk_edges",
+        lambda uids, texts: [(a, b, 1.0) for a, ta in zip(uids, texts) for b, tb in zip(uids, texts) if a != b and ta[-1] == tb[-1]],
+    )
+    path = tmp_path / "graph"
+    graph = InMemoryGraph(path)
+    graph.add_document_structure(filing("goog-q1"), doc_title="goog-q1")
+    graph.add_document_structure(filing("goog-q2", 3), doc_title="goog-q2")
+    assert graph.add_document_structure(filing("goog-q1"), doc_title="goog-q1")["skipped"] == 1
+
+    reopened = InMemoryGraph(path)
+    assert reopened.document_titles == ["goog-q1", "goog-q2"]
+    assert reopened.adjacency().num_chunks == 7
+    # Expansion never leaves the chunk's filing
+    assert expansion(reopened, ["goog-q2::chunk_2"]) == [("goog-q2", "chunk_2", "SECTION")]
+    assert expansion(reopened, ["goog-q1::chunk_3"], include_similar=False)[0] == ("goog-q1", "chunk_2", "SECTION")
+    assert reopened.add_document_structure(filing("goog-q2", 3), doc_title="goog-q2")["skipped"] == 1
+
+    reopened.clear()
+    assert InMemoryGraph(path).document_titles == []
+
+
+def test_retriever_expands_from_the_embedded_graph(monkeypatch):
+    monkeypatch.setattr(Config, "ENABLE_GRAPH_ENHANCEMENT", True)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", False)
+    monkeypatch.setattr(Config, "GRAPH_ADJACENCY_CACHE", False)  # ignored: the embedded graph is local
+    monkeypatch.setattr(Config, "GRAPH_BACKEND", "auto")
+    monkeypatch.setattr(Config, "GRAPH_STORE_PATH", None)
+    graph = create_graph_backend()
+    assert isinstance(graph, InMemoryGraph)
+    chunks = filing("goog-q1", 10)
+    graph.add_document_structure(chunks, doc_title="goog-q1")
+
+    retriever = GraphEnhancedRetriever(StaticRetriever(docs=chunks[:5]), neo4j_graph=graph, enhancement_weight=0.4)
+    docs = retriever.invoke("revenue")
+    assert [(d.metadata["chunk_id"], d.metadata["graph_source"]) for d in docs[5:]] == [("chunk_5", "SECTION"), ("chunk_6", "SECTION")]
+
+
+def test_writes_touch_only_the_changed_document(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "GRAPH_MULTI_DOCUMENT", True)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", False)
+    graph = InMemoryGraph(tmp_path)
+    graph.add_document_structure(filing("goog-q1"), doc_title="goog-q1")
+    q1_file = graph._document_file("goog-q1")
+    os.utime(q1_file, (100, 100))
+    graph.add_document_structure(filing("goog-q2"), doc_title="goog-q2")
+    graph.add_document_structure(filing("goog-q2", 2), doc_title="goog-q2")
+
+    assert q1_file.stat().st_mtime == 100
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(["manifest.json", q1_file.name, graph._document_file("goog-q2").name])
+    assert InMemoryGraph(tmp_path).adjacency().num_chunks == 6
+
+
+def test_unreadable_document_files_are_discarded(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "GRAPH_MULTI_DOCUMENT", True)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", True)
+    monkeypatch.setattr(memory_graph, "similar_chunk_edges", lambda uids, texts: [(uids[0], uids[1], 0.9)])
+    graph = InMemoryGraph(tmp_path)
+    for title in ("goog-q1", "goog-q2", "goog-q3"):
+        graph.add_document_structure(filing(title), doc_title=title)
+
+    graph._document_file("goog-q1").write_bytes(b"PK\x03\x04 truncated")
+    # A SIMILAR_TO edge pointing past the document's chunks
+    q2_file = graph._document_file("goog-q2")
+    with np.load(q2_file) as data:
+        arrays = dict(data)
+    arrays["similar_dst"] = np.array([99])
+    with open(q2_file, "wb") as f:
+        np.savez(f, **arrays)
+
+    reopened = InMemoryGraph(tmp_path)
+    assert reopened.document_titles == ["goog-q3"]
+    assert expansion(reopened, ["goog-q3::chunk_0"], include_similar=True)[0] == ("goog-q3", "chunk_1", "NEXT")
+
+    (tmp_path / "manifest.json").write_text('{"version": 2, "documents": [{"title": "x"}]}')
+    assert InMemoryGraph(tmp_path).document_titles == []
@@ -0,0 +1,122 @@
+import pytest
+
+pytest.importorskip("neo4j")
+
+from langchain_core.documents import Document
+from src.config import Config
+from src.graph import neo4j_graph
+from src.graph.neo4j_graph import Neo4jGraph
+
+
+class FakeResult(list):
+    def consume(self):
+        return None
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, work):
+        self.driver.transactions += 1
+        return work(self)
+
+    def execute_read(self, work):
+        return work(self)
+
+    def run(self, statement, **params):
+        self.driver.statements.append(statement)
+        self.driver.params.append(params)
+        if statement.startswith("SHOW INDEXES"):
+            return FakeResult({"name": name, "state": "ONLINE"} for name in params["names"])
+        if "CREATE INDEX chunk_document_section" in statement:
+            raise RuntimeError("permission denied")
+        if "SET d.fingerprint" in statement:
+            self.driver.fingerprints[params["title"]] = params["fingerprint"]
+        if "RETURN d.fingerprint" in statement:
+            return FakeResult([{"fingerprint": self.driver.fingerprints.get(params["title"])}])
+        return FakeResult()
+
+
+class FakeDriver:
+    def __init__(self):
+        self.statements = []
+        self.params = []
+        self.transactions = 0
+        self.fingerprints = {}
+
+    def session(self):
+        return FakeSession(self)
+
+
+def test_schema_is_bootstrapped_on_connect(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(neo4j_graph.GraphDatabase, "driver", lambda uri, auth: driver)
+    monkeypatch.setattr(Config, "NEO4J_ENSURE_SCHEMA", True)
+
+    graph = Neo4jGraph("bolt://localhost:7687", "neo4j", "secret")
+    assert all("IF NOT EXISTS" in s for s in driver.statements if s.startswith("CREATE"))
+    # Only creates schema: never drops constraints or indexes it did not make
+    assert not any(s.startswith("DROP") for s in driver.statements)
+    assert graph.schema_status["chunk_uid"] == "ONLINE"
+    assert graph.schema_status["section_title_path"] == "ONLINE"
+    assert graph.schema_status["chunk_document_section"].startswith("FAILED")
+
+
+def test_ingestion_writes_batched_transactions_with_client_side_next_pairs(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(neo4j_graph.GraphDatabase, "driver", lambda uri, auth: driver)
+    monkeypatch.setattr(Config, "NEO4J_ENSURE_SCHEMA", False)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", False)
+    monkeypatch.setattr(Config, "NEO4J_BATCH_SIZE", 2)
+    chunks = [
+        Document(page_content=f"text {i}", metadata={"chunk_id": f"chunk_{i}", "section_path": "part1item2" if i < 3 else "part2item1a"})
+        for i in range(5)
+    ]
+    graph = Neo4jGraph("bolt://localhost:7687", "neo4j", "secret")
+    stats = graph.add_document_structure(chunks, doc_title="goog.html")
+
+    next_batches = [p["rows"] for s, p in zip(driver.statements, driver.params) if ":NEXT]" in s]
+    assert [[(r["src"], r["dst"]) for r in batch] for batch in next_batches] == [
+        [("goog.html::chunk_0", "goog.html::chunk_1"), ("goog.html::chunk_1", "goog.html::chunk_2")],
+        [("goog.html::chunk_2", "goog.html::chunk_3"), ("goog.html::chunk_3", "goog.html::chunk_4")],
+    ]
+    chunk_batches = [p["rows"] for s, p in zip(driver.statements, driver.params) if "CREATE (c:Chunk" in s]
+    assert [len(batch) for batch in chunk_batches] == [2, 2, 1]
+    # clear + document + 1 section batch + 3 chunk batches + 2 NEXT batches + fingerprint, each in its own transaction
+    assert driver.transactions == 9
+    assert stats["documents"] == 1 and stats["rows"] == 2 + 5 + 4
+    assert [d.metadata["chunk_id"] for d in graph.adjacency().neighbors(["goog.html::chunk_0"])][0] == "chunk_1"
+
+    # Filings may reuse chunk ids; one title twice would collide
+    with pytest.raises(ValueError):
+        graph.add_documents([("a", chunks), ("a", chunks)])
+
+
+def test_multi_document_mode_replaces_only_the_loaded_document(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(neo4j_graph.GraphDatabase, "driver", lambda uri, auth: driver)
+    monkeypatch.setattr(Config, "NEO4J_ENSURE_SCHEMA", False)
+    monkeypatch.setattr(Config, "ENABLE_SIMILAR_TO", False)
+    monkeypatch.setattr(Config, "GRAPH_MULTI_DOCUMENT", True)
+    chunks = [Document(page_content=f"text {i}", metadata={"chunk_id": f"chunk_{i}"}) for i in range(3)]
+    graph = Neo4jGraph("bolt://localhost:7687", "neo4j", "secret")
+
+    graph.add_document_structure(chunks, doc_title="goog-q1")
+    deletes = [(s, p) for s, p in zip(driver.statements, driver.params) if "DETACH DELETE" in s]
+    assert len(deletes) == 1 and deletes[0][1] == {"title": "goog-q1"}  # scoped, no global wipe
+
+    # Reloading an unchanged filing writes nothing
+    writes = driver.transactions
+    stats = graph.add_document_structure(chunks, doc_title="goog-q1")
+    assert stats["skipped"] == 1 and stats["rows"] == 0 and driver.transactions == writes
+
+    # A changed filing is rewritten
+    stats = graph.add_document_structure(chunks[:2], doc_title="goog-q1")
+    assert stats["skipped"] == 0 and stats["rows"] == 1 + 2 + 1
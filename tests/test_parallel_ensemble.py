@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from typing import Any, List
+import pytest
+from langchain.retrievers import EnsembleRetriever
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from src.retrieval.parallel_ensemble import ParallelEnsembleRetriever
+
+
+class LatchRetriever(BaseRetriever):
+    """Returns its docs once `latch` is passed (a Barrier or an Event); optionally fails."""
+
+    docs: List[Document]
+    latch: Any = None
+    fail: bool = False
+
+    def _get_relevant_documents(self, query, *, run_manager):
+        if isinstance(self.latch, threading.Barrier):
+            self.latch.wait()  # raises BrokenBarrierError unless all parties arrive together
+        elif self.latch is not None:
+            self.latch.wait(timeout=10)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return self.docs
+
+
+def docs(*texts):
+    return [Document(page_content=t) for t in texts]
+
+
+def test_fan_out_runs_concurrently_and_matches_ensemble_fusion():
+    # Both searches must be in flight at once to pass the barrier; run serially, both would fail
+    barrier = threading.Barrier(2, timeout=10)
+    dense = LatchRetriever(docs=docs("a", "b", "c"), latch=barrier)
+    sparse = LatchRetriever(docs=docs("c", "d", "a"), latch=barrier)
+    fused = ParallelEnsembleRetriever([dense, sparse], [0.7, 0.3]).invoke("q")
+
+    expected = EnsembleRetriever(
+        retrievers=[LatchRetriever(docs=dense.docs), LatchRetriever(docs=sparse.docs)], weights=[0.7, 0.3]
+    ).invoke("q")
+    assert [d.page_content for d in fused] == [d.page_content for d in expected]
+
+
+def test_slow_or_failing_retrievers_are_left_out():
+    release = threading.Event()
+    try:
+        hung = LatchRetriever(docs=docs("a"), latch=release)
+        sparse = LatchRetriever(docs=docs("b"))
+        assert [d.page_content for d in ParallelEnsembleRetriever([hung, sparse], [0.7, 0.3], timeout=0.2).invoke("q")] == ["b"]
+
+        broken = LatchRetriever(docs=[], fail=True)
+        assert [d.page_content for d in ParallelEnsembleRetriever([broken, sparse], [0.7, 0.3]).invoke("q")] == ["b"]
+        with pytest.raises(RuntimeError):
+            ParallelEnsembleRetriever([broken, broken], [0.7, 0.3]).invoke("q")
+        # Nobody answered: an error, not an empty result
+        with pytest.raises(TimeoutError):
+            ParallelEnsembleRetriever([hung, hung], [0.7, 0.3], timeout=0.2).invoke("q")
+    finally:
+        release.set()
+
+
+def test_hung_searches_are_capped_per_retriever():
+    release = threading.Event()
+    try:
+        hung = LatchRetriever(docs=docs("a"), latch=release)
+        sparse = LatchRetriever(docs=docs("b"))
+        ensemble = ParallelEnsembleRetriever([hung, sparse], [0.7, 0.3], timeout=0.05, max_in_flight=2)
+        for _ in range(8):
+            assert [d.page_content for d in ensemble.invoke("q")] == ["b"]
+        # Two hung searches hold the retriever's slots; later queries skip it instead of queueing
+        running = [t for t in threading.enumerate() if t.name.startswith("retrieval")]
+        assert len(running) <= 2 * 2
+        assert ensemble._slots[0]._value == 0 and ensemble._slots[1]._value == 2
+
+        # Other retrievers (and other ensembles) still run concurrently
+        barrier = threading.Barrier(2, timeout=10)
+        dense = LatchRetriever(docs=docs("c"), latch=barrier)
+        other = LatchRetriever(docs=docs("d"), latch=barrier)
+        fused = ParallelEnsembleRetriever([dense, other], [0.7, 0.3], timeout=10).invoke("q")
+        assert [d.page_content for d in fused] == ["c", "d"]
+    finally:
+        release.set()
+    # Finished searches give their slots back
+    assert ensemble._slots[0].acquire(timeout=10) and ensemble._slots[0].acquire(timeout=10)
+
+
+def test_async_path_holds_slots_until_searches_finish():
+    release = threading.Event()
+    try:
+        hung = LatchRetriever(docs=docs("a"), latch=release)
+        sparse = LatchRetriever(docs=docs("b"))
+        ensemble = ParallelEnsembleRetriever([hung, sparse], [0.7, 0.3], timeout=0.05, max_in_flight=1)
+
+        async def queries():
+            answers = [[d.page_content for d in await ensemble.ainvoke("q")] for _ in range(3)]
+            busy = ensemble._slots[0]._value
+            release.set()
+            while ensemble._slots[0]._value == 0:
+                await asyncio.sleep(0.01)
+            return answers, busy
+
+        assert asyncio.run(queries()) == ([["b"]] * 3, 0)
+    finally:
+        release.set()
@@ -0,0 +1,25 @@
+import fitz
+from src.config import Config
+from src.processing.pdf_to_html import convert_pdf_to_html, get_conversion_pool
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i + 1}: revenue grew {i}% year over year")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_parallel_conversion_matches_serial(tmp_path, monkeypatch):
+    pdf = tmp_path / "filing.pdf"
+    make_pdf(pdf, 5)
+    monkeypatch.setattr(Config, "PDF_PARALLEL_MIN_PAGES", 0)
+
+    serial = convert_pdf_to_html(str(pdf), workers=1)
+    parallel = convert_pdf_to_html(str(pdf), workers=2)
+    assert parallel == serial
+    assert serial.index("Page 1:") < serial.index("Page 5:")
+    # Later conversions reuse the running workers
+    assert get_conversion_pool(2) is get_conversion_pool(1)
@@ -16,3 +16,28 @@ def test_chunk_document_creates_langchain_documents():
     chunks = chunk_document(elements)
     assert all(isinstance(d, Document) for d in chunks)
     assert chunks[0].page_content == "hello"
+
+
+def test_parse_html_accepts_string_and_buffer():
+    import io
+    from src.processing.pdf_parser import parse_html
+
+    html = "<p>Alphabet Inc. quarterly report</p><p>Revenue increased 14%.</p>"
+    from_string = parse_html(html)
+    from_buffer = parse_html(io.StringIO(html))
+    assert len(from_string) == len(from_buffer) > 0
+    assert [el.text for el in from_string] == [el.text for el in from_buffer]
+
+
+def test_extract_element_text_single_pass_and_memoized():
+    from src.processing.chunker import extract_element_text
+
+    class HtmlElement(DummyElement):
+        html = "<div><p><b><span>Total revenue</span></b></p><table><tr><td>$96,428</td><td>$84,742</td></tr></table></div>"
+
+    element = HtmlElement("")
+    text = extract_element_text(element)
+    assert text == "Total revenue $96,428 $84,742"
+    # Second call is served from the memo, even if the element changes underneath
+    element.html = "<p>changed</p>"
+    assert extract_element_text(element) == text
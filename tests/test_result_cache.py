@@ -0,0 +1,53 @@
+from typing import List
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from src.config import Config
+from src.retrieval.result_cache import RetrievalCache, CachedRetriever
+
+
+class CountingRetriever(BaseRetriever):
+    calls: int = 0
+
+    def _get_relevant_documents(self, query, *, run_manager) -> List[Document]:
+        self.calls += 1
+        return [Document(page_content=f"{query} #{self.calls}")]
+
+
+def test_cached_retriever_serves_repeats_and_tracks_settings(monkeypatch):
+    cache = RetrievalCache(max_entries=8, ttl_seconds=None)
+    base = CountingRetriever()
+    retriever = CachedRetriever(base, fingerprint="doc-a", cache=cache)
+
+    first = retriever.invoke("What was  Revenue?")
+    assert retriever.invoke("what was revenue?") == first
+    assert base.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.hit_rate == 0.5
+
+    # Other weights, another document or the reranked variant are different entries
+    monkeypatch.setattr(Config, "DENSE_WEIGHT", 0.5)
+    retriever.invoke("what was revenue?")
+    CachedRetriever(base, fingerprint="doc-b", cache=cache).invoke("what was revenue?")
+    CachedRetriever(base, fingerprint="doc-a", reranker=True, cache=cache).invoke("what was revenue?")
+    assert base.calls == 4
+
+    assert cache.invalidate("doc-a") == 3
+    retriever.invoke("what was revenue?")
+    assert base.calls == 5
+
+
+def test_cache_is_bounded_and_expires(monkeypatch):
+    cache = RetrievalCache(max_entries=2, ttl_seconds=10)
+    now = [100.0]
+    monkeypatch.setattr("src.retrieval.result_cache.time.monotonic", lambda: now[0])
+    for key in ("a", "b"):
+        cache.put((key,), [])
+    cache.get(("a",))
+    cache.put(("c",), [])  # evicts the least recently used entry, "b"
+    assert cache.get(("b",)) is None and cache.get(("a",)) == []
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 11
+    assert cache.get(("a",)) is None
+    disabled = RetrievalCache(max_entries=0)
+    disabled.put(("a",), [])
+    assert disabled.get(("a",)) is None
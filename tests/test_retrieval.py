@@ -1,5 +1,9 @@
 from langchain_core.documents import Document
-from src.retrieval.tfidf_retriever import Financial10QRetriever
+from src.retrieval.tfidf_retriever import Financial10QRetriever, top_k_positions
+from src.retrieval.fingerprint import documents_fingerprint
+from src.retrieval.tfidf_index import TfidfIndexStore, tfidf_fingerprint
+import numpy as np
+import os
 
 
 def test_tfidf_retriever_boosts_financial_terms():
@@ -13,3 +17,68 @@ def test_tfidf_retriever_boosts_financial_terms():
     assert len(results) > 0
     # Expect the top result to be the document containing 'revenue'
     assert "revenue" in results[0].page_content.lower()
+
+
+def test_documents_fingerprint_tracks_text_metadata_and_order():
+    a = Document(page_content="Revenue grew.", metadata={"chunk_id": "chunk_0"})
+    b = Document(page_content="Costs fell.", metadata={"chunk_id": "chunk_1"})
+    fp = documents_fingerprint([a, b])
+    assert fp == documents_fingerprint([a, b])
+    assert fp != documents_fingerprint([b, a])
+    assert fp != documents_fingerprint([a, Document(page_content="Costs fell.", metadata={"chunk_id": "chunk_2"})])
+
+
+def test_enhance_scores_applies_precomputed_boosts():
+    docs = [
+        Document(page_content="Revenue was $10 and $20 this quarter."),
+        Document(page_content="We announced a strategic partnership with OpenAI."),
+        Document(page_content="Plain narrative text."),
+    ]
+    retriever = Financial10QRetriever(docs)
+    base = np.array([0.5, 0.0, 0.2])
+    scores = retriever._enhance_scores(base, "quarterly revenue")
+    assert scores.tolist() == [1.5, 0.0, 0.2]
+    # Partnership queries lift relevant chunks even without lexical overlap
+    scores = retriever._enhance_scores(base, "strategic alliance")
+    assert scores[1] == (5.0 + 3.0) * 0.25
+
+
+def test_top_k_positions_matches_full_sort():
+    scores = np.array([0.2, 0.9, 0.0, 0.5, 0.9, 0.5, 0.1])
+    assert top_k_positions(scores, 3).tolist() == [4, 1, 5]
+    assert top_k_positions(scores, 10).tolist() == np.argsort(scores, kind="stable")[::-1].tolist()
+    assert top_k_positions(scores, 2, tiebreak=np.array([0, 5, 0, 0, 1, 0, 0])).tolist() == [1, 4]
+
+
+def test_tfidf_index_is_persisted_and_memory_mapped(tmp_path):
+    docs = [
+        Document(page_content="Revenue rose on paid clicks and advertising."),
+        Document(page_content="Term debt and operating lease liabilities increased."),
+        Document(page_content="We have a strategic partnership with OpenAI."),
+    ]
+    store = TfidfIndexStore(tmp_path)
+    fitted = Financial10QRetriever(docs, index_store=store)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    reopened = Financial10QRetriever(docs, index_store=store)
+    assert isinstance(reopened._static_boost, np.memmap)
+    for query in ["term debt", "paid clicks revenue", "strategic alliance"]:
+        assert reopened.invoke(query) == fitted.invoke(query)
+
+
+def test_tfidf_index_store_evicts_least_recently_used(tmp_path):
+    store = TfidfIndexStore(tmp_path, max_entries=2)
+    chunk_sets = [[Document(page_content=f"Revenue filing {tag}"), Document(page_content=f"Term debt {tag}")] for tag in "abc"]
+    entries = []
+    for docs in chunk_sets[:2]:
+        Financial10QRetriever(docs, index_store=store)
+        entries.append(store._entry_dir(tfidf_fingerprint(docs)))
+    os.utime(entries[0], (100, 100))
+    os.utime(entries[1], (200, 200))
+    # A hit marks the first index as the most recently used
+    Financial10QRetriever(chunk_sets[0], index_store=store)
+    assert entries[0].stat().st_mtime > 200
+
+    Financial10QRetriever(chunk_sets[2], index_store=store)
+    assert entries[0].exists() and not entries[1].exists()
+    assert len(list(tmp_path.iterdir())) == 2
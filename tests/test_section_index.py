@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+from sec_parser.semantic_elements.abstract_semantic_element import AbstractSemanticElement
+from sec_parser.semantic_elements.top_section_title import TopSectionTitle
+from src.processing.chunker import get_elements_in_section
+from src.processing.section_index import SectionIndex
+
+
+class DummyElement(AbstractSemanticElement):
+    def __init__(self, text: str):
+        self._text = text
+
+    def __str__(self) -> str:
+        return self._text
+
+
+class DummyTitle(TopSectionTitle):
+    def __init__(self, identifier: str, level: int):
+        self.section_type = SimpleNamespace(identifier=identifier, level=level)
+
+    def __str__(self) -> str:
+        return self.section_type.identifier
+
+
+def _filing():
+    long_risk = "Our business could be harmed; the following risk factors may adversely affect results. " * 2
+    return [
+        DummyTitle("part1", 0),
+        DummyTitle("part1item2", 1),
+        DummyElement("Management discussion of consolidated revenues and operating income trends."),
+        DummyElement("short"),
+        DummyTitle("part1item3", 1),
+        DummyElement("Quantitative disclosures about market risk exposure and interest rates."),
+        DummyTitle("part2", 0),
+        DummyTitle("part2item1a", 1),
+        DummyElement(long_risk),
+    ]
+
+
+def test_section_index_matches_linear_scan():
+    elements = _filing()
+    index = SectionIndex(elements)
+    for ident in ("part1", "part1item2", "part1item3", "part2", "part2item1a", "missing"):
+        assert index.elements_in(ident) == get_elements_in_section(elements, section_identifier=ident)
+    # Chunk lists are built once and reused
+    assert index.chunks_in("part1item2") is index.chunks_in("part1item2")
+
+
+def test_section_index_keyword_postings():
+    elements = _filing()
+    index = SectionIndex(elements)
+    assert index.elements_matching(["market risk"]) == [elements[5]]
+    # Short elements never match, results stay in document order
+    assert index.elements_matching(["risk", "revenues", "short"]) == [elements[2], elements[5], elements[8]]
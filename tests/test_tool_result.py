@@ -0,0 +1,36 @@
+from typing import Any, List, Optional
+from langchain_core.documents import Document
+from langchain_core.language_models.llms import LLM
+from langchain_core.retrievers import BaseRetriever
+from src.tools.base import SimpleTool, ToolResult
+
+
+class EchoRetriever(BaseRetriever):
+    def _get_relevant_documents(self, query, *, run_manager=None):
+        return [Document(page_content=f"context for: {query}")]
+
+
+class EchoLLM(LLM):
+    """Answers with the prompt it was given."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "echo"
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        return prompt
+
+
+def test_simple_tool_run_returns_context_and_timings():
+    tool = SimpleTool(EchoRetriever(), EchoLLM())
+    tool.route = "general_tool"
+    result = tool.run("what is revenue?")
+
+    assert isinstance(result, ToolResult)
+    assert result.answer == "Context: context for: what is revenue?\n\nQuestion: what is revenue?"
+    assert result.answer == tool.execute("what is revenue?")
+    assert [doc.page_content for doc in result.context] == ["context for: what is revenue?"]
+    assert result.route == "general_tool"
+    assert set(result.timings) == {"retrieval", "generation", "total"}
+    assert all(seconds >= 0 for seconds in result.timings.values())
+    assert result.timings["total"] >= result.timings["retrieval"] + result.timings["generation"] - 1e-6